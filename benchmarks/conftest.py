@@ -0,0 +1,166 @@
+"""Fixtures for the endpoint benchmark suite (``pytest benchmarks``).
+
+Reuses the test suite's Postgres testcontainer, seeds it once with the catalog
+and a synthetic dataset, and drives the real app through ``ASGITransport``.
+Every measured route lands in a JSON results file at the end of the run.
+"""
+
+import logging
+import uuid
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from testcontainers.postgres import PostgresContainer
+
+from benchmarks.harness import RouteResult, load_results, write_results
+from benchmarks.plans import PlanSummary
+from benchmarks.scenarios import Dataset, load_dataset
+from gymhero.config import get_settings
+from gymhero.database.session import (
+    get_async_engine,
+    get_async_session_factory,
+    get_local_session,
+)
+from gymhero.main import app
+from scripts.core.sync import sync_catalog
+from scripts.core.synthetic import seed_synthetic
+from scripts.core.users import create_first_superuser
+from tests.conftest import _async_url, _postgres_container, engine  # noqa: F401
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+_results: dict[str, RouteResult] = {}
+_plans: dict[str, PlanSummary] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-requests", type=int, default=500)
+    group.addoption("--bench-concurrency", type=int, default=8)
+    group.addoption(
+        "--bench-scale", type=int, default=20, help="Synthetic dataset scale."
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression vs the baseline (0.25 = 25%%).",
+    )
+    group.addoption(
+        "--plan-large-rows",
+        type=int,
+        default=10_000,
+        help="Tables estimated at this many rows or more must not be seq-scanned.",
+    )
+    group.addoption(
+        "--bench-baseline", type=Path, default=BENCHMARKS_DIR / "baseline.json"
+    )
+    group.addoption(
+        "--bench-output", type=Path, default=BENCHMARKS_DIR / "results.json"
+    )
+    group.addoption(
+        "--bench-save-baseline",
+        action="store_true",
+        help="Also write this run's results as the new baseline.",
+    )
+    group.addoption(
+        "--bench-record-only",
+        action="store_true",
+        help="Measure and record without comparing to the baseline.",
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not (_results or _plans):
+        return
+    config = session.config
+    meta = {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "requests": config.getoption("--bench-requests"),
+        "concurrency": config.getoption("--bench-concurrency"),
+        "scale": config.getoption("--bench-scale"),
+    }
+    write_results(config.getoption("--bench-output"), _results, meta, _plans)
+    if config.getoption("--bench-save-baseline"):
+        # Merge, so saving a subset (``-k query_plan``) keeps the other entries;
+        # a baseline taken at another scale is replaced outright.
+        path = config.getoption("--bench-baseline")
+        stored = load_results(path)
+        if stored.get("meta", {}).get("scale") != meta["scale"]:
+            stored = {"routes": {}, "plans": {}}
+        routes = {k: RouteResult(**v) for k, v in stored["routes"].items()}
+        plans = {k: PlanSummary(**v) for k, v in stored["plans"].items()}
+        write_results(path, routes | _results, meta, plans | _plans)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _quiet_logs() -> None:
+    # Keep the access log out of the measurement: formatting a JSON line per
+    # request would be benchmarked along with the route.
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+@pytest.fixture(scope="session")
+def results() -> dict[str, RouteResult]:
+    return _results
+
+
+@pytest.fixture(scope="session")
+def plan_results() -> dict[str, PlanSummary]:
+    return _plans
+
+
+@pytest.fixture(scope="session")
+def stored_plans(request: pytest.FixtureRequest) -> dict[str, Any]:
+    config = request.config
+    stored = load_results(config.getoption("--bench-baseline"))
+    # Plan costs follow the table sizes: only comparable at the same scale.
+    if stored.get("meta", {}).get("scale") != config.getoption("--bench-scale"):
+        return {}
+    return stored["plans"]
+
+
+@pytest.fixture(scope="session")
+def dataset(
+    request: pytest.FixtureRequest,
+    engine: AsyncEngine,  # noqa: F811 — creates the schema
+    _postgres_container: PostgresContainer,  # noqa: F811
+) -> Dataset:
+    session = get_local_session(_postgres_container.get_connection_url())()
+    try:
+        superuser = create_first_superuser(session, get_settings("test"))
+        sync_catalog(session, superuser.id)
+        seed_synthetic(session, request.config.getoption("--bench-scale"))
+        # Fresh planner statistics, or plans reflect an empty database.
+        session.execute(text("ANALYZE"))
+        session.commit()
+        return load_dataset(session, superuser.id, run=uuid.uuid4().hex[:8])
+    finally:
+        session.close()
+
+
+@pytest.fixture
+async def bench_engine(
+    request: pytest.FixtureRequest,
+    _async_url: str,  # noqa: F811
+) -> AsyncGenerator[AsyncEngine]:
+    # The suite's shared engine uses NullPool; a benchmark must not pay a
+    # connection handshake per request, so give it a pool sized to the load.
+    concurrency = request.config.getoption("--bench-concurrency")
+    bench = get_async_engine(_async_url, pool_size=concurrency, max_overflow=0)
+    yield bench
+    await bench.dispose()
+
+
+@pytest.fixture
+async def bench_client(bench_engine: AsyncEngine) -> AsyncGenerator[AsyncClient]:
+    app.state.db_session_factory = get_async_session_factory(bench_engine)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        yield client
@@ -0,0 +1,188 @@
+"""Measurement and baseline comparison for the endpoint benchmark suite.
+
+Each route is driven twice through the in-process ``ASGITransport`` client:
+
+* a sequential *profile* pass counts SQL statements (an engine event) and the
+  peak bytes allocated per request (``tracemalloc``) — both are deterministic
+  enough to gate on, and tracing would distort the latency numbers;
+* a concurrent *timing* pass records per-request latency and throughput.
+
+Results are plain JSON so a run can be diffed, archived by CI, or promoted to
+the stored baseline.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Metric -> True when a higher value is better.
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+    "statements_per_request": False,
+    "allocated_bytes_per_request": False,
+}
+# Counted, not timed: any increase is a regression whatever the tolerance.
+EXACT_METRICS = frozenset({"statements_per_request"})
+
+
+@dataclass(frozen=True)
+class RouteResult:
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    statements_per_request: float
+    allocated_bytes_per_request: int
+
+
+class StatementCounter:
+    """Counts statements executed on ``engine`` while ``counting()`` is open."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    @contextmanager
+    def counting(self) -> Iterator[None]:
+        self.count = 0
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield
+        finally:
+            event.remove(
+                self.engine.sync_engine, "before_cursor_execute", self._on_execute
+            )
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    """p50, p95 and p99 of ``latencies``."""
+    if len(latencies) == 1:
+        return latencies[0], latencies[0], latencies[0]
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+async def _profile(
+    send: Callable[[int], Awaitable[None]], counter: StatementCounter, requests: int
+) -> tuple[float, int]:
+    peaks = []
+    with counter.counting():
+        tracemalloc.start()
+        try:
+            for i in range(requests):
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                await send(i)
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        finally:
+            tracemalloc.stop()
+    return counter.count / requests, int(statistics.median(peaks))
+
+
+async def _time(
+    send: Callable[[int], Awaitable[None]], requests: int, concurrency: int
+) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for i in remaining:
+            start = time.perf_counter()
+            await send(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, requests / (time.perf_counter() - start)
+
+
+async def measure(
+    send: Callable[[int], Awaitable[None]],
+    counter: StatementCounter,
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int = 20,
+    profile_requests: int = 50,
+) -> RouteResult:
+    """Benchmark one route; ``send(i)`` issues its i-th request and checks it."""
+    for i in range(warmup):
+        await send(i)
+    # Offset call indexes so writes that derive unique names never collide.
+    offset = warmup
+    statements, allocated = await _profile(
+        lambda i: send(offset + i), counter, profile_requests
+    )
+    offset += profile_requests
+    latencies, throughput = await _time(
+        lambda i: send(offset + i), requests, concurrency
+    )
+    p50, p95, p99 = percentiles(latencies)
+    return RouteResult(
+        requests=requests,
+        p50_ms=round(p50, 3),
+        p95_ms=round(p95, 3),
+        p99_ms=round(p99, 3),
+        throughput_rps=round(throughput, 1),
+        statements_per_request=round(statements, 2),
+        allocated_bytes_per_request=allocated,
+    )
+
+
+def compare(
+    current: RouteResult, baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Describe every metric of ``current`` that regressed past ``baseline``."""
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        if metric not in baseline:
+            continue
+        base = baseline[metric]
+        value = getattr(current, metric)
+        allowed = 0.0 if metric in EXACT_METRICS else tolerance
+        if higher_is_better:
+            regressed = value < base * (1 - allowed)
+        else:
+            regressed = value > base * (1 + allowed)
+        if regressed:
+            regressions.append(f"{metric}: {value} vs baseline {base}")
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Load a results file, or an empty one if it does not exist."""
+    document = json.loads(path.read_text()) if path.exists() else {}
+    return {"routes": {}, "plans": {}, **document}
+
+
+def write_results(
+    path: Path,
+    results: dict[str, RouteResult],
+    meta: dict[str, Any],
+    plans: dict[str, Any] | None = None,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "meta": {"python": platform.python_version(), **meta},
+        "routes": {name: asdict(result) for name, result in sorted(results.items())},
+        "plans": {name: asdict(plan) for name, plan in sorted((plans or {}).items())},
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
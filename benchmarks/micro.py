@@ -0,0 +1,278 @@
+"""Microbenchmarks of the building blocks behind every request.
+
+No database, no HTTP: each benchmark is a plain callable timed with ``timeit``
+(best of several repeats) and traced once with ``tracemalloc``, reporting ops/s
+and peak bytes allocated per op:
+
+    python -m benchmarks.micro                      # everything
+    python -m benchmarks.micro -k serialize         # names containing "serialize"
+    python -m benchmarks.micro --json after.json --compare before.json
+
+* ``security.*`` — JWT encode/decode, bcrypt verify at the hasher's cost factor,
+  ``TokenPayload`` validation;
+* ``serialize.*`` — the ``response_model`` path (validate ORM objects
+  ``from_attributes``, dump JSON) for a page of exercises and deep
+  training-plan/unit graphs; ``.msgpack`` dumps MessagePack instead, as for a
+  client sending ``Accept: application/msgpack``;
+* ``decode.*`` — what a client pays to parse those bodies, JSON and MessagePack
+  (the sizes of both are printed after the table);
+* ``sql.*`` — building ``CRUDRepository`` statements, compiling them cold, and
+  the compiled-cache hit every execution after the first pays.
+"""
+
+import json
+import statistics
+import timeit
+import tracemalloc
+from argparse import ArgumentParser
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import msgpack
+from pydantic import TypeAdapter
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.sql import Select
+
+from gymhero import security
+from gymhero.crud import exercise_crud, training_plan_crud
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+from gymhero.models.training_plan import TrainingPlan
+from gymhero.models.training_unit import (
+    PrescribedSet,
+    TrainingUnit,
+    TrainingUnitExercise,
+)
+from gymhero.schemas.auth import TokenPayload
+from gymhero.schemas.common import Page
+from gymhero.schemas.exercise import ExerciseInDB
+from gymhero.schemas.training_plan import TrainingPlanInDB
+from gymhero.schemas.training_unit import TrainingUnitInDB
+
+PAGE_SIZE = 100
+UNITS_PER_PLAN = 5
+EXERCISES_PER_UNIT = 8
+SETS_PER_EXERCISE = 4
+_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    ops_per_sec: float
+    bytes_per_op: int
+
+
+def _exercise(i: int) -> Exercise:
+    return Exercise(
+        id=i,
+        name=f"Exercise {i}",
+        description="Keep the back straight and brace the core.",
+        owner_id=1,
+        created_at=_NOW,
+        updated_at=_NOW,
+        target_body_part=BodyPart(id=1, name="Legs"),
+        exercise_type=ExerciseType(id=1, name="Strength"),
+        level=Level(id=1, name="Intermediate"),
+    )
+
+
+def _unit(i: int) -> TrainingUnit:
+    return TrainingUnit(
+        id=i,
+        name=f"Unit {i}",
+        description="Heavy day.",
+        owner_id=1,
+        created_at=_NOW,
+        updated_at=_NOW,
+        exercises=[
+            TrainingUnitExercise(
+                id=i * EXERCISES_PER_UNIT + e,
+                exercise=_exercise(e),
+                sets=[
+                    PrescribedSet(set_number=s, reps=8, weight=60.0)
+                    for s in range(1, SETS_PER_EXERCISE + 1)
+                ],
+            )
+            for e in range(EXERCISES_PER_UNIT)
+        ],
+    )
+
+
+def _plan() -> TrainingPlan:
+    return TrainingPlan(
+        id=1,
+        name="Push/Pull/Legs",
+        description="Three-day split.",
+        owner_id=1,
+        created_at=_NOW,
+        updated_at=_NOW,
+        training_units=[_unit(u) for u in range(UNITS_PER_PLAN)],
+    )
+
+
+def _payloads() -> dict[str, tuple[Any, Any]]:
+    # Response model and value of each serialized payload, by benchmark name.
+    page = {
+        "items": [_exercise(i) for i in range(PAGE_SIZE)],
+        "total": 10_000,
+        "skip": 0,
+        "limit": PAGE_SIZE,
+    }
+    return {
+        "page_exercise": (Page[ExerciseInDB], page),
+        "training_plan": (TrainingPlanInDB, _plan()),
+        "training_unit": (TrainingUnitInDB, _unit(0)),
+    }
+
+
+def _serializer(model: Any, value: Any, packed: bool = False) -> Callable[[], bytes]:
+    adapter: TypeAdapter[Any] = TypeAdapter(model)
+
+    def run() -> bytes:
+        content = adapter.validate_python(value, from_attributes=True)
+        if packed:
+            body: bytes = msgpack.packb(adapter.dump_python(content, mode="json"))
+            return body
+        return adapter.dump_json(content)
+
+    return run
+
+
+def payload_bytes() -> dict[str, dict[str, int]]:
+    """Body size of each ``serialize.*`` payload, as JSON and as MessagePack."""
+    return {
+        name: {
+            "json": len(_serializer(model, value)()),
+            "msgpack": len(_serializer(model, value, packed=True)()),
+        }
+        for name, (model, value) in _payloads().items()
+    }
+
+
+def _cache_hit(
+    build: Callable[[], Select[Any]], dialect: PGDialect_asyncpg
+) -> Callable[[], Any]:
+    # What a request does once a statement shape is cached: build the statement
+    # afresh, as the CRUD layer does, then let Connection.execute derive its
+    # cache key and look the compiled form up. A reused statement object would
+    # keep its key memoized and measure the lookup alone.
+    cache: dict[Any, Any] = {}
+    build()._compile_w_cache(dialect, compiled_cache=cache, column_keys=[])
+
+    def run() -> Any:
+        return build()._compile_w_cache(dialect, compiled_cache=cache, column_keys=[])
+
+    return run
+
+
+def build_benchmarks() -> dict[str, Callable[[], Any]]:
+    token = security.create_access_token(42)
+    payload = security.decode_token(token, expected_type="access")
+    password = "correct horse battery staple"
+    hashed = security.get_password_hash(password)
+    dialect = PGDialect_asyncpg()
+
+    def build_many() -> Select[Any]:
+        return exercise_crud.select_many(Exercise.owner_id == 1, limit=PAGE_SIZE)
+
+    many = build_many()
+
+    serialize: dict[str, Callable[[], Any]] = {}
+    decode: dict[str, Callable[[], Any]] = {}
+    for name, (model, value) in _payloads().items():
+        as_json = _serializer(model, value)
+        as_msgpack = _serializer(model, value, packed=True)
+        serialize[f"serialize.{name}"] = as_json
+        serialize[f"serialize.{name}.msgpack"] = as_msgpack
+        json_body, msgpack_body = as_json(), as_msgpack()
+        decode[f"decode.{name}.json"] = lambda body=json_body: json.loads(body)
+        decode[f"decode.{name}.msgpack"] = lambda body=msgpack_body: msgpack.unpackb(
+            body
+        )
+    return {
+        "security.create_access_token": lambda: security.create_access_token(42),
+        "security.decode_token": lambda: security.decode_token(
+            token, expected_type="access"
+        ),
+        "security.verify_password": lambda: security.verify_password(password, hashed),
+        "security.token_payload": lambda: TokenPayload(**payload),
+        **serialize,
+        **decode,
+        "sql.build_select_many": build_many,
+        "sql.compile_select_many": lambda: many.compile(dialect=dialect),
+        "sql.compile_select_count": lambda: training_plan_crud.select_count(
+            TrainingPlan.owner_id == 1
+        ).compile(dialect=dialect),
+        "sql.cache_hit_select_many": _cache_hit(build_many, dialect),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5) -> MicroResult:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(5):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return MicroResult(round(1 / best, 1), int(statistics.median(peaks)))
+
+
+def _delta(value: float, before: float | None) -> str:
+    return f"{(value - before) / before:+.1%}" if before else ""
+
+
+def run(selected: str | None, output: Path | None, baseline: Path | None) -> None:
+    previous = json.loads(baseline.read_text())["results"] if baseline else {}
+    results: dict[str, MicroResult] = {}
+    rounds = security.password_hash.current_hasher.rounds  # type: ignore[attr-defined]
+    print(f"bcrypt cost factor: {rounds}")
+    print(f"{'benchmark':<32}{'ops/s':>14}{'':>9}{'bytes/op':>12}{'':>9}")
+    for name, fn in build_benchmarks().items():
+        if selected and selected not in name:
+            continue
+        result = results[name] = measure(fn)
+        before = previous.get(name, {})
+        print(
+            f"{name:<32}{result.ops_per_sec:>14,.1f}"
+            f"{_delta(result.ops_per_sec, before.get('ops_per_sec')):>9}"
+            f"{result.bytes_per_op:>12,}"
+            f"{_delta(result.bytes_per_op, before.get('bytes_per_op')):>9}"
+        )
+    sizes = payload_bytes()
+    print(f"\n{'payload':<32}{'json bytes':>14}{'msgpack bytes':>18}")
+    for name, size in sizes.items():
+        ratio = size["msgpack"] / size["json"]
+        print(f"{name:<32}{size['json']:>14,}{size['msgpack']:>18,} ({ratio:.0%})")
+    if output:
+        document = {
+            "meta": {"bcrypt_rounds": rounds, "payload_bytes": sizes},
+            "results": {name: asdict(r) for name, r in results.items()},
+        }
+        output.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def build_argparser() -> ArgumentParser:
+    parser = ArgumentParser(description="Microbenchmark request building blocks.")
+    parser.add_argument("-k", dest="selected", help="Run benchmarks matching this.")
+    parser.add_argument("--json", type=Path, help="Write results to this file.")
+    parser.add_argument(
+        "--compare", type=Path, help="Show deltas against a previous --json file."
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(args.selected, args.json, args.compare)
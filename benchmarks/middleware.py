@@ -0,0 +1,123 @@
+"""Req/s of the pure-ASGI middleware stack vs the old ``BaseHTTPMiddleware`` one.
+
+Drives both app variants in-process through ``httpx.ASGITransport`` (no socket,
+no server), so the numbers isolate framework + middleware overhead:
+
+    python -m benchmarks.middleware --requests 5000 --concurrency 32
+
+``/health`` needs nothing; the list endpoint (``/api/v1/levels/all``) reads from
+the configured database — start it with ``mise run up`` or pass ``--skip-db``.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from argparse import ArgumentParser
+
+import structlog
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from gymhero.api.middleware import AccessLogMiddleware, RequestIDMiddleware
+from gymhero.config import settings
+from gymhero.database.session import get_async_engine, get_async_session_factory
+from gymhero.main import create_app
+
+logger = logging.getLogger("gymhero.main")
+
+HEALTH = "/health"
+LIST_ENDPOINT = "/api/v1/levels/all"
+
+
+async def _legacy_bind_request_id(
+    request: Request, call_next: RequestResponseEndpoint
+) -> Response:
+    # Verbatim copy of the decorator-based middleware this stack replaced.
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    request.state.request_id = request_id
+    structlog.contextvars.clear_contextvars()
+    structlog.contextvars.bind_contextvars(request_id=request_id)
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    logger.info(
+        "request",
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        },
+    )
+    return response
+
+
+def build_legacy_app() -> FastAPI:
+    app = create_app()
+    app.user_middleware = [
+        m
+        for m in app.user_middleware
+        if m.cls not in (RequestIDMiddleware, AccessLogMiddleware)
+    ]
+    app.add_middleware(BaseHTTPMiddleware, dispatch=_legacy_bind_request_id)
+    return app
+
+
+async def _drive(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Fire ``requests`` GETs at ``path`` from ``concurrency`` workers; return req/s."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(100, requests)):  # warm up routing + pools
+            (await client.get(path)).raise_for_status()
+
+        remaining = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                (await client.get(path)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrency: int, skip_db: bool) -> None:
+    paths = [HEALTH] if skip_db else [HEALTH, LIST_ENDPOINT]
+    engine = None
+    variants = {
+        "before (BaseHTTPMiddleware)": build_legacy_app(),
+        "after (ASGI)": create_app(),
+    }
+    if not skip_db:
+        engine = get_async_engine(settings.async_database_url, pool_size=concurrency)
+        for app in variants.values():
+            app.state.db_session_factory = get_async_session_factory(engine)
+
+    print(f"{'variant':<30}{'path':<24}{'req/s':>10}")
+    try:
+        for path in paths:
+            for name, app in variants.items():
+                rps = await _drive(app, path, requests, concurrency)
+                print(f"{name:<30}{path:<24}{rps:>10.0f}")
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+def build_argparser() -> ArgumentParser:
+    parser = ArgumentParser(description="Benchmark the HTTP middleware stack.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--skip-db", action="store_true", help="Only benchmark /health."
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    # Keep the access log out of the measurement: both variants log the same line.
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args.requests, args.concurrency, args.skip_db))
@@ -0,0 +1,127 @@
+"""Capture the SQL a repository call issues and audit its ``EXPLAIN`` plans.
+
+A *shape* is one repository/service call with fixed arguments. Running it under
+``capture()`` records every statement it sends — including the ``selectin``
+relationship loads the ORM adds — with its bound parameters; each one is then
+re-planned with ``EXPLAIN (FORMAT JSON)`` and checked for:
+
+* a sequential scan of a large table (one the shape did not declare it scans);
+* a sort on keys the shape did not declare;
+* a total cost above the stored plan's by more than the tolerance.
+"""
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+_SEQ_SCANS = frozenset({"Seq Scan", "Parallel Seq Scan"})
+_SORTS = frozenset({"Sort", "Incremental Sort"})
+
+
+@dataclass(frozen=True)
+class Captured:
+    sql: str
+    params: Any
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    sql: str
+    total_cost: float
+    nodes: list[str]
+
+
+@contextmanager
+def capture(engine: AsyncEngine) -> Iterator[list[Captured]]:
+    """Record every statement executed on ``engine`` while open."""
+    statements: list[Captured] = []
+
+    def on_execute(
+        conn: Any, cursor: Any, statement: str, params: Any, *args: Any
+    ) -> None:
+        statements.append(Captured(statement, params))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+async def explain(conn: AsyncConnection, statement: Captured) -> dict[str, Any]:
+    """Plan (not run) ``statement`` with its original parameters."""
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement.sql}", statement.params
+    )
+    plan = result.scalar_one()
+    # asyncpg hands json back as text.
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def large_tables(conn: AsyncConnection, min_rows: int) -> frozenset[str]:
+    """Tables the planner estimates at ``min_rows`` rows or more (needs ANALYZE)."""
+    result = await conn.execute(
+        text(
+            "SELECT relname FROM pg_class JOIN pg_namespace n ON n.oid = relnamespace "
+            "WHERE relkind = 'r' AND nspname = 'public' AND reltuples >= :min_rows"
+        ),
+        {"min_rows": min_rows},
+    )
+    return frozenset(result.scalars())
+
+
+def walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def summarize(sql: str, plan: dict[str, Any]) -> PlanSummary:
+    nodes = [
+        f"{node['Node Type']} on {node['Relation Name']}"
+        if "Relation Name" in node
+        else node["Node Type"]
+        for node in walk(plan)
+    ]
+    return PlanSummary(sql, plan["Total Cost"], nodes)
+
+
+def check_plan(
+    plan: dict[str, Any],
+    *,
+    large: frozenset[str],
+    seq_scans_allowed: frozenset[str] = frozenset(),
+    sorts_allowed: frozenset[str] = frozenset(),
+) -> list[str]:
+    """Describe every node of ``plan`` breaking the shape's expectations."""
+    problems = []
+    for node in walk(plan):
+        kind = node["Node Type"]
+        relation = node.get("Relation Name")
+        if (
+            kind in _SEQ_SCANS
+            and relation in large
+            and relation not in seq_scans_allowed
+        ):
+            problems.append(f"sequential scan of large table {relation}")
+        if kind in _SORTS and not set(node.get("Sort Key", [])) <= sorts_allowed:
+            problems.append(f"unexpected sort on {', '.join(node['Sort Key'])}")
+    return problems
+
+
+def check_cost(
+    current: PlanSummary, stored: dict[str, Any], tolerance: float
+) -> list[str]:
+    if current.sql != stored["sql"]:
+        return []  # the statement itself changed; its cost is not comparable
+    if current.total_cost > stored["total_cost"] * (1 + tolerance):
+        return [
+            f"cost {current.total_cost} vs stored {stored['total_cost']} "
+            f"(plan was {' > '.join(stored['nodes'])})"
+        ]
+    return []
@@ -0,0 +1,270 @@
+"""One benchmark scenario per API route, resolved against the seeded dataset.
+
+Path templates (and string query parameters) are filled from a ``Dataset``: ids
+and (URL-quoted) names picked from the generated data, so every request hits a real row. Reads are repeated
+as-is; writes derive a unique name from the call index.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+from urllib.parse import quote
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+from gymhero.models.training_plan import TrainingPlan
+from gymhero.models.training_unit import TrainingUnit
+from gymhero.models.user import User
+from scripts.core.synthetic import SYNTHETIC_PASSWORD
+
+
+class Actor(StrEnum):
+    ANONYMOUS = "anonymous"
+    USER = "user"
+    SUPERUSER = "superuser"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Ids and names of the rows scenarios address, owned by one busy user."""
+
+    user_id: int
+    superuser_id: int
+    values: dict[str, Any]
+
+
+Body = Callable[[Dataset, int], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    actor: Actor = Actor.USER
+    json: Body | None = None
+    form: Body | None = None
+    status: int = 200
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def url(self, dataset: Dataset) -> str:
+        return self.path.format(**dataset.values)
+
+    def query(self, dataset: Dataset) -> dict[str, Any]:
+        return {
+            key: value.format(**dataset.values) if isinstance(value, str) else value
+            for key, value in self.params.items()
+        }
+
+
+def _login_form(dataset: Dataset, i: int) -> dict[str, Any]:
+    return {"username": dataset.values["user_email"], "password": SYNTHETIC_PASSWORD}
+
+
+def _exercise_body(dataset: Dataset, i: int) -> dict[str, Any]:
+    return {
+        "name": f"{dataset.values['run']} exercise {i}",
+        "target_body_part_id": dataset.values["body_part_id"],
+        "exercise_type_id": dataset.values["exercise_type_id"],
+        "level_id": dataset.values["level_id"],
+    }
+
+
+def _training_unit_body(dataset: Dataset, i: int) -> dict[str, Any]:
+    return {"name": f"{dataset.values['run']} unit {i}"}
+
+
+PAGE = {"limit": 100}
+
+SCENARIOS = [
+    Scenario("health", "GET", "/health", Actor.ANONYMOUS),
+    Scenario("ready", "GET", "/ready", Actor.ANONYMOUS),
+    Scenario("auth.me", "GET", "/api/v1/auth/me"),
+    Scenario(
+        "auth.login", "POST", "/api/v1/auth/login", Actor.ANONYMOUS, form=_login_form
+    ),
+    Scenario("exercises.all", "GET", "/api/v1/exercises/all", params=PAGE),
+    Scenario("exercises.my", "GET", "/api/v1/exercises/my", params=PAGE),
+    Scenario("exercises.facets", "GET", "/api/v1/exercises/facets"),
+    Scenario(
+        "exercises.by_ids",
+        "GET",
+        "/api/v1/exercises/",
+        params={"ids": "{exercise_id},{exercise_id_2}"},
+    ),
+    Scenario("exercises.by_id", "GET", "/api/v1/exercises/{exercise_id}"),
+    Scenario("exercises.by_name", "GET", "/api/v1/exercises/name/{exercise_name}"),
+    Scenario(
+        "exercises.create",
+        "POST",
+        "/api/v1/exercises/",
+        json=_exercise_body,
+        status=201,
+    ),
+    Scenario("exercise_types.all", "GET", "/api/v1/exercise-types/all"),
+    Scenario(
+        "exercise_types.by_id", "GET", "/api/v1/exercise-types/{exercise_type_id}"
+    ),
+    Scenario(
+        "exercise_types.by_name",
+        "GET",
+        "/api/v1/exercise-types/name/{exercise_type_name}",
+    ),
+    Scenario("levels.all", "GET", "/api/v1/levels/all"),
+    Scenario("levels.by_id", "GET", "/api/v1/levels/{level_id}"),
+    Scenario("levels.by_name", "GET", "/api/v1/levels/name/{level_name}"),
+    Scenario("body_parts.all", "GET", "/api/v1/body-parts/all"),
+    Scenario("body_parts.by_id", "GET", "/api/v1/body-parts/{body_part_id}"),
+    Scenario("body_parts.by_name", "GET", "/api/v1/body-parts/name/{body_part_name}"),
+    Scenario("users.all", "GET", "/api/v1/users/all", Actor.SUPERUSER, params=PAGE),
+    Scenario("users.by_id", "GET", "/api/v1/users/{user_id}", Actor.SUPERUSER),
+    Scenario(
+        "users.by_email", "GET", "/api/v1/users/email/{user_email}", Actor.SUPERUSER
+    ),
+    Scenario(
+        "training_plans.all",
+        "GET",
+        "/api/v1/training-plans/all",
+        Actor.SUPERUSER,
+        params=PAGE,
+    ),
+    Scenario("training_plans.my", "GET", "/api/v1/training-plans/all/my", params=PAGE),
+    Scenario(
+        "training_plans.by_ids",
+        "GET",
+        "/api/v1/training-plans/",
+        params={"ids": "{training_plan_id},{training_plan_id_2}"},
+    ),
+    Scenario(
+        "training_plans.by_id", "GET", "/api/v1/training-plans/{training_plan_id}"
+    ),
+    Scenario(
+        "training_plans.training_units",
+        "GET",
+        "/api/v1/training-plans/{training_plan_id}/training-units",
+    ),
+    Scenario(
+        "training_plans.by_name",
+        "GET",
+        "/api/v1/training-plans/name/{training_plan_name}",
+    ),
+    Scenario(
+        "training_plans.by_name_superuser",
+        "GET",
+        "/api/v1/training-plans/name/{training_plan_name}/superuser",
+        Actor.SUPERUSER,
+    ),
+    Scenario(
+        "training_units.all",
+        "GET",
+        "/api/v1/training-units/all",
+        Actor.SUPERUSER,
+        params=PAGE,
+    ),
+    Scenario("training_units.my", "GET", "/api/v1/training-units/all/my", params=PAGE),
+    Scenario(
+        "training_units.by_ids",
+        "GET",
+        "/api/v1/training-units/",
+        params={"ids": "{training_unit_id},{training_unit_id_2}"},
+    ),
+    Scenario(
+        "training_units.by_id", "GET", "/api/v1/training-units/{training_unit_id}"
+    ),
+    Scenario(
+        "training_units.by_name",
+        "GET",
+        "/api/v1/training-units/name/{training_unit_name}",
+    ),
+    Scenario(
+        "training_units.by_name_superuser",
+        "GET",
+        "/api/v1/training-units/name/{training_unit_name}/superuser",
+        Actor.SUPERUSER,
+    ),
+    Scenario(
+        "training_units.exercises",
+        "GET",
+        "/api/v1/training-units/{training_unit_id}/exercises",
+    ),
+    Scenario(
+        "training_units.create",
+        "POST",
+        "/api/v1/training-units/",
+        json=_training_unit_body,
+        status=201,
+    ),
+]
+
+
+def load_dataset(session: Session, superuser_id: int, run: str) -> Dataset:
+    """Pick the user with the most training plans and one of each of their rows."""
+    user = session.scalars(
+        select(User)
+        .join(TrainingPlan, TrainingPlan.owner_id == User.id)
+        .group_by(User.id)
+        .order_by(func.count().desc(), User.id)
+        .limit(1)
+    ).one()
+
+    def first(model: Any, owned: bool = False) -> Any:
+        # An encoded "/" still splits the path, so by-name routes can't take it.
+        query = select(model).where(~model.name.contains("/")).order_by(model.id)
+        query = query.limit(1)
+        if owned:
+            query = query.where(model.owner_id == user.id)
+        return session.scalars(query).one()
+
+    # Not every user creates exercises: fall back to the catalog's first one.
+    exercise = session.scalars(
+        select(Exercise)
+        .where(
+            Exercise.owner_id.in_([user.id, superuser_id]),
+            ~Exercise.name.contains("/"),
+        )
+        .order_by(Exercise.owner_id == superuser_id, Exercise.id)
+        .limit(1)
+    ).one()
+
+    def last_id(model: Any, *where: Any) -> int:
+        # A second id for the multi-get scenarios; may equal the first one.
+        return session.scalars(select(func.max(model.id)).where(*where)).one()
+
+    unit = first(TrainingUnit, owned=True)
+    plan = first(TrainingPlan, owned=True)
+    level, body_part, exercise_type = first(Level), first(BodyPart), first(ExerciseType)
+    return Dataset(
+        user_id=user.id,
+        superuser_id=superuser_id,
+        values={
+            "run": run,
+            "user_id": user.id,
+            "user_email": user.email,
+            "exercise_id": exercise.id,
+            "exercise_name": quote(exercise.name, safe=""),
+            "exercise_id_2": last_id(
+                Exercise, Exercise.owner_id.in_([user.id, superuser_id])
+            ),
+            "training_unit_id": unit.id,
+            "training_unit_name": quote(unit.name, safe=""),
+            "training_unit_id_2": last_id(
+                TrainingUnit, TrainingUnit.owner_id == user.id
+            ),
+            "training_plan_id": plan.id,
+            "training_plan_name": quote(plan.name, safe=""),
+            "training_plan_id_2": last_id(
+                TrainingPlan, TrainingPlan.owner_id == user.id
+            ),
+            "level_id": level.id,
+            "level_name": quote(level.name, safe=""),
+            "body_part_id": body_part.id,
+            "body_part_name": quote(body_part.name, safe=""),
+            "exercise_type_id": exercise_type.id,
+            "exercise_type_name": quote(exercise_type.name, safe=""),
+        },
+    )
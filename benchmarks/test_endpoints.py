@@ -0,0 +1,101 @@
+"""Benchmark every API route and gate on regressions vs the stored baseline.
+
+    pytest benchmarks                          # measure + compare
+    pytest benchmarks --bench-save-baseline    # promote this run to baseline
+    pytest benchmarks --bench-record-only      # measure, compare nothing
+
+A route without a baseline entry fails, unless this run saves the baseline.
+"""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.harness import (
+    RouteResult,
+    StatementCounter,
+    compare,
+    load_results,
+    measure,
+)
+from benchmarks.scenarios import SCENARIOS, Actor, Dataset, Scenario
+from gymhero.main import app
+from tests.helpers import auth_headers
+
+
+def _sender(
+    client: AsyncClient, scenario: Scenario, dataset: Dataset
+) -> Callable[[int], Awaitable[None]]:
+    url = scenario.url(dataset)
+    headers = {
+        Actor.ANONYMOUS: {},
+        Actor.USER: auth_headers(dataset.user_id),
+        Actor.SUPERUSER: auth_headers(dataset.superuser_id),
+    }[scenario.actor]
+
+    async def send(i: int) -> None:
+        response = await client.request(
+            scenario.method,
+            url,
+            params=scenario.query(dataset),
+            headers=headers,
+            json=scenario.json(dataset, i) if scenario.json else None,
+            data=scenario.form(dataset, i) if scenario.form else None,
+        )
+        assert response.status_code == scenario.status, response.text
+
+    return send
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.name)
+async def test_endpoint(
+    scenario: Scenario,
+    dataset: Dataset,
+    bench_client: AsyncClient,
+    bench_engine: AsyncEngine,
+    results: dict[str, RouteResult],
+    request: pytest.FixtureRequest,
+) -> None:
+    config = request.config
+    result = await measure(
+        _sender(bench_client, scenario, dataset),
+        StatementCounter(bench_engine),
+        requests=config.getoption("--bench-requests"),
+        concurrency=config.getoption("--bench-concurrency"),
+    )
+    results[scenario.name] = result
+
+    if config.getoption("--bench-record-only"):
+        return
+    baseline = load_results(config.getoption("--bench-baseline"))["routes"]
+    if scenario.name not in baseline:
+        if config.getoption("--bench-save-baseline"):
+            return  # recorded now
+        pytest.fail(
+            f"{scenario.name}: no baseline entry; record one with "
+            "--bench-save-baseline, or pass --bench-record-only"
+        )
+    regressions = compare(
+        result, baseline[scenario.name], config.getoption("--bench-tolerance")
+    )
+    assert not regressions, f"{scenario.name} regressed: " + "; ".join(regressions)
+
+
+def test_every_route_has_a_scenario() -> None:
+    # The OpenAPI paths, not app.routes: included routers sit there unexpanded.
+    covered = {_shape(s.path) for s in SCENARIOS if s.method == "GET"}
+    missing = sorted(
+        path
+        for path, operations in app.openapi()["paths"].items()
+        if "get" in operations and _shape(path) not in covered
+    )
+    assert not missing, f"GET routes without a benchmark scenario: {missing}"
+
+
+def _shape(path: str) -> str:
+    # Path parameter names differ (scenarios use dataset keys); compare shapes.
+    return "/".join(
+        "{}" if part.startswith("{") else part for part in path.rstrip("/").split("/")
+    )
@@ -0,0 +1,216 @@
+"""Plan every repository query shape against the scaled dataset.
+
+    pytest benchmarks -k plans                          # audit + compare
+    pytest benchmarks -k plans --bench-save-baseline    # store current plans
+
+Fails on a sequential scan of a large table (``--plan-large-rows``), a sort, or
+a total-cost regression past the baseline's ``plans`` (beyond
+``--bench-tolerance``). Shapes declare the scans and sorts inherent to them.
+"""
+
+import itertools
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import unquote
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from benchmarks.plans import (
+    PlanSummary,
+    capture,
+    check_cost,
+    check_plan,
+    explain,
+    large_tables,
+    summarize,
+)
+from benchmarks.scenarios import Dataset
+from gymhero.crud import (
+    exercise_crud,
+    training_plan_crud,
+    training_unit_crud,
+    user_crud,
+)
+from gymhero.database.session import get_async_session_factory
+from gymhero.models.exercise import Exercise
+from gymhero.models.training_plan import TrainingPlan
+from gymhero.models.training_unit import TrainingUnit
+from gymhero.models.user import User
+from gymhero.services import exercise as exercise_service
+from gymhero.services import training_plan as training_plan_service
+from gymhero.services import training_unit as training_unit_service
+from gymhero.services.ownership import get_owned_or_404
+
+# Prescribed sets are loaded ordered by set number (relationship order_by).
+SET_ORDER = frozenset({"set_number"})
+
+Call = Callable[[AsyncSession, Dataset, dict[str, User]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Shape:
+    name: str
+    call: Call
+    seq_scans_allowed: frozenset[str] = frozenset()
+    sorts_allowed: frozenset[str] = frozenset()
+
+
+_EXERCISE_FILTERS = ("owner_id", "q", "exercise_type_id", "level_id", "body_part_id")
+
+
+def _exercise_list(combination: tuple[str, ...]) -> Shape:
+    async def call(db: AsyncSession, data: Dataset, users: dict[str, User]) -> Any:
+        values = data.values
+        return await exercise_service.list_exercises(
+            db,
+            owner_id=values["user_id"] if "owner_id" in combination else None,
+            q="press" if "q" in combination else None,
+            exercise_type_id=values["exercise_type_id"]
+            if "exercise_type_id" in combination
+            else None,
+            level_id=values["level_id"] if "level_id" in combination else None,
+            target_body_part_id=values["body_part_id"]
+            if "body_part_id" in combination
+            else None,
+        )
+
+    # Without an owner the catalog filters are low-selectivity or unanchored
+    # (ILIKE '%q%'), and the total is a count over all matches: a scan is right.
+    allowed = frozenset() if "owner_id" in combination else frozenset({"exercises"})
+    return Shape(f"exercises.list[{','.join(combination) or 'all'}]", call, allowed)
+
+
+def _owned(crud: Any, model: Any, key: str, actor: str) -> Call:
+    async def call(db: AsyncSession, data: Dataset, users: dict[str, User]) -> Any:
+        return await get_owned_or_404(
+            db,
+            crud=crud,
+            entity_id=data.values[key],
+            actor=users[actor],
+            entity=model.__name__,
+        )
+
+    return call
+
+
+SHAPES = [
+    *(
+        _exercise_list(combination)
+        for n in range(len(_EXERCISE_FILTERS) + 1)
+        for combination in itertools.combinations(_EXERCISE_FILTERS, n)
+    ),
+    Shape(
+        "exercises.get_one[id]",
+        lambda db, data, users: exercise_crud.get_one(
+            db, Exercise.id == data.values["exercise_id"]
+        ),
+    ),
+    Shape(
+        "exercises.get_by_ids",
+        lambda db, data, users: exercise_crud.get_by_ids(
+            db, [data.values["exercise_id"], 0]
+        ),
+    ),
+    Shape(
+        "exercises.get_one[name]",
+        lambda db, data, users: exercise_crud.get_one(
+            db, Exercise.name == unquote(data.values["exercise_name"])
+        ),
+    ),
+    Shape(
+        "users.get_user_by_email",
+        lambda db, data, users: user_crud.get_user_by_email(
+            db, data.values["user_email"]
+        ),
+    ),
+    Shape(
+        "training_units.list[owner_id]",
+        lambda db, data, users: training_unit_service.list_training_units(
+            db, owner_id=data.user_id
+        ),
+        sorts_allowed=SET_ORDER,
+    ),
+    Shape(
+        "training_units.list[all]",
+        lambda db, data, users: training_unit_service.list_training_units(db),
+        frozenset({"training_units"}),
+        SET_ORDER,
+    ),
+    Shape(
+        "training_units.get_owned_or_404[owner]",
+        _owned(training_unit_crud, TrainingUnit, "training_unit_id", "user"),
+        sorts_allowed=SET_ORDER,
+    ),
+    Shape(
+        "training_units.get_owned_or_404[superuser]",
+        _owned(training_unit_crud, TrainingUnit, "training_unit_id", "superuser"),
+        sorts_allowed=SET_ORDER,
+    ),
+    Shape(
+        "training_plans.list[owner_id]",
+        lambda db, data, users: training_plan_service.list_training_plans(
+            db, owner_id=data.user_id
+        ),
+        sorts_allowed=SET_ORDER,
+    ),
+    Shape(
+        "training_plans.list[all]",
+        lambda db, data, users: training_plan_service.list_training_plans(db),
+        frozenset({"training_plans"}),
+        SET_ORDER,
+    ),
+    Shape(
+        "training_plans.get_owned_or_404[owner]",
+        _owned(training_plan_crud, TrainingPlan, "training_plan_id", "user"),
+        sorts_allowed=SET_ORDER,
+    ),
+    Shape(
+        "training_plans.get_owned_or_404[superuser]",
+        _owned(training_plan_crud, TrainingPlan, "training_plan_id", "superuser"),
+        sorts_allowed=SET_ORDER,
+    ),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=lambda s: s.name)
+async def test_query_plan(
+    shape: Shape,
+    dataset: Dataset,
+    bench_engine: AsyncEngine,
+    stored_plans: dict[str, Any],
+    plan_results: dict[str, PlanSummary],
+    request: pytest.FixtureRequest,
+) -> None:
+    factory = get_async_session_factory(bench_engine)
+    async with factory() as db:
+        users = {
+            "user": await db.get_one(User, dataset.user_id),
+            "superuser": await db.get_one(User, dataset.superuser_id),
+        }
+        with capture(bench_engine) as statements:
+            await shape.call(db, dataset, users)
+
+    problems = []
+    async with bench_engine.connect() as conn:
+        large = await large_tables(conn, request.config.getoption("--plan-large-rows"))
+        for i, statement in enumerate(statements):
+            key = f"{shape.name}#{i}"
+            plan = await explain(conn, statement)
+            summary = plan_results[key] = summarize(statement.sql, plan)
+            found = check_plan(
+                plan,
+                large=large,
+                seq_scans_allowed=shape.seq_scans_allowed,
+                sorts_allowed=shape.sorts_allowed,
+            )
+            if key in stored_plans:
+                found += check_cost(
+                    summary,
+                    stored_plans[key],
+                    request.config.getoption("--bench-tolerance"),
+                )
+            problems += [f"{key}: {problem}" for problem in found]
+    assert statements, f"{shape.name} issued no SQL"
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,149 @@
+"""Per-worker admission control: bounded concurrency, a short priority queue.
+
+Past ``max_in_flight`` concurrent requests the database pool is the bottleneck:
+letting more in only makes every request wait on a pool checkout. Extra
+requests wait in a short queue instead, ordered by priority class (probes and
+token refreshes ahead of bulk lists), and are rejected with 503 + Retry-After
+the moment the queue is full or their wait runs out — failing fast, while the
+load balancer (via ``/ready``) steers new traffic elsewhere.
+
+State lives in one event loop, so no locks: every mutation happens between
+awaits.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from enum import IntEnum
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority class; lower values are admitted first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class AdmissionController:
+    """Counts in-flight requests and queues the overflow by priority."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        queue_size: int,
+        queue_timeout: float,
+        *,
+        high_priority_paths: list[str] | None = None,
+        low_priority_paths: list[str] | None = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._priorities: dict[str, Priority] = {
+            **dict.fromkeys(high_priority_paths or [], Priority.HIGH),
+            **dict.fromkeys(low_priority_paths or [], Priority.LOW),
+        }
+        self.in_flight = 0
+        self.shed = 0
+        # Min-heap of (priority, arrival, waiter); a waiter resolves True when a
+        # finishing request hands it its slot, False when it is evicted.
+        self._queue: list[tuple[int, int, asyncio.Future[bool]]] = []
+        self._arrivals = itertools.count()
+
+    def priority(self, path: str) -> Priority:
+        return self._priorities.get(path.rstrip("/") or "/", Priority.NORMAL)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def saturated(self) -> bool:
+        """Every slot is busy and requests are already waiting for one."""
+        return self.in_flight >= self.max_in_flight and bool(self._queue)
+
+    async def acquire(self, priority: Priority) -> bool:
+        """Wait for a slot; False means the request must be shed."""
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            return True
+        if len(self._queue) >= self.queue_size and not self._evict_below(priority):
+            self.shed += 1
+            return False
+
+        waiter: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._arrivals), waiter)
+        heapq.heappush(self._queue, entry)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                admitted = await waiter
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()  # the slot arrived as we gave up: pass it on
+            elif entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            admitted = False
+        if not admitted:
+            self.shed += 1
+        return admitted
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the best queued request if any."""
+        while self._queue:
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                waiter.set_result(True)  # in_flight is unchanged: slot transferred
+                return
+        self.in_flight -= 1
+
+    def _evict_below(self, priority: Priority) -> bool:
+        # Full queue: a request outranking the worst queued one takes its place.
+        if not self._queue:
+            return False
+        worst = max(self._queue)
+        if worst[0] <= priority:
+            return False
+        self._queue.remove(worst)
+        heapq.heapify(self._queue)
+        worst[2].set_result(False)
+        return True
+
+
+class AdmissionMiddleware:
+    """Gate HTTP requests through an ``AdmissionController``."""
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, retry_after: int = 1
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(self.controller.priority(scope["path"])):
+            logger.warning("request shed by admission control")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Service overloaded, retry later"},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
@@ -0,0 +1,53 @@
+"""Serve route responses through the app's tagged cache (``gymhero.cache``).
+
+Like ``respond_shared``, caching happens inside the route, after its
+dependencies have authenticated the caller, under the authorization scope the
+route passes in. The cached bytes are the serialized response, so a hit costs
+no query and no serialization. ``X-Cache`` says how a response was served.
+"""
+
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from fastapi import Request, Response
+
+from gymhero.api.negotiation import media_type, render
+from gymhero.api.singleflight import request_key, respond_shared, response_adapter
+from gymhero.cache import Cache
+
+HEADER = "X-Cache"
+
+
+async def respond_cached[T](
+    request: Request,
+    *,
+    scope: str,
+    response_model: Any,
+    produce: Callable[[], Awaitable[T]],
+    tags: Callable[[T], Iterable[str]],
+    depends_on: frozenset[str] = frozenset(),
+) -> Response:
+    """Serialize ``await produce()`` as ``response_model``, cached.
+
+    ``tags`` names what the result was built from, so writes to any of it
+    invalidate the entry. Without a cache, falls back to ``respond_shared``
+    with its ``depends_on`` tables.
+    """
+    cache: Cache | None = request.app.state.cache
+    if cache is None:
+        return await respond_shared(
+            request,
+            scope=scope,
+            response_model=response_model,
+            produce=produce,
+            depends_on=depends_on,
+        )
+    adapter = response_adapter(response_model)
+
+    async def serialize() -> tuple[bytes, Iterable[str]]:
+        result = await produce()
+        content = adapter.validate_python(result, from_attributes=True)
+        return render(adapter, content), tags(result)
+
+    body, outcome = await cache.fetch(request_key(request, scope), serialize)
+    return Response(body, media_type=media_type(), headers={HEADER: outcome})
@@ -1,15 +1,17 @@
 import jwt
-from fastapi import Depends, Query, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero import security
+from gymhero.config import settings
 from gymhero.crud import user_crud
 from gymhero.database import get_db
 from gymhero.exceptions import _get_credential_exception
 from gymhero.models import User
 from gymhero.schemas.auth import TokenPayload
+from gymhero.schemas.common import SortField, SortOrder
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -20,6 +22,42 @@ def get_pagination_params(
     return skip, limit
 
 
+def get_sort_params(
+    sort: SortField | None = Query(None, description="Sort by; id breaks ties"),
+    order: SortOrder = Query(SortOrder.ASC),
+) -> tuple[SortField | None, bool]:
+    return sort, order == SortOrder.DESC
+
+
+# Primary keys are INTEGER columns; a larger id can't match and asyncpg would
+# refuse to bind it.
+_MAX_ID = 2**31 - 1
+
+
+def get_ids_param(
+    ids: str = Query(
+        pattern=r"^\d{1,10}(,\d{1,10})*$",
+        # Ten digits and a comma per id, so a long list is refused before split.
+        max_length=settings.MULTI_GET_MAX_IDS * 11 - 1,
+        description="Comma-separated ids, e.g. 1,2,3",
+    ),
+) -> list[int]:
+    parts = ids.split(",")
+    if len(parts) > settings.MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"At most {settings.MULTI_GET_MAX_IDS} ids per request",
+        )
+    # Deduplicated, first occurrence wins, so the response follows request order.
+    unique = list(dict.fromkeys(int(i) for i in parts))
+    if max(unique) > _MAX_ID:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Ids must be at most {_MAX_ID}",
+        )
+    return unique
+
+
 def get_token(token: str = Depends(oauth2_scheme)) -> TokenPayload:
     try:
         payload = security.decode_token(token, expected_type="access")
@@ -33,7 +71,7 @@ def get_token(token: str = Depends(oauth2_scheme)) -> TokenPayload:
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: TokenPayload = Depends(get_token)
 ) -> User:
-    user = await user_crud.get_one(db, User.id == token.sub)
+    user = None if token.sub is None else await user_crud.get_by_id(db, token.sub)
     if user is None:
         raise _get_credential_exception(
             status_code=status.HTTP_404_NOT_FOUND, details="User not found"
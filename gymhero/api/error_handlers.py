@@ -4,13 +4,15 @@ import logging
 
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from gymhero.exceptions import (
     DomainError,
     EntityConflictError,
     EntityNotFoundError,
     PermissionDeniedError,
+    RequestTimeoutError,
 )
 
 logger = logging.getLogger(__name__)
@@ -20,8 +22,12 @@ _STATUS_BY_EXCEPTION: tuple[tuple[type[DomainError], int], ...] = (
     (EntityNotFoundError, status.HTTP_404_NOT_FOUND),
     (EntityConflictError, status.HTTP_409_CONFLICT),
     (PermissionDeniedError, status.HTTP_403_FORBIDDEN),
+    (RequestTimeoutError, status.HTTP_504_GATEWAY_TIMEOUT),
 )
 
+# Postgres `query_canceled`: statement_timeout (the request deadline) fired.
+_QUERY_CANCELED = "57014"
+
 
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(DomainError)
@@ -37,6 +43,23 @@ def register_exception_handlers(app: FastAPI) -> None:
 
     @app.exception_handler(SQLAlchemyError)
     async def _handle_database_error(_: Request, exc: SQLAlchemyError) -> JSONResponse:
+        if isinstance(exc, PoolTimeoutError):
+            # Every pooled connection is busy: shed load, the client may retry.
+            logger.warning("database pool exhausted")
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Service temporarily unavailable"},
+                headers={"Retry-After": "1"},
+            )
+        if (
+            isinstance(exc, DBAPIError)
+            and getattr(exc.orig, "sqlstate", None) == _QUERY_CANCELED
+        ):
+            logger.warning("query cancelled by request deadline")
+            return JSONResponse(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                content={"detail": "Request timed out"},
+            )
         # Never leak raw DB/ORM errors to the client.
         logger.error("database error", exc_info=exc)
         return JSONResponse(
@@ -0,0 +1,282 @@
+"""Sparse fieldsets (``fields=``) and relationship expansion (``expand=``).
+
+Each resource's read model is described by a ``Shape``: its ORM model, its
+read schema, and the relationships a response may embed. A request narrows
+that down with two query parameters:
+
+* ``fields=id,name`` — the top-level fields to return. ``id`` always is.
+* ``expand=training_units.exercises`` — the relationships to load and embed,
+  as dotted paths; a path expands its prefixes too. Without ``expand``, a
+  resource embeds what it always has. ``expand=`` (empty) embeds nothing.
+
+A relationship named in ``fields`` is embedded even if not expanded, and one
+left out of ``fields`` is not, whatever ``expand`` says. Nested objects keep
+all their own scalar fields.
+
+The resulting ``FieldSet`` turns into both halves of a response. Its loader
+``options`` select just the requested columns of the top-level rows
+(``load_only``), load the expanded relationships (``selectinload``) and skip
+every other one, including the models' eager ``selectin`` defaults
+(``noload``). Its ``model`` is a pydantic model with just those fields, so
+serialization never touches an attribute that wasn't loaded. A request that
+asks for the default gets no options and the route's own schema, so its
+queries and bytes are exactly those of a plain request.
+"""
+
+import functools
+import operator
+import types
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Union, get_args, get_origin
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import load_only, noload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from gymhero.api.negotiation import media_type, render
+from gymhero.api.singleflight import response_adapter
+from gymhero.database.base_class import Base
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+from gymhero.models.training_plan import TrainingPlan
+from gymhero.models.training_unit import (
+    PrescribedSet,
+    TrainingUnit,
+    TrainingUnitExercise,
+)
+from gymhero.schemas.body_part import BodyPartOut
+from gymhero.schemas.exercise import ExerciseInDB, ExerciseSummary
+from gymhero.schemas.exercise_type import ExerciseTypeOut
+from gymhero.schemas.level import LevelOut
+from gymhero.schemas.training_plan import TrainingPlanInDB
+from gymhero.schemas.training_unit import (
+    PrescribedSetOut,
+    TrainingUnitExerciseOut,
+    TrainingUnitInDB,
+    TrainingUnitOut,
+)
+
+
+# eq=False: shapes are compared (and cached on) by identity.
+@dataclass(frozen=True, eq=False)
+class Shape:
+    """How ``schema`` is read from ``model``."""
+
+    model: type[Base]
+    schema: type[BaseModel]
+    # Relationships a response may embed, by schema field (= ORM attribute) name.
+    relations: Mapping[str, "Shape"] = field(default_factory=dict)
+    # Relationships always embedded with this shape; not valid in ``expand``.
+    embedded: frozenset[str] = frozenset()
+    # Expanded when the request has no ``expand`` (dotted, prefixes included).
+    default_expand: frozenset[str] = frozenset()
+    # Columns loaded whatever ``fields`` says: what the route itself reads.
+    keys: tuple[str, ...] = ("id",)
+
+    def fieldset(self, fields: str | None, expand: str | None) -> "FieldSet":
+        """Parse the query parameters; ``ValueError`` names what's unknown."""
+        selected = None
+        if fields is not None:
+            selected = frozenset(filter(None, fields.split(","))) | {"id"}
+            if unknown := selected - self.schema.model_fields.keys():
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        paths = self.default_expand
+        if expand is not None:
+            paths = frozenset()
+            for path in filter(None, expand.split(",")):
+                paths |= self._expansion(path)
+        if selected is not None:
+            paths = frozenset(p for p in paths if p.partition(".")[0] in selected) | (
+                selected & self.relations.keys()
+            )
+        return FieldSet(self, selected, paths)
+
+    def _expansion(self, path: str) -> frozenset[str]:
+        # `path` and its prefixes, checked against the relations at each step.
+        shape, prefix, expanded = self, "", set()
+        for name in path.split("."):
+            if name not in shape.relations or name in shape.embedded:
+                raise ValueError(f"Cannot expand {path}")
+            prefix = f"{prefix}.{name}" if prefix else name
+            expanded.add(prefix)
+            shape = shape.relations[name]
+        return frozenset(expanded)
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    shape: Shape
+    # Top-level fields requested, or ``None`` for all of them.
+    fields: frozenset[str] | None
+    # Relationship paths to load and embed.
+    expand: frozenset[str]
+
+    @property
+    def full(self) -> bool:
+        """Whether this is what a request without the parameters gets."""
+        return self.fields is None and self.expand == self.shape.default_expand
+
+    @property
+    def model(self) -> type[BaseModel]:
+        if self.full:
+            return self.shape.schema
+        return _sparse_model(self.shape, self.fields, self.expand)
+
+    def response_model(self, envelope: Any = None) -> Any:
+        """``model``, or ``envelope[model]`` for a ``Page`` or ``Batch``."""
+        return envelope[self.model] if envelope is not None else self.model
+
+    def options(self) -> tuple[ORMOption, ...]:
+        """Loader options reading just this fieldset; none for the default."""
+        if self.full:
+            return ()
+        options = _relation_options(self.shape, self.expand, None)
+        if self.fields is not None:
+            model = self.shape.model
+            columns = set(self.shape.keys) | (self.fields - self.shape.relations.keys())
+            for name in self.expand & self.shape.relations.keys():
+                relation = getattr(model, name).property
+                columns.update(column.key for column in relation.local_columns)
+            options.append(
+                load_only(*(getattr(model, column) for column in sorted(columns)))
+            )
+        return tuple(options)
+
+
+def _subtree(paths: frozenset[str], name: str) -> frozenset[str]:
+    prefix = f"{name}."
+    return frozenset(p.removeprefix(prefix) for p in paths if p.startswith(prefix))
+
+
+def _relation_options(
+    shape: Shape, paths: frozenset[str], parent: _AbstractLoad | None
+) -> list[ORMOption]:
+    # selectinload what's expanded (and embedded), noload every other relation.
+    options: list[ORMOption] = []
+    for name in sorted((paths & shape.relations.keys()) | shape.embedded):
+        attribute = getattr(shape.model, name)
+        loader = parent.selectinload(attribute) if parent else selectinload(attribute)
+        options.append(loader)
+        options.extend(
+            _relation_options(shape.relations[name], _subtree(paths, name), loader)
+        )
+    options.append(parent.noload("*") if parent else noload("*"))
+    return options
+
+
+def _substitute(annotation: Any, old: type, new: type) -> Any:
+    # `annotation` with `old` replaced by `new`, e.g. in `list[old] | None`.
+    if annotation is old:
+        return new
+    origin, args = get_origin(annotation), get_args(annotation)
+    if not args:
+        return annotation
+    args = tuple(_substitute(arg, old, new) for arg in args)
+    if origin in (Union, types.UnionType):
+        return functools.reduce(operator.or_, args)
+    return origin[args[0] if len(args) == 1 else args]
+
+
+# Keyed on client input, so bounded; a model rebuilt after eviction is equivalent.
+@functools.lru_cache(maxsize=256)
+def _sparse_model(
+    shape: Shape, fields: frozenset[str] | None, paths: frozenset[str]
+) -> type[BaseModel]:
+    expanded = (paths & shape.relations.keys()) | shape.embedded
+    definitions: dict[str, Any] = {}
+    for name, info in shape.schema.model_fields.items():
+        if name in shape.relations:
+            if name not in expanded:
+                continue
+            nested = shape.relations[name]
+            annotation = _substitute(
+                info.annotation,
+                nested.schema,
+                _sparse_model(nested, None, _subtree(paths, name)),
+            )
+        elif fields is not None and name not in fields:
+            continue
+        else:
+            annotation = info.annotation
+        definitions[name] = (annotation, info)
+    return create_model(
+        f"{shape.schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def fieldset_params(shape: Shape) -> Callable[..., FieldSet]:
+    """A dependency reading ``fields`` and ``expand`` for ``shape``."""
+
+    def get_fieldset(
+        fields: str | None = Query(
+            None, description="Comma-separated top-level fields; id is always sent"
+        ),
+        expand: str | None = Query(
+            None,
+            description="Comma-separated relationships to embed, as dotted paths",
+        ),
+    ) -> FieldSet:
+        try:
+            return shape.fieldset(fields, expand)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)
+            ) from exc
+
+    return get_fieldset
+
+
+def respond_shaped(fieldset: FieldSet, content: Any, envelope: Any = None) -> Any:
+    """``content`` for FastAPI to serialize as the route's ``response_model``,
+    or, for a sparse fieldset, already serialized with just its fields."""
+    if fieldset.full:
+        return content
+    adapter = response_adapter(fieldset.response_model(envelope))
+    body = render(adapter, adapter.validate_python(content, from_attributes=True))
+    return Response(body, media_type=media_type())
+
+
+EXERCISE = Shape(
+    Exercise,
+    ExerciseInDB,
+    relations={
+        "target_body_part": Shape(BodyPart, BodyPartOut),
+        "exercise_type": Shape(ExerciseType, ExerciseTypeOut),
+        "level": Shape(Level, LevelOut),
+    },
+    default_expand=frozenset({"target_body_part", "exercise_type", "level"}),
+)
+_UNIT_EXERCISE = Shape(
+    TrainingUnitExercise,
+    TrainingUnitExerciseOut,
+    relations={
+        "exercise": Shape(Exercise, ExerciseSummary),
+        "sets": Shape(PrescribedSet, PrescribedSetOut),
+    },
+    embedded=frozenset({"exercise"}),
+)
+_UNIT_RELATIONS = {"exercises": _UNIT_EXERCISE}
+_UNIT_DEFAULT = frozenset({"exercises", "exercises.sets"})
+# Owner-private: the ownership check and cache tags read owner_id.
+TRAINING_UNIT = Shape(
+    TrainingUnit,
+    TrainingUnitInDB,
+    relations=_UNIT_RELATIONS,
+    default_expand=_UNIT_DEFAULT,
+    keys=("id", "owner_id"),
+)
+TRAINING_PLAN = Shape(
+    TrainingPlan,
+    TrainingPlanInDB,
+    relations={"training_units": Shape(TrainingUnit, TrainingUnitOut, _UNIT_RELATIONS)},
+    default_expand=frozenset(
+        {"training_units"} | {f"training_units.{p}" for p in _UNIT_DEFAULT}
+    ),
+    keys=("id", "owner_id"),
+)
@@ -0,0 +1,161 @@
+"""Pure-ASGI middleware: request-id binding, access logging, disconnect handling.
+
+Written against the raw ASGI interface rather than ``@app.middleware("http")``
+(Starlette's ``BaseHTTPMiddleware``), which wraps every request in an extra task
+and re-streams the response body through a memory channel. These only touch
+``scope`` and the ``http.response.start`` message, so bodies — including
+streaming ones — pass straight through.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# `scope["state"]` flag set when the client went away mid-request.
+CLIENT_DISCONNECTED = "client_disconnected"
+# nginx's "client closed request": nothing was sent, the client wasn't there.
+STATUS_CLIENT_CLOSED_REQUEST = 499
+
+
+class RequestIDMiddleware:
+    """Bind a per-request id into the log context and echo it back to the client."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        # `request.state` is backed by scope["state"]; the catch-all error handler
+        # reads the id from there to re-attach it to a 500.
+        scope.setdefault("state", {})["request_id"] = request_id
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+
+class AccessLogMiddleware:
+    """Log one ``request`` line per HTTP request with its status and duration."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        # An exception escaping the app becomes a 500 in ServerErrorMiddleware.
+        status_code = 500
+
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_capturing_status)
+        finally:
+            if scope.get("state", {}).get(CLIENT_DISCONNECTED):
+                status_code = STATUS_CLIENT_CLOSED_REQUEST
+            logger.info(
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                },
+            )
+
+
+class ClientDisconnectMiddleware:
+    """Cancel the request handler as soon as the client disconnects.
+
+    Without this a handler keeps running — and holding its pooled connection —
+    until its query finishes, even though nobody will read the answer.
+    Cancelling the request's task cancels the in-flight asyncpg query on the
+    server too. The app runs in the request's own task; the ASGI ``receive``
+    channel is pumped by one side task that buffers messages for the app, so
+    the disconnect is seen even while the app is not reading. The buffer holds
+    ``BUFFERED_MESSAGES`` body chunks at most: past that the pump waits for the
+    app to read, like a server would.
+    """
+
+    BUFFERED_MESSAGES = 16
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_task = asyncio.current_task()
+        if scope["type"] != "http" or request_task is None:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue(self.BUFFERED_MESSAGES)
+        response_complete = False
+        disconnected = False
+
+        async def send_tracking_completion(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+            await send(message)
+
+        async def watch_receive() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                # Servers also report a disconnect once the response is done;
+                # only an early one means the client gave up.
+                if message["type"] == "http.disconnect" and not response_complete:
+                    disconnected = True
+                    request_task.cancel()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        def withdraw_cancel() -> bool:
+            # More than our own cancellation pending: we were cancelled
+            # ourselves too (e.g. shutdown), so leave it be.
+            if not disconnected or request_task.cancelling() > 1:
+                return False
+            request_task.uncancel()
+            scope.setdefault("state", {})[CLIENT_DISCONNECTED] = True
+            logger.info("client disconnected, request cancelled")
+            return True
+
+        watcher = asyncio.create_task(watch_receive())
+        try:
+            await self.app(scope, messages.get, send_tracking_completion)
+            # The app swallowed our cancellation, or returned before it was
+            # delivered: don't let it surface at an outer middleware's await.
+            withdraw_cancel()
+        except asyncio.CancelledError:
+            if not withdraw_cancel():
+                raise
+        finally:
+            watcher.cancel()
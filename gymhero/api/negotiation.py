@@ -0,0 +1,147 @@
+"""MessagePack as an alternative to JSON, chosen per request.
+
+A client that sends ``Accept: application/msgpack`` gets its response bodies as
+MessagePack: the same schemas and field names as the JSON, in a more compact
+encoding (``python -m benchmarks.micro -k serialize`` compares the two; bodies
+come out about a fifth smaller, for somewhat more encoding time than pydantic's
+``dump_json``). A request body sent with
+``Content-Type: application/msgpack`` is read like the equivalent JSON one.
+``application/x-msgpack`` and ``application/vnd.msgpack`` are accepted too.
+
+Negotiation is done by ``NegotiatedRoute``, the route class of the API's
+routers. FastAPI still serializes to JSON in one step from the response model;
+for a MessagePack request the route re-encodes that JSON. The routes that
+serialize their responses themselves (``respond_cached``, ``respond_shared``,
+``respond_shaped``) ``render`` straight to the negotiated format instead, and
+keep their cached bytes per format. Error responses stay JSON.
+"""
+
+import functools
+import json
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+import msgpack
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from starlette.datastructures import MutableHeaders
+from starlette.types import Message, Receive, Scope, Send
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = frozenset(
+    {MSGPACK, "application/x-msgpack", "application/vnd.msgpack"}
+)
+
+_media_type: ContextVar[str] = ContextVar("media_type", default=JSON)
+
+
+@functools.lru_cache(maxsize=256)
+def negotiate(accept: str | None) -> str:
+    """The response media type for an ``Accept`` header.
+
+    MessagePack only when asked for by name, with a quality at least that of
+    ``application/json``; JSON for everything else, wildcards included.
+    """
+    msgpack_q = json_q = 0.0
+    for part in (accept or "").split(","):
+        media_range, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_range = media_range.lower()
+        if media_range in _MSGPACK_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_range == JSON:
+            json_q = max(json_q, q)
+    return MSGPACK if msgpack_q > 0 and msgpack_q >= json_q else JSON
+
+
+def media_type() -> str:
+    """The media type negotiated for the response to the current request."""
+    return _media_type.get()
+
+
+def render(adapter: TypeAdapter[Any], content: Any) -> bytes:
+    """``content``, already validated by ``adapter``, in the negotiated format."""
+    if _media_type.get() == MSGPACK:
+        body: bytes = msgpack.packb(
+            adapter.dump_python(content, mode="json", by_alias=True)
+        )
+        return body
+    return adapter.dump_json(content, by_alias=True)
+
+
+def _is_msgpack(content_type: str | None) -> bool:
+    return (content_type or "").partition(";")[0].strip().lower() in _MSGPACK_TYPES
+
+
+def _json_request(request: Request, body: bytes) -> Request:
+    # `request`, its MessagePack body re-encoded as the JSON FastAPI parses.
+    try:
+        payload = json.dumps(msgpack.unpackb(body)).encode()
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed MessagePack body",
+        ) from exc
+    request.scope["headers"] = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name not in (b"content-type", b"content-length")
+    ] + [(b"content-type", JSON.encode()), (b"content-length", b"%d" % len(payload))]
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    return Request(request.scope, receive)
+
+
+def _to_msgpack(response: Response) -> None:
+    # Re-encode a JSON response in place; anything else is left as it is.
+    content_type = response.headers.get("content-type", "")
+    body = getattr(response, "body", b"")
+    if not body or content_type.partition(";")[0] != JSON:
+        return
+    # bytes(): a pre-serialized body may be a memoryview, which json refuses.
+    response.body = msgpack.packb(json.loads(bytes(body)))
+    response.headers["content-length"] = str(len(response.body))
+    response.headers["content-type"] = MSGPACK
+
+
+class NegotiatedRoute(APIRoute):
+    """An ``APIRoute`` that speaks MessagePack to clients asking for it."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if _is_msgpack(request.headers.get("content-type")):
+                request = _json_request(request, await request.body())
+            token = _media_type.set(negotiate(request.headers.get("accept")))
+            try:
+                response = await handler(request)
+                if _media_type.get() == MSGPACK:
+                    _to_msgpack(response)
+            finally:
+                _media_type.reset(token)
+            return response
+
+        return negotiated_handler
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Vary on every response, error ones included, which the exception
+        # handlers build after the route handler has raised.
+        async def send_with_vary(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Vary", "Accept")
+            await send(message)
+
+        await super().handle(scope, receive, send_with_vary)
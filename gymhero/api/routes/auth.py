@@ -7,14 +7,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero import security
 from gymhero.api.dependencies import get_current_active_user
+from gymhero.api.negotiation import NegotiatedRoute
 from gymhero.crud import user_crud
+from gymhero.crud.base import commit_or_flush
 from gymhero.database import get_db
 from gymhero.models import User
 from gymhero.schemas.auth import RefreshRequest, Token, UserRegister
 from gymhero.schemas.common import Message
 from gymhero.schemas.user import CurrentUser, UserInDB
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 
 def _token_pair(user: User) -> dict[str, str]:
@@ -66,7 +68,7 @@ async def refresh_access_token(
     except jwt.InvalidTokenError as e:
         raise invalid from e
 
-    user = await user_crud.get_one(db, User.id == int(payload["sub"]))
+    user = await user_crud.get_by_id(db, int(payload["sub"]))
     if user is None or not user_crud.is_active_user(user):
         raise invalid
     if payload.get("ver") != user.token_version:  # revoked by logout / password change
@@ -102,4 +104,4 @@ async def logout(
     # version claim that `/refresh` checks against.
     current_user.token_version += 1
     db.add(current_user)
-    await db.commit()
+    await commit_or_flush(db)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero.api.dependencies import get_current_superuser, get_pagination_params
+from gymhero.api.negotiation import NegotiatedRoute
+from gymhero.api.singleflight import PUBLIC, respond_shared
 from gymhero.crud import bodypart_crud
 from gymhero.database.db import get_db
 from gymhero.models import BodyPart
@@ -10,7 +14,7 @@ from gymhero.schemas.body_part import BodyPartCreate, BodyPartInDB, BodyPartUpda
 from gymhero.schemas.common import Page
 from gymhero.services import reference
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 _ENTITY = "Body part"
 
@@ -21,13 +25,24 @@ _ENTITY = "Body part"
     status_code=status.HTTP_200_OK,
 )
 async def fetch_body_parts(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
 ):
     skip, limit = pagination_params
-    items = await bodypart_crud.get_many(db, skip=skip, limit=limit)
-    total = await bodypart_crud.count(db)
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    async def produce() -> dict[str, Any]:
+        items = await bodypart_crud.get_many(db, skip=skip, limit=limit)
+        total = await bodypart_crud.count(db)
+        return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    return await respond_shared(
+        request,
+        scope=PUBLIC,
+        response_model=Page[BodyPartInDB],
+        produce=produce,
+        depends_on=frozenset({"body_parts"}),
+    )
 
 
 @router.get(
@@ -1,63 +1,166 @@
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from gymhero.api.dependencies import get_current_active_user, get_pagination_params
+from gymhero.api.caching import respond_cached
+from gymhero.api.dependencies import (
+    get_current_active_user,
+    get_ids_param,
+    get_pagination_params,
+    get_sort_params,
+)
+from gymhero.api.fieldsets import EXERCISE, FieldSet, fieldset_params, respond_shaped
+from gymhero.api.negotiation import NegotiatedRoute
+from gymhero.api.singleflight import PUBLIC, respond_shared, user_scope
 from gymhero.database.db import get_db
 from gymhero.models import User
-from gymhero.schemas.common import Page
-from gymhero.schemas.exercise import ExerciseCreate, ExerciseInDB, ExerciseUpdate
+from gymhero.schemas.common import Batch, Page, SortField
+from gymhero.schemas.exercise import (
+    ExerciseCreate,
+    ExerciseFacets,
+    ExerciseInDB,
+    ExerciseUpdate,
+)
 from gymhero.services import exercise as exercise_service
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
+
+get_fieldset = fieldset_params(EXERCISE)
+
+# Cached exercise pages go stale when any of these is written.
+_EXERCISE_TABLES = frozenset({"exercises", "levels", "body_parts", "exercise_types"})
 
 
 @router.get("/all", response_model=Page[ExerciseInDB], status_code=status.HTTP_200_OK)
 async def fetch_all_exercises(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
     exercise_type_id: int | None = Query(None),
     level_id: int | None = Query(None),
     target_body_part_id: int | None = Query(None),
+    equipment: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
     skip, limit = pagination_params
-    items, total = await exercise_service.list_exercises(
-        db,
-        q=q,
-        exercise_type_id=exercise_type_id,
-        level_id=level_id,
-        target_body_part_id=target_body_part_id,
-        skip=skip,
-        limit=limit,
+    sort, descending = sort_params
+
+    async def produce() -> dict[str, Any]:
+        items, total = await exercise_service.list_exercises(
+            db,
+            index=request.app.state.exercise_index,
+            q=q,
+            exercise_type_id=exercise_type_id,
+            level_id=level_id,
+            target_body_part_id=target_body_part_id,
+            equipment=equipment,
+            sort=sort,
+            descending=descending,
+            skip=skip,
+            limit=limit,
+            options=fieldset.options(),
+        )
+        return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    # The catalog is the same for every active user.
+    return await respond_cached(
+        request,
+        scope=PUBLIC,
+        response_model=fieldset.response_model(Page),
+        produce=produce,
+        tags=lambda _: exercise_service.CATALOG_CACHE_TAGS,
+        depends_on=_EXERCISE_TABLES,
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
 
 
 @router.get("/my", response_model=Page[ExerciseInDB], status_code=status.HTTP_200_OK)
 async def fetch_all_exercises_for_owner(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
     exercise_type_id: int | None = Query(None),
     level_id: int | None = Query(None),
     target_body_part_id: int | None = Query(None),
+    equipment: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
     skip, limit = pagination_params
-    items, total = await exercise_service.list_exercises(
-        db,
-        owner_id=user.id,
-        q=q,
-        exercise_type_id=exercise_type_id,
-        level_id=level_id,
-        target_body_part_id=target_body_part_id,
-        skip=skip,
-        limit=limit,
+    sort, descending = sort_params
+
+    async def produce() -> dict[str, Any]:
+        items, total = await exercise_service.list_exercises(
+            db,
+            owner_id=user.id,
+            q=q,
+            exercise_type_id=exercise_type_id,
+            level_id=level_id,
+            target_body_part_id=target_body_part_id,
+            equipment=equipment,
+            sort=sort,
+            descending=descending,
+            skip=skip,
+            limit=limit,
+            options=fieldset.options(),
+        )
+        return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    return await respond_shared(
+        request,
+        scope=user_scope(user.id),
+        response_model=fieldset.response_model(Page),
+        produce=produce,
+        depends_on=_EXERCISE_TABLES,
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+
+@router.get("/facets", response_model=ExerciseFacets, status_code=status.HTTP_200_OK)
+async def fetch_exercise_facets(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    q: str | None = Query(None),
+    exercise_type_id: int | None = Query(None),
+    level_id: int | None = Query(None),
+    target_body_part_id: int | None = Query(None),
+    equipment: str | None = Query(None),
+    user: User = Depends(get_current_active_user),
+):
+    async def produce() -> dict[str, Any]:
+        return await exercise_service.count_exercise_facets(
+            db,
+            q=q,
+            exercise_type_id=exercise_type_id,
+            level_id=level_id,
+            target_body_part_id=target_body_part_id,
+            equipment=equipment,
+        )
+
+    # Counts for the /all catalog, so cached and invalidated alike.
+    return await respond_cached(
+        request,
+        scope=PUBLIC,
+        response_model=ExerciseFacets,
+        produce=produce,
+        tags=lambda _: exercise_service.CATALOG_CACHE_TAGS,
+        depends_on=_EXERCISE_TABLES,
+    )
+
+
+@router.get("/", response_model=Batch[ExerciseInDB], status_code=status.HTTP_200_OK)
+async def fetch_exercises_by_ids(
+    ids: list[int] = Depends(get_ids_param),
+    db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
+    user: User = Depends(get_current_active_user),
+):
+    items, missing = await exercise_service.get_exercises(db, ids, fieldset.options())
+    return respond_shaped(fieldset, {"items": items, "missing": missing}, Batch)
 
 
 @router.get(
@@ -66,11 +169,22 @@ async def fetch_all_exercises_for_owner(
     status_code=status.HTTP_200_OK,
 )
 async def fetch_exercise_by_id(
+    request: Request,
     exercise_id: int,
     db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
-    return await exercise_service.get_exercise(db, exercise_id)
+    snapshot = request.app.state.catalog_snapshot
+    if (
+        snapshot is not None
+        and fieldset.full
+        and (body := snapshot.fragment(exercise_id)) is not None
+    ):
+        # Pre-serialized ExerciseInDB, straight out of the shared mapping.
+        return Response(body, media_type="application/json")
+    exercise = await exercise_service.get_exercise(db, exercise_id, fieldset.options())
+    return respond_shaped(fieldset, exercise)
 
 
 @router.get(
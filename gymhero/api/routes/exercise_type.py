@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero.api.dependencies import get_current_superuser, get_pagination_params
+from gymhero.api.negotiation import NegotiatedRoute
+from gymhero.api.singleflight import PUBLIC, respond_shared
 from gymhero.crud import exercise_type_crud
 from gymhero.database.db import get_db
 from gymhero.models.exercise import ExerciseType
@@ -14,7 +18,7 @@ from gymhero.schemas.exercise_type import (
 )
 from gymhero.services import reference
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 _ENTITY = "Exercise type"
 
@@ -25,13 +29,24 @@ _ENTITY = "Exercise type"
     status_code=status.HTTP_200_OK,
 )
 async def fetch_all_exercise_types(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
 ):
     skip, limit = pagination_params
-    items = await exercise_type_crud.get_many(db, skip=skip, limit=limit)
-    total = await exercise_type_crud.count(db)
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    async def produce() -> dict[str, Any]:
+        items = await exercise_type_crud.get_many(db, skip=skip, limit=limit)
+        total = await exercise_type_crud.count(db)
+        return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    return await respond_shared(
+        request,
+        scope=PUBLIC,
+        response_model=Page[ExerciseTypeInDB],
+        produce=produce,
+        depends_on=frozenset({"exercise_types"}),
+    )
 
 
 @router.get(
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero.api.dependencies import get_current_superuser, get_pagination_params
+from gymhero.api.negotiation import NegotiatedRoute
+from gymhero.api.singleflight import PUBLIC, respond_shared
 from gymhero.crud import level_crud
 from gymhero.database.db import get_db
 from gymhero.models import Level
@@ -10,20 +14,31 @@ from gymhero.schemas.common import Page
 from gymhero.schemas.level import LevelCreate, LevelInDB, LevelUpdate
 from gymhero.services import reference
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 _ENTITY = "Level"
 
 
 @router.get("/all", response_model=Page[LevelInDB], status_code=status.HTTP_200_OK)
 async def fetch_all_levels(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
 ):
     skip, limit = pagination_params
-    items = await level_crud.get_many(db, skip=skip, limit=limit)
-    total = await level_crud.count(db)
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    async def produce() -> dict[str, Any]:
+        items = await level_crud.get_many(db, skip=skip, limit=limit)
+        total = await level_crud.count(db)
+        return {"items": items, "total": total, "skip": skip, "limit": limit}
+
+    return await respond_shared(
+        request,
+        scope=PUBLIC,
+        response_model=Page[LevelInDB],
+        produce=produce,
+        depends_on=frozenset({"levels"}),
+    )
 
 
 @router.get("/{level_id}", response_model=LevelInDB, status_code=status.HTTP_200_OK)
@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from gymhero.api.caching import respond_cached
 from gymhero.api.dependencies import (
     get_current_active_user,
     get_current_superuser,
+    get_ids_param,
     get_pagination_params,
+    get_sort_params,
 )
+from gymhero.api.fieldsets import (
+    TRAINING_PLAN,
+    FieldSet,
+    fieldset_params,
+    respond_shaped,
+)
+from gymhero.api.negotiation import NegotiatedRoute
 from gymhero.crud import training_plan_crud
 from gymhero.database.db import get_db
 from gymhero.models import TrainingPlan
 from gymhero.models.user import User
-from gymhero.schemas.common import Page
+from gymhero.schemas.common import Batch, Page, SortField
 from gymhero.schemas.training_plan import (
     TrainingPlanCreate,
     TrainingPlanInDB,
@@ -18,8 +28,11 @@ from gymhero.schemas.training_plan import (
 )
 from gymhero.schemas.training_unit import TrainingUnitInDB
 from gymhero.services import training_plan as training_plan_service
+from gymhero.services.ownership import owner_scope
+
+router = APIRouter(route_class=NegotiatedRoute)
 
-router = APIRouter()
+get_fieldset = fieldset_params(TRAINING_PLAN)
 
 
 @router.get(
@@ -30,14 +43,24 @@ router = APIRouter()
 async def get_all_training_plans(
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_superuser),
 ):
     skip, limit = pagination_params
+    sort, descending = sort_params
     items, total = await training_plan_service.list_training_plans(
-        db, q=q, skip=skip, limit=limit
+        db,
+        q=q,
+        sort=sort,
+        descending=descending,
+        skip=skip,
+        limit=limit,
+        options=fieldset.options(),
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    page = {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, page, Page)
 
 
 @router.get(
@@ -48,14 +71,38 @@ async def get_all_training_plans(
 async def get_all_training_plans_for_owner(
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
     skip, limit = pagination_params
+    sort, descending = sort_params
     items, total = await training_plan_service.list_training_plans(
-        db, owner_id=user.id, q=q, skip=skip, limit=limit
+        db,
+        owner_id=user.id,
+        q=q,
+        sort=sort,
+        descending=descending,
+        skip=skip,
+        limit=limit,
+        options=fieldset.options(),
+    )
+    page = {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, page, Page)
+
+
+@router.get("/", response_model=Batch[TrainingPlanInDB], status_code=status.HTTP_200_OK)
+async def fetch_training_plans_by_ids(
+    ids: list[int] = Depends(get_ids_param),
+    db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
+    user: User = Depends(get_current_active_user),
+):
+    items, missing = await training_plan_service.get_training_plans(
+        db, ids=ids, actor=user, options=fieldset.options()
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, {"items": items, "missing": missing}, Batch)
 
 
 @router.get(
@@ -65,11 +112,25 @@ async def get_all_training_plans_for_owner(
 )
 async def get_training_plan_by_id(
     training_plan_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
-    return await training_plan_service.get_training_plan(
-        db, training_plan_id=training_plan_id, actor=user
+    async def produce() -> TrainingPlan:
+        return await training_plan_service.get_training_plan(
+            db,
+            training_plan_id=training_plan_id,
+            actor=user,
+            options=fieldset.options(),
+        )
+
+    return await respond_cached(
+        request,
+        scope=owner_scope(user),
+        response_model=fieldset.response_model(),
+        produce=produce,
+        tags=training_plan_service.cache_tags,
     )
 
 
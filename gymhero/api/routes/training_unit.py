@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from gymhero.api.caching import respond_cached
 from gymhero.api.dependencies import (
     get_current_active_user,
     get_current_superuser,
+    get_ids_param,
     get_pagination_params,
+    get_sort_params,
 )
+from gymhero.api.fieldsets import (
+    TRAINING_UNIT,
+    FieldSet,
+    fieldset_params,
+    respond_shaped,
+)
+from gymhero.api.negotiation import NegotiatedRoute
 from gymhero.crud import training_unit_crud
 from gymhero.database.db import get_db
 from gymhero.models import TrainingUnit
 from gymhero.models.user import User
-from gymhero.schemas.common import Page
+from gymhero.schemas.common import Batch, Page, SortField
 from gymhero.schemas.training_unit import (
     PrescriptionUpdate,
     TrainingUnitCreate,
@@ -19,8 +29,11 @@ from gymhero.schemas.training_unit import (
     TrainingUnitUpdate,
 )
 from gymhero.services import training_unit as training_unit_service
+from gymhero.services.ownership import owner_scope
+
+router = APIRouter(route_class=NegotiatedRoute)
 
-router = APIRouter()
+get_fieldset = fieldset_params(TRAINING_UNIT)
 
 
 @router.get(
@@ -31,14 +44,24 @@ router = APIRouter()
 async def get_all_training_units(
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_superuser),
 ):
     skip, limit = pagination_params
+    sort, descending = sort_params
     items, total = await training_unit_service.list_training_units(
-        db, q=q, skip=skip, limit=limit
+        db,
+        q=q,
+        sort=sort,
+        descending=descending,
+        skip=skip,
+        limit=limit,
+        options=fieldset.options(),
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    page = {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, page, Page)
 
 
 @router.get(
@@ -49,14 +72,38 @@ async def get_all_training_units(
 async def get_all_training_units_for_owner(
     db: AsyncSession = Depends(get_db),
     pagination_params: tuple[int, int] = Depends(get_pagination_params),
+    sort_params: tuple[SortField | None, bool] = Depends(get_sort_params),
     q: str | None = Query(None),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
     skip, limit = pagination_params
+    sort, descending = sort_params
     items, total = await training_unit_service.list_training_units(
-        db, owner_id=user.id, q=q, skip=skip, limit=limit
+        db,
+        owner_id=user.id,
+        q=q,
+        sort=sort,
+        descending=descending,
+        skip=skip,
+        limit=limit,
+        options=fieldset.options(),
+    )
+    page = {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, page, Page)
+
+
+@router.get("/", response_model=Batch[TrainingUnitInDB], status_code=status.HTTP_200_OK)
+async def fetch_training_units_by_ids(
+    ids: list[int] = Depends(get_ids_param),
+    db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
+    user: User = Depends(get_current_active_user),
+):
+    items, missing = await training_unit_service.get_training_units(
+        db, ids=ids, actor=user, options=fieldset.options()
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    return respond_shaped(fieldset, {"items": items, "missing": missing}, Batch)
 
 
 @router.get(
@@ -66,11 +113,25 @@ async def get_all_training_units_for_owner(
 )
 async def get_training_unit_by_id(
     training_unit_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    fieldset: FieldSet = Depends(get_fieldset),
     user: User = Depends(get_current_active_user),
 ):
-    return await training_unit_service.get_training_unit(
-        db, training_unit_id=training_unit_id, actor=user
+    async def produce() -> TrainingUnit:
+        return await training_unit_service.get_training_unit(
+            db,
+            training_unit_id=training_unit_id,
+            actor=user,
+            options=fieldset.options(),
+        )
+
+    return await respond_cached(
+        request,
+        scope=owner_scope(user),
+        response_model=fieldset.response_model(),
+        produce=produce,
+        tags=training_unit_service.cache_tags,
     )
 
 
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gymhero.api.dependencies import get_current_superuser, get_pagination_params
+from gymhero.api.negotiation import NegotiatedRoute
 from gymhero.crud import user_crud
 from gymhero.database.db import get_db
 from gymhero.models import User
@@ -9,7 +10,9 @@ from gymhero.schemas.common import Page
 from gymhero.schemas.user import UserCreate, UserOut, UserUpdate
 from gymhero.services import user as user_service
 
-router = APIRouter(dependencies=[Depends(get_current_superuser)])
+router = APIRouter(
+    dependencies=[Depends(get_current_superuser)], route_class=NegotiatedRoute
+)
 
 
 @router.get("/all", response_model=Page[UserOut], status_code=status.HTTP_200_OK)
@@ -0,0 +1,165 @@
+"""Per-worker single-flight for identical concurrent reads.
+
+When many clients ask for the same page at the same moment — a shared plan's
+exercise list, the reference catalogs — the first request (the *leader*) runs
+the queries and serializes the response; identical requests that arrive while
+it is in flight await it and get the same bytes. With an optional micro-cache
+window, requests arriving shortly after are served those bytes too — unless a
+write to one of the tables the response ``depends_on`` invalidated it first
+(``gymhero.database.invalidation``).
+
+Coalescing happens inside the route, after its dependencies have authenticated
+and authorized the caller, and the key carries the authorization scope the
+route passes in (``"public"`` for data every caller may see, ``user:{id}`` for
+owner-scoped data), so a response is only ever shared with callers entitled to
+it. Errors are shared like results; a leader that is cancelled hands over to a
+waiting request instead.
+
+State lives in one event loop, so no locks: every mutation happens between
+awaits.
+"""
+
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from gymhero.api.negotiation import media_type, render
+
+HEADER = "X-Single-Flight"
+# Authorization scope of data every authorized caller may see alike.
+PUBLIC = "public"
+
+
+class Outcome(StrEnum):
+    LEADER = "leader"
+    COALESCED = "coalesced"
+    CACHED = "cached"
+
+
+class SingleFlight:
+    """Runs at most one ``produce`` per key at a time and shares its result."""
+
+    def __init__(self, window: float = 0.0) -> None:
+        self.window = window
+        self._in_flight: dict[str, asyncio.Future[bytes]] = {}
+        self._recent: dict[str, tuple[float, bytes, frozenset[str]]] = {}
+        # Bumped by every invalidation, so a result computed across one isn't kept.
+        self._generation = 0
+        # Requests by outcome: executed ran `produce`; the others were spared it.
+        self.executed = 0
+        self.coalesced = 0
+        self.cached = 0
+
+    async def run(
+        self,
+        key: str,
+        produce: Callable[[], Awaitable[bytes]],
+        depends_on: frozenset[str] = frozenset(),
+    ) -> tuple[bytes, Outcome]:
+        recent = self._recent.get(key)
+        if recent is not None and recent[0] > time.monotonic():
+            self.cached += 1
+            return recent[1], Outcome.CACHED
+        while (leader := self._in_flight.get(key)) is not None:
+            try:
+                body = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise  # this request was cancelled, not the leader
+                continue  # the leader was: the next waiter takes over
+            self.coalesced += 1
+            return body, Outcome.COALESCED
+        return await self._lead(key, produce, depends_on), Outcome.LEADER
+
+    def invalidate(self, table: str) -> None:
+        """Forget remembered results that depend on ``table``."""
+        self._generation += 1
+        self._recent = {k: v for k, v in self._recent.items() if table not in v[2]}
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._recent.clear()
+
+    async def _lead(
+        self,
+        key: str,
+        produce: Callable[[], Awaitable[bytes]],
+        depends_on: frozenset[str],
+    ) -> bytes:
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved even when nobody was waiting on it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            body = await produce()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(body)
+        self.executed += 1
+        if self.window and generation == self._generation:
+            now = time.monotonic()
+            self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+            self._recent[key] = (now + self.window, body, depends_on)
+        return body
+
+
+def user_scope(user_id: int) -> str:
+    """Scope of data filtered down to one user's own resources."""
+    return f"user:{user_id}"
+
+
+# Response models include sparse fieldset models built per client request.
+@functools.lru_cache(maxsize=512)
+def response_adapter(response_model: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(response_model)
+
+
+def request_key(request: Request, scope: str) -> str:
+    """Route path and query, normalized, under an authorization scope.
+
+    Keyed by the negotiated media type too: JSON and MessagePack bodies of the
+    same response are kept apart.
+    """
+    path = request.url.path.rstrip("/") or "/"
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{scope} {request.method} {path}?{query} {media_type()}"
+
+
+async def respond_shared(
+    request: Request,
+    *,
+    scope: str,
+    response_model: Any,
+    produce: Callable[[], Awaitable[Any]],
+    depends_on: frozenset[str] = frozenset(),
+) -> Response:
+    """Serialize ``await produce()`` as ``response_model``, single-flighted.
+
+    Serializes the way FastAPI would for a route declaring ``response_model``,
+    so the bytes are the same whether or not the request was coalesced.
+    """
+    adapter = response_adapter(response_model)
+
+    async def serialize() -> bytes:
+        content = adapter.validate_python(await produce(), from_attributes=True)
+        return render(adapter, content)
+
+    flight: SingleFlight | None = request.app.state.single_flight
+    if flight is None:
+        return Response(await serialize(), media_type=media_type())
+    body, outcome = await flight.run(request_key(request, scope), serialize, depends_on)
+    return Response(body, media_type=media_type(), headers={HEADER: outcome})
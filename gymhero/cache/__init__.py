@@ -0,0 +1,13 @@
+from gymhero.cache.backends import CacheBackend, CacheError, MemoryBackend
+from gymhero.cache.base import Cache, Outcome, row_tag
+from gymhero.cache.redis_backend import RedisBackend
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "CacheError",
+    "MemoryBackend",
+    "Outcome",
+    "RedisBackend",
+    "row_tag",
+]
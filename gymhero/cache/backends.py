@@ -0,0 +1,90 @@
+"""Storage behind ``gymhero.cache.Cache``: opaque byte values plus tag counters.
+
+A backend stores entries (bytes under a key, each with its own time to live)
+and integer *counters* the cache uses to version its tags. Counters only ever
+move forward; a counter the backend no longer has must read back as a value no
+entry could have recorded while it still existed, so that an evicted counter
+invalidates instead of resurrecting entries.
+"""
+
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Protocol
+
+
+class CacheError(Exception):
+    """The backend answered, but not the way the protocol says it should."""
+
+
+class CacheBackend(Protocol):
+    # Whether every worker sees the same entries (so its writes need no broadcast).
+    shared: bool
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def counters(self, names: Sequence[str]) -> list[int]: ...
+
+    async def bump(self, names: Sequence[str], ttl: float) -> None:
+        """Advance each counter; ``ttl`` outlives every entry that recorded it."""
+        ...
+
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Per-worker LRU: at most ``max_entries`` entries and ``max_counters`` counters.
+
+    Counters take their values from one sequence, and an evicted counter reads
+    back as the highest value evicted so far — never lower than what it held.
+    """
+
+    shared = False
+
+    def __init__(self, max_entries: int = 10_000, max_counters: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self.max_counters = max_counters
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: OrderedDict[str, int] = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._floor = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def counters(self, names: Sequence[str]) -> list[int]:
+        return [self._counters.get(name, self._floor) for name in names]
+
+    async def bump(self, names: Sequence[str], ttl: float) -> None:
+        for name in names:
+            self._counters[name] = next(self._sequence)
+            self._counters.move_to_end(name)
+        while len(self._counters) > self.max_counters:
+            _, value = self._counters.popitem(last=False)
+            self._floor = max(self._floor, value)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+        self._floor = 0
+
+    async def close(self) -> None:
+        pass
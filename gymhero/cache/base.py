@@ -0,0 +1,242 @@
+"""Tagged response/query cache with request collapsing and stale-while-revalidate.
+
+``Cache.fetch(key, produce)`` serves bytes cached under ``key`` or runs
+``produce``, which returns the bytes and the *tags* naming what they were built
+from — ``training_plan:7``, ``user:3``, or a wildcard such as ``exercise:*``
+for "any exercise". ``Cache.invalidate(tag)`` drops every entry carrying that
+tag, and a row tag also drops the entries carrying its table's wildcard, so
+writing exercise 5 invalidates ``exercise:5`` and the ``exercise:*`` catalog
+pages; invalidating ``exercise:*`` drops every exercise tag.
+
+Tags are versioned through backend counters rather than indexed: an entry
+records the counters of its tags when it is stored and is only served while
+they are unchanged. Invalidating is a counter bump, the same on a per-worker
+LRU as on a shared Redis-protocol server. A global counter bumped by every
+invalidation keeps a result computed across one from being stored.
+
+Misses for a key are collapsed per worker: one caller runs ``produce``, the
+others await its result. An entry past its TTL (but within ``stale_ttl``, and
+not invalidated) is served as is to everyone but the one caller that refreshes
+it. The cache never fails a request: when the backend is unreachable, callers
+just run ``produce``.
+
+The cache knows nothing about authorization — callers put the scope they
+enforce in the key (see ``gymhero.services.ownership.owner_scope``).
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from enum import StrEnum
+from typing import Any
+
+from gymhero.cache.backends import CacheBackend, CacheError
+from gymhero.database.invalidation import Invalidation, InvalidationBus
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+type Produce = Callable[[], Awaitable[tuple[bytes, Iterable[str]]]]
+
+# Bumped by every invalidation: a result computed across one isn't stored.
+_EPOCH = "*"
+# Tag prefixes of the rows the app writes; other tables tag as their own name.
+_ROW_TAGS = {
+    "users": "user",
+    "exercises": "exercise",
+    "exercise_types": "exercise_type",
+    "levels": "level",
+    "body_parts": "body_part",
+    "training_plans": "training_plan",
+    "training_units": "training_unit",
+}
+
+_BACKEND_ERRORS = (OSError, TimeoutError, CacheError)
+
+
+class Outcome(StrEnum):
+    HIT = "hit"
+    STALE = "stale"
+    MISS = "miss"
+    COALESCED = "coalesced"
+
+
+def row_tag(table: str, key: object) -> str:
+    """Tag of one written row, as the invalidation bus reports it."""
+    if isinstance(key, list | tuple):
+        key = ":".join(map(str, key))
+    return f"{_ROW_TAGS.get(table, table)}:{key}"
+
+
+def _recorded(tag: str) -> list[str]:
+    # Counters an entry carrying `tag` records.
+    family, sep, member = tag.partition(":")
+    if not sep:
+        return [tag]
+    if member == "*":
+        return [f"{family}:*"]  # any change in the family
+    return [tag, f"{family}:**"]  # the row, and wiping the whole family
+
+
+def _bumped(tag: str) -> list[str]:
+    # Counters invalidating `tag` advances.
+    family, sep, member = tag.partition(":")
+    if not sep:
+        return [tag]
+    if member == "*":
+        return [f"{family}:*", f"{family}:**"]
+    return [tag, f"{family}:*"]
+
+
+class Cache:
+    """Caches bytes in ``backend`` for ``ttl`` seconds, then ``stale_ttl`` more."""
+
+    def __init__(
+        self, backend: CacheBackend, *, ttl: float, stale_ttl: float = 0.0
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._in_flight: dict[str, asyncio.Future[bytes]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def fetch(self, key: str, produce: Produce) -> tuple[bytes, Outcome]:
+        entry = await self._load(key)
+        if entry is not None:
+            body, fresh_until = entry
+            if fresh_until > time.time():
+                self.hits += 1
+                return body, Outcome.HIT
+            if key in self._in_flight:
+                self.stale += 1
+                return body, Outcome.STALE
+        while (leader := self._in_flight.get(key)) is not None:
+            try:
+                body = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise  # this request was cancelled, not the leader
+                continue  # the leader was: the next waiter takes over
+            self.coalesced += 1
+            return body, Outcome.COALESCED
+        self.misses += 1
+        return await self._lead(key, produce), Outcome.MISS
+
+    async def invalidate(self, *tags: str) -> None:
+        names = {_EPOCH}
+        for tag in tags:
+            names.update(_bumped(tag))
+        try:
+            await self.backend.bump(sorted(names), self._counter_ttl)
+        except _BACKEND_ERRORS as e:
+            log.warning("cache invalidation failed, entries live out their TTL: %s", e)
+
+    def invalidate_soon(self, *tags: str) -> None:
+        """``invalidate`` from synchronous code, on the running event loop."""
+        self._spawn(self.invalidate(*tags))
+
+    async def clear(self) -> None:
+        try:
+            await self.backend.clear()
+        except _BACKEND_ERRORS as e:
+            log.warning("cache clear failed: %s", e)
+
+    def subscribe(self, bus: InvalidationBus) -> None:
+        """Drop the entries built from the rows written in this app.
+
+        A shared backend only needs this worker's own writes; a per-worker one
+        also needs every other worker's, and is cleared when those may have
+        been missed.
+        """
+
+        def on_invalidate(invalidation: Invalidation) -> None:
+            self.invalidate_soon(row_tag(invalidation.table, invalidation.id))
+
+        def on_reset() -> None:
+            self._spawn(self.clear())
+
+        bus.subscribe(on_invalidate, on_reset, remote=not self.backend.shared)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    @property
+    def _counter_ttl(self) -> float:
+        # Outlive every entry that may have recorded the counter.
+        return 2 * (self.ttl + self.stale_ttl)
+
+    async def _load(self, key: str) -> tuple[bytes, float] | None:
+        try:
+            raw = await self.backend.get(key)
+            if raw is None:
+                return None
+            header, _, body = raw.partition(b"\n")
+            meta = json.loads(header)
+            names = list(meta["counters"])
+            if await self.backend.counters(names) != list(meta["counters"].values()):
+                return None  # invalidated
+        except _BACKEND_ERRORS as e:
+            log.warning("cache read failed, treating as a miss: %s", e)
+            return None
+        except (ValueError, KeyError, TypeError):
+            log.warning("ignoring malformed cache entry %r", key)
+            return None
+        return body, float(meta["fresh_until"])
+
+    async def _lead(self, key: str, produce: Produce) -> bytes:
+        future = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved even when nobody was waiting on it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            try:
+                (epoch,) = await self.backend.counters([_EPOCH])
+            except _BACKEND_ERRORS:
+                epoch = None
+            body, tags = await produce()
+        except asyncio.CancelledError:
+            future.cancel()
+            del self._in_flight[key]
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            del self._in_flight[key]
+            raise
+        future.set_result(body)
+        try:
+            if epoch is not None:
+                await self._store(key, body, tags, epoch)
+        finally:
+            # Stays in flight until stored, so stale readers don't refresh twice.
+            del self._in_flight[key]
+        return body
+
+    async def _store(
+        self, key: str, body: bytes, tags: Iterable[str], epoch: int
+    ) -> None:
+        names = sorted({name for tag in tags for name in _recorded(tag)} - {_EPOCH})
+        try:
+            current, *versions = await self.backend.counters([_EPOCH, *names])
+            if current != epoch:
+                return  # something was invalidated while `produce` ran
+            header = json.dumps(
+                {
+                    "fresh_until": time.time() + self.ttl,
+                    "counters": dict(zip(names, versions, strict=True)),
+                }
+            ).encode()
+            await self.backend.set(
+                key, header + b"\n" + body, self.ttl + self.stale_ttl
+            )
+        except _BACKEND_ERRORS as e:
+            log.warning("cache write failed: %s", e)
+
+    def _spawn(self, work: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(work)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
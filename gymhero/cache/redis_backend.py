@@ -0,0 +1,163 @@
+"""Cache backend for a Redis-protocol server (Redis, Valkey, KeyDB, ...).
+
+Speaks the handful of RESP2 commands the cache needs over one connection per
+worker, so it adds no client library to the app: ``GET``, ``SET ... PX``,
+``MGET``, ``INCR``, ``SCAN``/``DEL`` and, on connect, ``AUTH``/``SELECT``.
+Commands from concurrent requests are serialized on the connection, and a
+batch goes out as one pipelined write. Any failure mid-command drops the
+connection — its state is unknown — and the next command reconnects.
+
+Counters take their values from one never-expiring sequence key, so a counter
+that expired (they outlive the entries recording them) and comes back can't
+repeat a value an entry recorded.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Sequence
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from gymhero.cache.backends import CacheError
+
+type Command = Sequence[str | bytes | int]
+
+
+def _encode(command: Command) -> bytes:
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class RedisBackend:
+    """Shared backend at ``redis://[[user]:password@]host[:port][/db]``."""
+
+    shared = True
+
+    def __init__(
+        self, url: str, *, namespace: str = "gymhero:", timeout: float = 1.0
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"not a redis:// URL: {url!r}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.namespace = namespace
+        self.timeout = timeout
+        self._username = unquote(parts.username) if parts.username else None
+        self._password = unquote(parts.password) if parts.password else None
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def get(self, key: str) -> bytes | None:
+        (value,) = await self.execute(("GET", self.namespace + key))
+        return value  # type: ignore[no-any-return]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.execute(("SET", self.namespace + key, value, "PX", _ms(ttl)))
+
+    async def counters(self, names: Sequence[str]) -> list[int]:
+        if not names:
+            return []
+        (values,) = await self.execute(("MGET", *map(self._counter, names)))
+        return [0 if value is None else int(value) for value in values]
+
+    async def bump(self, names: Sequence[str], ttl: float) -> None:
+        (value,) = await self.execute(("INCR", self.namespace + "sequence"))
+        await self.execute(
+            *(("SET", self._counter(name), value, "PX", _ms(ttl)) for name in names)
+        )
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            ((cursor, keys),) = await self.execute(
+                ("SCAN", cursor, "MATCH", self.namespace + "*", "COUNT", 1000)
+            )
+            if keys:
+                await self.execute(("DEL", *keys))
+            if cursor == b"0":
+                return
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._drop()
+
+    async def execute(self, *commands: Command) -> list[Any]:
+        """Send ``commands`` pipelined and return their replies in order."""
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._roundtrip(commands)
+            except BaseException:
+                self._drop()
+                raise
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup: list[Command] = []
+        if self._password is not None:
+            credentials = [self._password]
+            if self._username is not None:
+                credentials.insert(0, self._username)
+            setup.append(("AUTH", *credentials))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._roundtrip(setup)
+
+    async def _roundtrip(self, commands: Sequence[Command]) -> list[Any]:
+        assert self._writer is not None
+        self._writer.write(b"".join(map(_encode, commands)))
+        await self._writer.drain()
+        replies = [await self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, CacheError):
+                raise reply
+        return replies
+
+    async def _read_reply(self) -> Any:
+        assert self._reader is not None
+        line = await self._read(self._reader.readuntil(b"\r\n"))
+        kind, value = line[:1], line[1:-2]
+        if kind == b"+":
+            return value.decode()
+        if kind == b"-":
+            return CacheError(value.decode())
+        if kind == b":":
+            return int(value)
+        if kind == b"$":
+            size = int(value)
+            if size < 0:
+                return None
+            return (await self._read(self._reader.readexactly(size + 2)))[:-2]
+        if kind == b"*":
+            size = int(value)
+            if size < 0:
+                return None
+            return [await self._read_reply() for _ in range(size)]
+        raise CacheError(f"unexpected reply: {line!r}")
+
+    @staticmethod
+    async def _read(read: Awaitable[bytes]) -> bytes:
+        try:
+            return await read
+        except asyncio.IncompleteReadError as e:
+            raise ConnectionResetError("cache server closed the connection") from e
+
+    def _counter(self, name: str) -> str:
+        return f"{self.namespace}counter:{name}"
+
+    def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def _ms(seconds: float) -> int:
+    return max(int(seconds * 1000), 1)
@@ -1,7 +1,8 @@
+import functools
 import os
 from typing import Self
 
-from pydantic import EmailStr, Field, SecretStr, model_validator
+from pydantic import EmailStr, Field, SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from gymhero.log import get_logger
@@ -14,6 +15,18 @@ _DEV_POSTGRES_PASSWORD = "gymhero"
 _DEV_SUPERUSER_PASSWORD = "changeme"
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_route_timeouts(value: str) -> dict[str, float]:
+    # "path=seconds,path=seconds" -> {path: seconds}; ValueError if malformed.
+    timeouts = {}
+    for pair in filter(str.strip, value.split(",")):
+        path, _, seconds = pair.rpartition("=")
+        if not path.strip() or not float(seconds) > 0:
+            raise ValueError(f"expected 'route path=seconds', got {pair.strip()!r}")
+        timeouts[path.strip()] = float(seconds)
+    return timeouts
+
+
 class Settings(BaseSettings):
     # Committed dummy defaults; a git-ignored `.env` or real env vars override them.
     model_config = SettingsConfigDict(
@@ -47,6 +60,64 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = Field(default=10, ge=1)
     DB_MAX_OVERFLOW: int = Field(default=20, ge=0)
     DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, ge=1)
+    # How often idle pooled connections are pinged in the background; 0 disables.
+    DB_POOL_HEALTHCHECK_SECONDS: int = Field(default=30, ge=0)
+    # Open DB_POOL_SIZE connections and prime the statement caches at startup.
+    DB_POOL_PREWARM: bool = True
+    # Opt-in: one commit per request (repositories flush) instead of one per write.
+    DB_UNIT_OF_WORK: bool = False
+
+    # Time budget for a request's queries, enforced as Postgres statement_timeout.
+    # Clients may ask for another one via X-Request-Timeout, capped at the max;
+    # per-route overrides are comma-separated "route path=seconds" pairs.
+    REQUEST_TIMEOUT_SECONDS: float = Field(default=30.0, gt=0)
+    REQUEST_TIMEOUT_MAX_SECONDS: float = Field(default=60.0, gt=0)
+    REQUEST_TIMEOUT_ROUTES: str = ""
+
+    # Per-worker admission control; 0 disables. Unset (empty), it follows the
+    # pool (DB_POOL_SIZE + DB_MAX_OVERFLOW): past that, requests would only queue
+    # on a connection checkout. Priority paths are comma-separated exact paths.
+    ADMISSION_MAX_IN_FLIGHT: int | None = Field(default=None, ge=0)
+    ADMISSION_QUEUE_SIZE: int = Field(default=64, ge=0)
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = Field(default=1.0, gt=0)
+    ADMISSION_HIGH_PRIORITY_PATHS: str = "/health,/ready,/api/v1/auth/refresh"
+    ADMISSION_LOW_PRIORITY_PATHS: str = (
+        "/api/v1/exercises/all,/api/v1/exercises/my,/api/v1/training-plans/all,"
+        "/api/v1/training-plans/all/my,/api/v1/training-units/all,"
+        "/api/v1/training-units/all/my,/api/v1/users/all"
+    )
+
+    # Identical concurrent reads of the catalog lists share one execution; a
+    # positive window also serves the result to identical requests that soon after.
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_WINDOW_SECONDS: float = Field(default=0.0, ge=0)
+
+    # Writes announce the rows they touched over Postgres NOTIFY, and every
+    # worker drops the cached responses built from them.
+    CACHE_INVALIDATION_ENABLED: bool = True
+
+    # Tagged response cache of the exercise catalog and the training plan/unit
+    # details. Per-worker LRU unless CACHE_REDIS_URL (redis://...) is set.
+    # Entries are fresh for the TTL, then served stale while one request
+    # refreshes them for up to CACHE_STALE_SECONDS more.
+    CACHE_ENABLED: bool = True
+    CACHE_REDIS_URL: str = ""
+    CACHE_TTL_SECONDS: float = Field(default=60.0, gt=0)
+    CACHE_STALE_SECONDS: float = Field(default=30.0, ge=0)
+    CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+
+    # Answer /exercises/all from an in-memory index of the catalog, loaded by
+    # every worker at startup and kept in sync with writes.
+    EXERCISE_INDEX_ENABLED: bool = False
+
+    # Serve /exercises/{id} from a memory-mapped catalog snapshot shared by all
+    # workers (scripts/build_snapshot.py writes it). Off when empty; the file is
+    # checked for a new version every CATALOG_SNAPSHOT_POLL_SECONDS.
+    CATALOG_SNAPSHOT_PATH: str = ""
+    CATALOG_SNAPSHOT_POLL_SECONDS: float = Field(default=5.0, gt=0)
+
+    # Most ids one multi-get request (`?ids=1,2,3`) may ask for.
+    MULTI_GET_MAX_IDS: int = Field(default=100, ge=1)
 
     FIRST_SUPERUSER_USERNAME: str
     FIRST_SUPERUSER_EMAIL: EmailStr
@@ -54,6 +125,17 @@ class Settings(BaseSettings):
 
     # Plain properties (not computed_field) so the password never lands in
     # model_dump()/serialization.
+    @field_validator("ADMISSION_MAX_IN_FLIGHT", mode="before")
+    @classmethod
+    def _empty_means_unset(cls, value: object) -> object:
+        return None if value == "" else value
+
+    @field_validator("REQUEST_TIMEOUT_ROUTES")
+    @classmethod
+    def _check_request_timeout_routes(cls, value: str) -> str:
+        _parse_route_timeouts(value)
+        return value
+
     @property
     def database_url(self) -> str:
         return (
@@ -77,6 +159,31 @@ class Settings(BaseSettings):
     def allowed_hosts(self) -> list[str]:
         return [h.strip() for h in self.ALLOWED_HOSTS.split(",") if h.strip()]
 
+    @property
+    def admission_high_priority_paths(self) -> list[str]:
+        return [
+            p.strip()
+            for p in self.ADMISSION_HIGH_PRIORITY_PATHS.split(",")
+            if p.strip()
+        ]
+
+    @property
+    def admission_low_priority_paths(self) -> list[str]:
+        return [
+            p.strip() for p in self.ADMISSION_LOW_PRIORITY_PATHS.split(",") if p.strip()
+        ]
+
+    @property
+    def admission_max_in_flight(self) -> int:
+        if self.ADMISSION_MAX_IN_FLIGHT is None:
+            return self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW
+        return self.ADMISSION_MAX_IN_FLIGHT
+
+    @property
+    def request_timeout_routes(self) -> dict[str, float]:
+        # Validated at startup; parsed once per value, not once per request.
+        return _parse_route_timeouts(self.REQUEST_TIMEOUT_ROUTES)
+
 
 class ContainerDevSettings(Settings):
     ENV: str = "dev"
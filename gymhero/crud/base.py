@@ -1,12 +1,24 @@
 """Async data-access repository. Holds no business rules."""
 
+from collections.abc import Sequence
 from typing import Any
 
 from pydantic import BaseModel
-from sqlalchemy import ColumnExpressionArgument, func, select
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Integer,
+    Select,
+    any_,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from gymhero.database.base_class import Base
+from gymhero.database.session import UNIT_OF_WORK
 from gymhero.log import get_logger
 
 type OwnerIDType = int
@@ -14,41 +26,136 @@ type OwnerIDType = int
 log = get_logger(__name__)
 
 
+async def commit_or_flush(db: AsyncSession) -> None:
+    """Commit a repository write — or only flush it inside a request unit of work.
+
+    Flushing still sends the SQL, so constraint violations raise
+    ``IntegrityError`` at the same call site in both modes.
+    """
+    if db.info.get(UNIT_OF_WORK):
+        await db.flush()
+    else:
+        await db.commit()
+
+
 class CRUDRepository[ModelT: Base]:
     def __init__(self, model: type[ModelT]) -> None:
         self._model = model
         self._name = model.__name__
 
+    # Statement builders are split out so benchmarks and the worker warm-up
+    # (gymhero.database.warmup) compile exactly what the repository executes.
+    def select_one(
+        self, *filters: ColumnExpressionArgument[bool]
+    ) -> Select[tuple[ModelT]]:
+        return select(self._model).filter(*filters)
+
+    def select_by_ids(
+        self,
+        ids: Sequence[int],
+        *filters: ColumnExpressionArgument[bool],
+        options: Sequence[ORMOption] = (),
+    ) -> Select[tuple[ModelT]]:
+        # `id = ANY(:ids)` binds one array, so every batch size shares a statement
+        # (IN would render one placeholder per id).
+        id_column = self._model.id  # type: ignore[attr-defined]
+        return (
+            select(self._model)
+            .filter(id_column == any_(literal(list(ids), ARRAY(Integer))), *filters)
+            .options(*options)
+        )
+
+    def select_many(
+        self,
+        *filters: ColumnExpressionArgument[bool],
+        skip: int = 0,
+        limit: int = 100,
+        sort: str | None = None,
+        descending: bool = False,
+        options: Sequence[ORMOption] = (),
+    ) -> Select[tuple[ModelT]]:
+        # Always ordered, so pages are stable: by ``sort`` (a column name the
+        # caller whitelisted), then id, both one way, so an index on
+        # (..., sort, id) serves either direction and stops after the page.
+        keys = [getattr(self._model, sort)] if sort else []
+        keys.append(self._model.id)  # type: ignore[attr-defined]
+        return (
+            select(self._model)
+            .filter(*filters)
+            .order_by(*(key.desc() if descending else key for key in keys))
+            .offset(skip)
+            .limit(limit)
+            .options(*options)
+        )
+
+    def select_count(
+        self, *filters: ColumnExpressionArgument[bool]
+    ) -> Select[tuple[int]]:
+        return select(func.count()).select_from(self._model).filter(*filters)
+
     async def get_one(
         self, db: AsyncSession, *filters: ColumnExpressionArgument[bool]
     ) -> ModelT | None:
-        stmt = select(self._model).filter(*filters)
-        result = await db.execute(stmt)
+        result = await db.execute(self.select_one(*filters))
         return result.scalars().first()
 
+    async def get_by_id(
+        self, db: AsyncSession, entity_id: int, options: Sequence[ORMOption] = ()
+    ) -> ModelT | None:
+        """Primary-key lookup through the identity map: no query when the session
+        already holds the row (e.g. the current user, or an entity fetched
+        earlier in the request). ``options`` shape the query when there is one."""
+        return await db.get(self._model, entity_id, options=options)
+
+    async def get_by_ids(
+        self,
+        db: AsyncSession,
+        ids: Sequence[int],
+        *filters: ColumnExpressionArgument[bool],
+        options: Sequence[ORMOption] = (),
+    ) -> tuple[list[ModelT], list[int]]:
+        """Fetch ``ids`` in one query: the rows found, in ``ids`` order, and the
+        ids that matched no row (or not ``filters``)."""
+        result = await db.execute(self.select_by_ids(ids, *filters, options=options))
+        found = {obj.id: obj for obj in result.scalars()}  # type: ignore[attr-defined]
+        return (
+            [found[i] for i in ids if i in found],
+            [i for i in ids if i not in found],
+        )
+
     async def get_many(
         self,
         db: AsyncSession,
         *filters: ColumnExpressionArgument[bool],
         skip: int = 0,
         limit: int = 100,
+        sort: str | None = None,
+        descending: bool = False,
+        options: Sequence[ORMOption] = (),
     ) -> list[ModelT]:
-        stmt = select(self._model).filter(*filters).offset(skip).limit(limit)
-        result = await db.execute(stmt)
+        result = await db.execute(
+            self.select_many(
+                *filters,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                descending=descending,
+                options=options,
+            )
+        )
         return list(result.scalars().all())
 
     async def count(
         self, db: AsyncSession, *filters: ColumnExpressionArgument[bool]
     ) -> int:
-        stmt = select(func.count()).select_from(self._model).filter(*filters)
-        result = await db.execute(stmt)
+        result = await db.execute(self.select_count(*filters))
         return result.scalar_one()
 
     async def create(self, db: AsyncSession, obj_create: BaseModel) -> ModelT:
         obj_create_data = obj_create.model_dump(exclude_none=True, exclude_unset=True)
         db_obj = self._model(**obj_create_data)
         db.add(db_obj)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(db_obj)
         return db_obj
 
@@ -63,13 +170,13 @@ class CRUDRepository[ModelT: Base]:
         for field, value in obj_update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(db_obj)
         return db_obj
 
     async def delete(self, db: AsyncSession, db_obj: ModelT) -> ModelT:
         await db.delete(db_obj)
-        await db.commit()
+        await commit_or_flush(db)
         return db_obj
 
     async def create_with_owner(
@@ -80,6 +187,6 @@ class CRUDRepository[ModelT: Base]:
         )
         db_obj = self._model(**obj_create_data, owner_id=owner_id)
         db.add(db_obj)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(db_obj)
         return db_obj
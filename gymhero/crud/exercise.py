@@ -1,4 +1,55 @@
+from typing import Any
+
+from sqlalchemy import ColumnExpressionArgument, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from gymhero.crud.base import CRUDRepository
 from gymhero.models.exercise import Exercise
 
-exercise_crud: CRUDRepository[Exercise] = CRUDRepository(model=Exercise)
+# The columns the catalog can be narrowed down by, in facet order.
+FACET_COLUMNS = (
+    Exercise.exercise_type_id,
+    Exercise.level_id,
+    Exercise.target_body_part_id,
+    Exercise.equipment,
+)
+# grouping() sets a bit per column left *out* of a row's grouping set, the first
+# column's highest: the set grouping only column i leaves every other bit set.
+_ALL_OUT = (1 << len(FACET_COLUMNS)) - 1
+_GROUPED_BY = {
+    _ALL_OUT ^ (1 << (len(FACET_COLUMNS) - 1 - i)): i for i in range(len(FACET_COLUMNS))
+}
+
+type FacetCounts = dict[str, list[tuple[Any, int]]]
+
+
+class ExerciseCRUD(CRUDRepository[Exercise]):
+    def select_facet_counts(
+        self, *filters: ColumnExpressionArgument[bool]
+    ) -> Select[Any]:
+        # One grouping set per facet column, plus () for the total: one scan.
+        return (
+            select(func.grouping(*FACET_COLUMNS), *FACET_COLUMNS, func.count())
+            .filter(*filters)
+            .group_by(func.grouping_sets(*(tuple_(c) for c in FACET_COLUMNS), tuple_()))
+        )
+
+    async def count_facets(
+        self, db: AsyncSession, *filters: ColumnExpressionArgument[bool]
+    ) -> tuple[FacetCounts, int]:
+        """Matching rows per value of each facet column, most first, and in total."""
+        facets: FacetCounts = {column.key: [] for column in FACET_COLUMNS}
+        total = 0
+        result = await db.execute(self.select_facet_counts(*filters))
+        for grouping, *values, count in result.tuples():
+            if grouping == _ALL_OUT:
+                total = count
+                continue
+            i = _GROUPED_BY[grouping]
+            facets[FACET_COLUMNS[i].key].append((values[i], count))
+        for counts in facets.values():
+            counts.sort(key=lambda pair: (-pair[1], pair[0] is None, pair[0]))
+        return facets, total
+
+
+exercise_crud = ExerciseCRUD(model=Exercise)
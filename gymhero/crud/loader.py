@@ -0,0 +1,95 @@
+"""Request-scoped batching of primary-key lookups.
+
+``get_loader(db, crud)`` returns the session's loader for a repository. Every
+``load`` awaited concurrently — typically under ``asyncio.gather`` — in the same
+event-loop tick is answered by one ``id = ANY(...)`` query, and ids the
+session's identity map already holds cost no query at all. The session is the
+request's, so is the loader; nothing outlives the request.
+
+Batches run one at a time: an ``AsyncSession`` can't run two statements at once,
+which is also why gathering plain ``get_by_id`` calls on one session fails.
+"""
+
+import asyncio
+from collections.abc import Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+from gymhero.crud.base import CRUDRepository
+from gymhero.database.base_class import Base
+
+# `AsyncSession.info` key: the session's loaders, one per repository.
+LOADERS = "loaders"
+
+
+class EntityLoader[ModelT: Base]:
+    def __init__(self, db: AsyncSession, crud: CRUDRepository[ModelT]) -> None:
+        self._db = db
+        self._crud = crud
+        self._pending: dict[int, asyncio.Future[ModelT | None]] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, entity_id: int) -> ModelT | None:
+        cached = self._cached(entity_id)
+        if cached is not None:
+            return cached
+        future = self._pending.get(entity_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Runs once every load started in this tick has registered.
+                loop.call_soon(self._start_batch)
+            future = self._pending[entity_id] = loop.create_future()
+        return await future
+
+    async def load_many(self, ids: Sequence[int]) -> tuple[list[ModelT], list[int]]:
+        """Like ``CRUDRepository.get_by_ids``: the rows found, in ``ids`` order,
+        and the ids that matched no row."""
+        loaded = await asyncio.gather(*(self.load(i) for i in ids))
+        return (
+            [obj for obj in loaded if obj is not None],
+            [i for i, obj in zip(ids, loaded, strict=True) if obj is None],
+        )
+
+    def _cached(self, entity_id: int) -> ModelT | None:
+        key = identity_key(self._crud._model, entity_id)
+        obj = self._db.identity_map.get(key)
+        # An expired instance would need a lazy load, which async can't do.
+        if obj is None or inspect(obj).expired_attributes:
+            return None
+        return obj
+
+    def _start_batch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: dict[int, asyncio.Future[ModelT | None]]) -> None:
+        try:
+            async with self._lock:
+                found, _ = await self._crud.get_by_ids(self._db, list(batch))
+        except BaseException as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        by_id = {obj.id: obj for obj in found}  # type: ignore[attr-defined]
+        for entity_id, future in batch.items():
+            if not future.done():
+                future.set_result(by_id.get(entity_id))
+
+
+def get_loader[ModelT: Base](
+    db: AsyncSession, crud: CRUDRepository[ModelT]
+) -> EntityLoader[ModelT]:
+    loaders: dict[int, EntityLoader[ModelT]] = db.info.setdefault(LOADERS, {})
+    loader = loaders.get(id(crud))
+    if loader is None:
+        loader = loaders[id(crud)] = EntityLoader(db, crud)
+    return loader
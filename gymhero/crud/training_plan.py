@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from gymhero.crud.base import CRUDRepository
+from gymhero.crud.base import CRUDRepository, commit_or_flush
 from gymhero.log import get_logger
 from gymhero.models import TrainingPlan, TrainingUnit
 
@@ -21,7 +21,7 @@ class TrainingPlanCRUD(CRUDRepository[TrainingPlan]):
 
         training_plan.training_units.append(training_unit)
         db.add(training_plan)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(training_plan)
         return training_plan
 
@@ -38,7 +38,7 @@ class TrainingPlanCRUD(CRUDRepository[TrainingPlan]):
             return None
 
         db.add(training_plan)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(training_plan)
         return training_plan
 
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from gymhero.crud.base import CRUDRepository
+from gymhero.crud.base import CRUDRepository, commit_or_flush
 from gymhero.log import get_logger
 from gymhero.models import Exercise, TrainingUnit
 from gymhero.models.training_unit import PrescribedSet, TrainingUnitExercise
@@ -19,7 +19,7 @@ class TrainingUnitCRUD(CRUDRepository[TrainingUnit]):
 
         training_unit.exercises.append(TrainingUnitExercise(exercise_id=exercise.id))
         db.add(training_unit)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(training_unit)
         return training_unit
 
@@ -32,7 +32,7 @@ class TrainingUnitCRUD(CRUDRepository[TrainingUnit]):
 
         training_unit.exercises.remove(link)  # delete-orphan drops the row + its sets
         db.add(training_unit)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(training_unit)
         return training_unit
 
@@ -48,7 +48,7 @@ class TrainingUnitCRUD(CRUDRepository[TrainingUnit]):
             for i, s in enumerate(prescription.sets, start=1)
         ]
         db.add(link)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(link)
         return link
 
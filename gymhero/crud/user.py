@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from gymhero.crud.base import CRUDRepository
+from gymhero.crud.base import CRUDRepository, commit_or_flush
 from gymhero.models.user import User
 from gymhero.security import verify_password
 
@@ -21,7 +21,7 @@ class UserCRUDRepository(CRUDRepository[User]):
     async def deactivate_user(db: AsyncSession, user: User) -> User:
         user.is_active = False
         db.add(user)
-        await db.commit()
+        await commit_or_flush(db)
         await db.refresh(user)
         return user
 
@@ -1,21 +1,41 @@
+import time
 from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
 
-from fastapi import Request
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
-from gymhero.database.session import get_local_session
+from gymhero.config import settings
+from gymhero.database.session import DEADLINE, UNIT_OF_WORK, get_local_session
 from gymhero.exceptions import SQLAlchemyException
 from gymhero.log import get_logger
 
 log = get_logger(__name__)
 
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def request_timeout(request: Request) -> float:
+    """Seconds the request's queries may take: header, else route, else default."""
+    route_path = getattr(request.scope.get("route"), "path", None)
+    budget = settings.request_timeout_routes.get(
+        route_path or "", settings.REQUEST_TIMEOUT_SECONDS
+    )
+    try:
+        requested = float(request.headers.get(REQUEST_TIMEOUT_HEADER, "nan"))
+    except ValueError:  # malformed header: keep the server-side budget
+        return budget
+    if requested > 0:  # also false for the "nan" default
+        budget = min(requested, settings.REQUEST_TIMEOUT_MAX_SECONDS)
+    return budget
+
 
 async def get_db(request: Request) -> AsyncGenerator[AsyncSession]:
     # The session factory lives on app.state (built in the lifespan handler).
     factory: async_sessionmaker[AsyncSession] = request.app.state.db_session_factory
     async with factory() as db:
+        db.info[DEADLINE] = time.monotonic() + request_timeout(request)
         try:
             yield db
         except Exception:
@@ -23,6 +43,19 @@ async def get_db(request: Request) -> AsyncGenerator[AsyncSession]:
             raise
 
 
+async def unit_of_work(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[None]:
+    """Commit the request's session once, after the endpoint succeeded.
+
+    Marks the session so repositories only flush. Must be mounted with
+    ``scope="function"``: its exit then runs once the response is serialized but
+    before it is sent, so a failed commit still becomes an error response. On an
+    exception nothing is committed and ``get_db`` rolls back.
+    """
+    db.info[UNIT_OF_WORK] = True
+    yield
+    await db.commit()
+
+
 @contextmanager
 def get_ctx_db(database_url: str) -> Generator[Session]:
     # Synchronous session for the offline seed scripts.
@@ -0,0 +1,52 @@
+"""Background validation of idle pooled connections.
+
+Replaces ``pool_pre_ping``: instead of pinging on every checkout (on the request
+path), idle connections are pinged every few seconds off the request path, so a
+connection the server dropped while it sat in the pool is usually replaced
+before a request ever draws it.
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+
+async def ping_idle_connections(engine: AsyncEngine) -> int:
+    """Ping each connection currently idle in the pool once; return how many.
+
+    The queue pool hands out connections first-in first-out, so ``checkedin()``
+    consecutive checkouts cycle through the idle ones. A dead connection makes
+    SQLAlchemy invalidate the whole pool (every older connection is reopened on
+    its next checkout), so the sweep stops at the first failure.
+    """
+    checkedin = getattr(engine.pool, "checkedin", None)
+    if checkedin is None:  # NullPool & co. keep nothing idle
+        return 0
+    pinged = 0
+    for _ in range(checkedin()):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except DBAPIError as e:
+            if not e.connection_invalidated:
+                raise
+            log.warning("dropped stale pooled connection: %s", e.orig)
+            break
+        pinged += 1
+    return pinged
+
+
+async def run_pool_health_check(engine: AsyncEngine, interval: float) -> None:
+    """Sweep the pool every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ping_idle_connections(engine)
+        except Exception:  # a DB outage must not kill the task; /ready reports it
+            log.exception("pool health check failed")
@@ -0,0 +1,221 @@
+"""Cross-worker cache invalidation over Postgres ``LISTEN``/``NOTIFY``.
+
+Every gunicorn worker (on every node) keeps its own in-process caches, and a
+write in one worker leaves the others serving stale entries until their TTL
+runs out. Sessions built with ``publish_invalidations=True`` (see
+``get_async_session_factory``) announce what each flush wrote with
+``pg_notify``: one ``(table, id, version)`` event per inserted, updated or
+deleted row, where the version is the writing transaction's id. ``NOTIFY`` is
+transactional — the events go out when the transaction commits and never if it
+rolls back.
+
+Each worker runs ``InvalidationBus.listen`` in its lifespan: a dedicated
+connection that ``LISTEN``s and hands every event to the bus's subscribers.
+While the connection is down the caches fall back to their TTLs; on
+reconnecting, the subscribers are reset, because events sent in the meantime
+are lost.
+
+A session that also carries the worker's bus (``INVALIDATION_BUS`` in its
+``info``) hands its own events to the bus right after committing, so the
+writing worker reads its writes without waiting for the round trip.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import asyncpg
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, SessionTransaction, UOWTransaction
+
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+CHANNEL = "gymhero_invalidation"
+# `Session.info` flag set by the session factory: publish this session's writes.
+PUBLISH_INVALIDATIONS = "publish_invalidations"
+# `Session.info` key: the worker's `InvalidationBus`, told of commits directly.
+INVALIDATION_BUS = "invalidation_bus"
+# `Session.info` key: events of the open transaction, for the local bus.
+_PENDING = "pending_invalidations"
+# NOTIFY payloads are capped at 8000 bytes; stay well clear with the envelope.
+_MAX_PAYLOAD = 7000
+
+_NOTIFY = text(
+    "SELECT pg_current_xact_id()::text, pg_notify(:channel, json_build_object("
+    "'version', pg_current_xact_id()::text, 'rows', CAST(:rows AS json))::text)"
+)
+_VERSION = text("SELECT pg_current_xact_id()::text")
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    table: str
+    id: Any
+    version: int
+
+
+def written_rows(session: Session) -> list[tuple[str, Any]]:
+    """``(table, primary key)`` of every row the current flush wrote."""
+    rows = []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        # New rows get their identity only after the flush; read the key off them.
+        mapper = inspect(obj).mapper
+        identity = mapper.primary_key_from_instance(obj)
+        key = identity[0] if len(identity) == 1 else identity
+        rows.append((mapper.local_table.name, key))
+    return rows
+
+
+def _payload_chunks(rows: list[tuple[str, Any]]) -> list[str]:
+    chunks: list[str] = []
+    current: list[tuple[str, Any]] = []
+    for row in rows:
+        if current and len(json.dumps([*current, row])) > _MAX_PAYLOAD:
+            chunks.append(json.dumps(current))
+            current = []
+        current.append(row)
+    if current:
+        chunks.append(json.dumps(current))
+    return chunks
+
+
+@event.listens_for(Session, "after_flush")
+def _publish(session: Session, flush_context: UOWTransaction) -> None:
+    publish = session.info.get(PUBLISH_INVALIDATIONS)
+    if not publish and INVALIDATION_BUS not in session.info:
+        return
+    rows = written_rows(session)
+    if not rows:
+        return
+    connection = session.connection()
+    if publish:
+        for chunk in _payload_chunks(rows):
+            version = connection.execute(
+                _NOTIFY, {"channel": CHANNEL, "rows": chunk}
+            ).scalar_one()
+    else:
+        version = connection.execute(_VERSION).scalar_one()
+    if INVALIDATION_BUS in session.info:
+        session.info.setdefault(_PENDING, []).extend(
+            Invalidation(table, key, int(version)) for table, key in rows
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_local(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        session.info[INVALIDATION_BUS].publish_local(pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction: SessionTransaction) -> None:
+    # Still pending at the end of the outermost transaction: rolled back.
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+@dataclass(frozen=True)
+class _Subscriber:
+    on_invalidate: Callable[[Invalidation], None]
+    on_reset: Callable[[], None]
+    remote: bool
+
+
+class InvalidationBus:
+    """Fans ``NOTIFY`` events out to the worker's cache subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: list[_Subscriber] = []
+        self.connected = False
+
+    def subscribe(
+        self,
+        on_invalidate: Callable[[Invalidation], None],
+        on_reset: Callable[[], None],
+        *,
+        remote: bool = True,
+    ) -> None:
+        """``on_invalidate`` per written row; ``on_reset`` when events may be lost.
+
+        With ``remote=False`` only this worker's own writes are delivered, and
+        there is nothing to reset.
+        """
+        self._subscribers.append(_Subscriber(on_invalidate, on_reset, remote))
+
+    def publish_local(self, events: list[Invalidation]) -> None:
+        for invalidation in events:
+            for subscriber in self._subscribers:
+                subscriber.on_invalidate(invalidation)
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            version = int(message["version"])
+            events = [
+                Invalidation(table, key, version) for table, key in message["rows"]
+            ]
+        except (ValueError, KeyError, TypeError):
+            log.warning("ignoring malformed invalidation: %r", payload)
+            return
+        for invalidation in events:
+            for subscriber in self._subscribers:
+                if subscriber.remote:
+                    subscriber.on_invalidate(invalidation)
+
+    def reset(self) -> None:
+        for subscriber in self._subscribers:
+            if subscriber.remote:
+                subscriber.on_reset()
+
+    async def listen(
+        self,
+        dsn: str,
+        *,
+        ping_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        """Stay subscribed to the channel until cancelled, reconnecting as needed."""
+        delay = reconnect_delay
+        while True:
+            try:
+                await self._listen_once(dsn, ping_interval)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                state = "lost" if self.connected else "unavailable"
+                log.warning(
+                    "invalidation listener %s, caches on TTL only: %s", state, e
+                )
+            if self.connected:
+                delay = reconnect_delay
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_reconnect_delay)
+
+    async def _listen_once(self, dsn: str, ping_interval: float) -> None:
+        conn = await asyncpg.connect(dsn)
+        lost = asyncio.Event()
+        try:
+            conn.add_termination_listener(lambda _: lost.set())
+            await conn.add_listener(
+                CHANNEL, lambda conn, pid, channel, payload: self.dispatch(payload)
+            )
+            self.connected = True
+            # Whatever was sent while we weren't listening is gone.
+            self.reset()
+            log.info("invalidation listener connected")
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), ping_interval)
+                except TimeoutError:
+                    # A silently dropped connection only shows on use.
+                    await conn.fetchval("SELECT 1")
+            raise ConnectionResetError("listener connection closed")
+        finally:
+            conn.terminate()
@@ -0,0 +1,270 @@
+"""Zero-downtime helpers for Alembic migrations.
+
+A DDL statement that queues behind a long-running transaction for its lock
+blocks every query that arrives after it. Run the migrations in the
+``zero-downtime`` mode (``MIGRATION_MODE=zero-downtime`` or
+``alembic -x mode=zero-downtime upgrade head``) and ``migrations/env.py`` does
+three things. It commits each revision on its own. It sets ``lock_timeout`` and
+``statement_timeout`` for the session. If a revision gave up waiting for a
+lock, it retries that revision with exponential backoff.
+
+Revisions that touch large tables build on the helpers below:
+
+* ``create_index_concurrently`` / ``drop_index_concurrently`` run outside the
+  revision's transaction (``CONCURRENTLY`` refuses to run inside one), without
+  the statement timeout, and are safe to re-run;
+* ``backfill`` updates a table in key-range batches, one short transaction each,
+  and logs its progress.
+
+With ``alembic upgrade --sql`` they emit plain statements instead.
+"""
+
+import itertools
+import os
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Self
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+ZERO_DOWNTIME = "zero-downtime"
+# SQLSTATE lock_not_available: lock_timeout expired.
+_LOCK_NOT_AVAILABLE = "55P03"
+
+
+@dataclass(frozen=True)
+class MigrationPolicy:
+    mode: str = ""
+    lock_timeout_ms: int = 3000
+    statement_timeout_ms: int = 60_000
+    retries: int = 5
+    retry_delay_seconds: float = 1.0
+
+    @property
+    def zero_downtime(self) -> bool:
+        return self.mode == ZERO_DOWNTIME
+
+    @classmethod
+    def from_env(
+        cls,
+        environ: Mapping[str, str] = os.environ,
+        x_args: Mapping[str, str] | None = None,
+    ) -> Self:
+        """Read ``MIGRATION_*`` variables; ``-x mode=...`` overrides the mode."""
+        default = cls()
+        mode = (x_args or {}).get("mode", environ.get("MIGRATION_MODE", ""))
+        if mode not in ("", ZERO_DOWNTIME):
+            raise ValueError(f"Unknown migration mode {mode!r}")
+        return cls(
+            mode=mode,
+            lock_timeout_ms=int(
+                environ.get("MIGRATION_LOCK_TIMEOUT_MS", default.lock_timeout_ms)
+            ),
+            statement_timeout_ms=int(
+                environ.get(
+                    "MIGRATION_STATEMENT_TIMEOUT_MS", default.statement_timeout_ms
+                )
+            ),
+            retries=int(environ.get("MIGRATION_RETRIES", default.retries)),
+            retry_delay_seconds=float(
+                environ.get(
+                    "MIGRATION_RETRY_DELAY_SECONDS", default.retry_delay_seconds
+                )
+            ),
+        )
+
+
+def is_lock_timeout(exc: BaseException) -> bool:
+    orig = getattr(exc, "orig", None)
+    # psycopg2 calls it pgcode, asyncpg sqlstate.
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == _LOCK_NOT_AVAILABLE
+
+
+def retry_on_lock_timeout[T](
+    fn: Callable[[], T], policy: MigrationPolicy, *, what: str
+) -> T:
+    """Call ``fn``, retrying with exponential backoff while it hits lock_timeout."""
+    for attempt in itertools.count(1):
+        try:
+            return fn()
+        except DBAPIError as exc:
+            if not is_lock_timeout(exc) or attempt > policy.retries:
+                raise
+            delay = policy.retry_delay_seconds * 2 ** (attempt - 1)
+            log.warning(
+                "%s: lock timeout, retry %d/%d in %.1fs",
+                what,
+                attempt,
+                policy.retries,
+                delay,
+            )
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def set_timeouts(connection: Connection, policy: MigrationPolicy) -> None:
+    """Apply the policy's timeouts to the whole session (they survive commits)."""
+    connection.exec_driver_sql(f"SET lock_timeout = {policy.lock_timeout_ms}")
+    connection.exec_driver_sql(f"SET statement_timeout = {policy.statement_timeout_ms}")
+    connection.commit()
+
+
+def current_policy() -> MigrationPolicy:
+    """The policy ``migrations/env.py`` configured the running migration with."""
+    policy = op.get_context().opts.get("migration_policy")
+    return policy if isinstance(policy, MigrationPolicy) else MigrationPolicy()
+
+
+@contextmanager
+def _without_statement_timeout(connection: Connection) -> Iterator[None]:
+    previous = connection.exec_driver_sql("SHOW statement_timeout").scalar_one()
+    connection.exec_driver_sql("SET statement_timeout = 0")
+    try:
+        yield
+    finally:
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :value, false)"),
+            {"value": previous},
+        )
+
+
+def _drop_if_invalid(connection: Connection, name: str) -> None:
+    # A failed or cancelled concurrent build leaves an INVALID index behind that
+    # IF NOT EXISTS would happily keep.
+    invalid = connection.execute(
+        text(
+            "SELECT 1 FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE i.relname = :name AND NOT x.indisvalid "
+            "AND i.relnamespace = current_schema()::regnamespace"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        log.warning("Dropping invalid index %s left by an earlier build", name)
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    unique: bool = False,
+    where: str | None = None,
+) -> None:
+    """``CREATE INDEX CONCURRENTLY IF NOT EXISTS``, outside the transaction."""
+    context = op.get_context()
+    with context.autocommit_block():
+
+        def create() -> None:
+            op.create_index(
+                name,
+                table,
+                list(columns),
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                postgresql_where=text(where) if where else None,
+            )
+
+        if context.as_sql:
+            create()
+            return
+        connection = op.get_bind()
+
+        def build() -> None:
+            _drop_if_invalid(connection, name)
+            # Building is meant to take long; lock_timeout still applies.
+            with _without_statement_timeout(connection):
+                create()
+
+        retry_on_lock_timeout(build, current_policy(), what=f"create index {name}")
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """``DROP INDEX CONCURRENTLY IF EXISTS``, outside the transaction."""
+    context = op.get_context()
+    with context.autocommit_block():
+
+        def drop() -> None:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+
+        if context.as_sql:
+            drop()
+            return
+        retry_on_lock_timeout(drop, current_policy(), what=f"drop index {name}")
+
+
+def backfill(
+    table: str,
+    assignments: str,
+    *,
+    where: str | None = None,
+    key: str = "id",
+    batch_size: int = 10_000,
+    pause_seconds: float = 0.0,
+    progress_every_seconds: float = 5.0,
+) -> int:
+    """``UPDATE table SET assignments`` in ``key`` ranges of ``batch_size``.
+
+    Each batch commits on its own, so row locks are held briefly and a retry or
+    a re-run resumes cheaply — provided ``where`` excludes rows already done
+    (e.g. ``"new_col IS NULL"``). ``key`` must be an integer column, ideally
+    the primary key. Returns the number of rows updated.
+    """
+    condition = f" AND ({where})" if where else ""
+    context = op.get_context()
+    with context.autocommit_block():
+        if context.as_sql:
+            op.execute(f"UPDATE {table} SET {assignments} WHERE true{condition}")
+            return 0
+        connection = op.get_bind()
+        low, high = connection.execute(
+            text(f"SELECT min({key}), max({key}) FROM {table}")
+        ).one()
+        if low is None:
+            return 0
+        update = text(
+            f"UPDATE {table} SET {assignments} "
+            f"WHERE {key} >= :low AND {key} < :high{condition}"
+        )
+        policy = current_policy()
+        span = high - low + 1
+        total = 0
+        started = reported = time.monotonic()
+        for start in range(low, high + 1, batch_size):
+            bounds = {"low": start, "high": start + batch_size}
+
+            def run_batch(bounds: dict[str, int] = bounds) -> int:
+                return connection.execute(update, bounds).rowcount
+
+            total += retry_on_lock_timeout(run_batch, policy, what=f"backfill {table}")
+            now = time.monotonic()
+            done = min(start + batch_size, high + 1) - low
+            if now - reported >= progress_every_seconds or done == span:
+                reported = now
+                elapsed = now - started
+                log.info(
+                    "backfill %s: %d rows, %.1f%% of %s range, %.0f rows/s, eta %.0fs",
+                    table,
+                    total,
+                    100 * done / span,
+                    key,
+                    total / elapsed if elapsed else 0.0,
+                    elapsed * (span - done) / done,
+                )
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    return total
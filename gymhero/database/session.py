@@ -1,12 +1,37 @@
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine, Result
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.sql import Executable
+
+from gymhero.database.invalidation import (
+    INVALIDATION_BUS,
+    PUBLISH_INVALIDATIONS,
+    InvalidationBus,
+)
+from gymhero.exceptions import RequestTimeoutError
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+# `AsyncSession.info` flag: the session is a request-wide unit of work, so
+# repositories only flush and `gymhero.database.db.unit_of_work` commits once.
+UNIT_OF_WORK = "unit_of_work"
+
+# `AsyncSession.info` key: `time.monotonic()` by which the request's queries must
+# finish. Each transaction the session opens gets the remaining budget as its
+# statement_timeout, so Postgres itself aborts a query that would overrun it.
+DEADLINE = "deadline"
 
 # Engine/session factories are built by the caller (the app lifespan for async,
 # the offline tooling for sync) — nothing is instantiated at import time. The
@@ -34,13 +59,87 @@ def get_async_engine(
     return create_async_engine(
         database_url,
         echo=echo,
-        pool_pre_ping=True,
+        # No pool_pre_ping: a ping round trip on every checkout costs more than
+        # the short queries it guards. Stale connections are instead caught on
+        # first use (ReconnectingAsyncSession) and swept by a background check.
         pool_size=pool_size,
         max_overflow=max_overflow,
         pool_recycle=pool_recycle,
     )
 
 
-def get_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+@event.listens_for(Session, "after_begin")
+def _apply_deadline(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    deadline = session.info.get(DEADLINE)
+    if deadline is None:
+        return
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise RequestTimeoutError("Request timed out")
+    # SET takes no bind parameters; the value is a plain int.
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
+
+class ReconnectingAsyncSession(AsyncSession):
+    """Retry a read once when it hit a connection the server already dropped.
+
+    Only a ``SELECT`` (or a primary-key ``get``) that opened the session's
+    transaction is retried: its connection was checked out for that very
+    statement, so nothing else ran on it and re-running it on a fresh connection
+    is invisible to the caller. Anything mid-transaction or writing re-raises as
+    before.
+    """
+
+    async def execute(
+        self, statement: Executable, *args: Any, **kwargs: Any
+    ) -> Result[Any]:
+        return await self._retry_stale_read(
+            lambda: super(ReconnectingAsyncSession, self).execute(
+                statement, *args, **kwargs
+            ),
+            is_read=statement.is_select,
+        )
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await self._retry_stale_read(
+            lambda: super(ReconnectingAsyncSession, self).get(entity, ident, **kwargs),
+            is_read=True,
+        )
+
+    async def _retry_stale_read[T](
+        self, run: Callable[[], Awaitable[T]], *, is_read: bool
+    ) -> T:
+        first_use = not self.in_transaction()
+        try:
+            return await run()
+        except DBAPIError as e:
+            if not (e.connection_invalidated and first_use and is_read):
+                raise
+            log.warning("stale database connection, retrying read: %s", e.orig)
+            # The pool was invalidated along with the dead connection, so the
+            # retry checks out a freshly opened one.
+            await self.rollback()
+            return await run()
+
+
+def get_async_session_factory(
+    engine: AsyncEngine,
+    *,
+    publish_invalidations: bool = False,
+    invalidation_bus: InvalidationBus | None = None,
+) -> async_sessionmaker[AsyncSession]:
     # expire_on_commit=False: response serialization runs after the service commits.
-    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    # publish_invalidations: announce writes to every worker's caches (NOTIFY).
+    # invalidation_bus: and to this worker's, as soon as they commit.
+    info: dict[str, Any] = {PUBLISH_INVALIDATIONS: publish_invalidations}
+    if invalidation_bus is not None:
+        info[INVALIDATION_BUS] = invalidation_bus
+    return async_sessionmaker(
+        bind=engine,
+        class_=ReconnectingAsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info=info,
+    )
@@ -0,0 +1,38 @@
+"""Worker warm-up: fill the pool and prime the statement caches before serving.
+
+A fresh worker would otherwise pay, on its first requests, for the TCP/auth
+handshake of every pooled connection, for SQLAlchemy compiling each statement
+shape (the engine's compiled cache) and for asyncpg preparing it (a cache per
+connection). ``warm_pool`` does all of it in the app lifespan, which finishes
+before the worker accepts a connection.
+"""
+
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+
+from sqlalchemy import Executable
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from gymhero.log import get_logger
+
+log = get_logger(__name__)
+
+
+async def warm_pool(
+    engine: AsyncEngine, size: int, statements: Sequence[Executable] = ()
+) -> int:
+    """Open ``size`` pooled connections and run ``statements`` on each of them.
+
+    The connections are held until all of them are open — returning one early
+    would only make the pool hand it out again — and then go back to the pool
+    together. Statements run in a transaction that is rolled back, so they
+    should be reads; their bound values don't matter, only their shape does.
+    Returns the number of connections opened.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            conn = await stack.enter_async_context(engine.connect())
+            for statement in statements:
+                await conn.execute(statement)
+    log.info("warmed %d pooled connections with %d statements", size, len(statements))
+    return size
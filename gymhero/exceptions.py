@@ -44,3 +44,7 @@ class EntityConflictError(DomainError):
 
 class PermissionDeniedError(DomainError):
     """The actor is not allowed to perform the action (HTTP 403)."""
+
+
+class RequestTimeoutError(DomainError):
+    """The request's time budget ran out before its work finished (HTTP 504)."""
@@ -1,15 +1,15 @@
+import asyncio
+import contextlib
 import logging
-import time
-import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from pathlib import Path
 
-import structlog
-from fastapi import APIRouter, Depends, FastAPI, Request, Response
+from fastapi import APIRouter, Depends, FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from sqlalchemy import Executable, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.middleware.base import RequestResponseEndpoint
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from gymhero.api import (
@@ -22,14 +22,43 @@ from gymhero.api import (
     training_unit_router,
     user_router,
 )
+from gymhero.api.admission import AdmissionController, AdmissionMiddleware
 from gymhero.api.error_handlers import register_exception_handlers
+from gymhero.api.middleware import (
+    AccessLogMiddleware,
+    ClientDisconnectMiddleware,
+    RequestIDMiddleware,
+)
+from gymhero.api.singleflight import SingleFlight
+from gymhero.cache import Cache, CacheBackend, MemoryBackend, RedisBackend
 from gymhero.config import settings
-from gymhero.database.db import get_db
+from gymhero.crud import exercise_crud, training_plan_crud, user_crud
+from gymhero.database.db import get_db, unit_of_work
+from gymhero.database.health import run_pool_health_check
+from gymhero.database.invalidation import InvalidationBus
 from gymhero.database.session import get_async_engine, get_async_session_factory
+from gymhero.database.warmup import warm_pool
+from gymhero.models import Exercise, TrainingPlan, User
+from gymhero.services.catalog_index import ExerciseCatalogIndex
+from gymhero.services.catalog_snapshot import CatalogSnapshotStore
 
 logger = logging.getLogger(__name__)
 
 
+def _hot_statements() -> list[Executable]:
+    # The shapes behind most requests: the user lookup of every authenticated
+    # call, and the default exercise / training plan reads. Values are dummies.
+    return [
+        user_crud.select_one(User.id == 0),
+        exercise_crud.select_one(Exercise.id == 0),
+        exercise_crud.select_many(),
+        exercise_crud.select_count(),
+        training_plan_crud.select_one(TrainingPlan.id == 0),
+        training_plan_crud.select_many(TrainingPlan.owner_id == 0),
+        training_plan_crud.select_count(TrainingPlan.owner_id == 0),
+    ]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Build the DB engine + session factory once per process and hand them to the
@@ -41,13 +70,77 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
     )
     app.state.db_engine = engine
-    app.state.db_session_factory = get_async_session_factory(engine)
+    bus: InvalidationBus = app.state.invalidation_bus
+    app.state.db_session_factory = get_async_session_factory(
+        engine,
+        publish_invalidations=settings.CACHE_INVALIDATION_ENABLED,
+        invalidation_bus=bus,
+    )
+    if settings.DB_POOL_PREWARM:
+        try:
+            await warm_pool(engine, settings.DB_POOL_SIZE, _hot_statements())
+        except (DBAPIError, OSError):
+            # Serve cold rather than not at all; /ready reports a database outage.
+            logger.exception("pool warm-up failed")
+    health_check = (
+        asyncio.create_task(
+            run_pool_health_check(engine, settings.DB_POOL_HEALTHCHECK_SECONDS)
+        )
+        if settings.DB_POOL_HEALTHCHECK_SECONDS
+        else None
+    )
+    listener = (
+        asyncio.create_task(bus.listen(settings.database_url))
+        if settings.CACHE_INVALIDATION_ENABLED
+        else None
+    )
+    index: ExerciseCatalogIndex | None = app.state.exercise_index
+    if index is not None:
+        try:
+            await index.load(app.state.db_session_factory)
+        except (DBAPIError, OSError):
+            # Until a write or reconnect retries, the catalog is read from Postgres.
+            logger.exception("exercise catalog index load failed")
+    snapshot: CatalogSnapshotStore | None = app.state.catalog_snapshot
+    snapshot_watch = (
+        asyncio.create_task(
+            snapshot.watch(
+                app.state.db_session_factory, settings.CATALOG_SNAPSHOT_POLL_SECONDS
+            )
+        )
+        if snapshot is not None
+        else None
+    )
     yield
+    for task in (health_check, listener, snapshot_watch):
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    cache: Cache | None = app.state.cache
+    if cache is not None:
+        await cache.close()
     await engine.dispose()
 
 
+def _build_cache() -> Cache:
+    backend: CacheBackend = (
+        RedisBackend(settings.CACHE_REDIS_URL)
+        if settings.CACHE_REDIS_URL
+        else MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    )
+    return Cache(
+        backend, ttl=settings.CACHE_TTL_SECONDS, stale_ttl=settings.CACHE_STALE_SECONDS
+    )
+
+
 def _build_api_router() -> APIRouter:
-    api_v1 = APIRouter(prefix="/api/v1")
+    # Opt-in unit of work: one commit per request instead of one per repository
+    # write. Function scope lands the commit before the response is sent.
+    dependencies = (
+        [Depends(unit_of_work, scope="function")] if settings.DB_UNIT_OF_WORK else []
+    )
+    api_v1 = APIRouter(prefix="/api/v1", dependencies=dependencies)
     api_v1.include_router(exercise_router, prefix="/exercises", tags=["exercise"])
     api_v1.include_router(
         exercise_type_router, prefix="/exercise-types", tags=["exercise_types"]
@@ -80,6 +173,50 @@ def create_app() -> FastAPI:
 
     register_exception_handlers(app)
 
+    # Innermost: CORS preflights and host rejections never take a slot.
+    admission = (
+        AdmissionController(
+            settings.admission_max_in_flight,
+            settings.ADMISSION_QUEUE_SIZE,
+            settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            high_priority_paths=settings.admission_high_priority_paths,
+            low_priority_paths=settings.admission_low_priority_paths,
+        )
+        if settings.admission_max_in_flight
+        else None
+    )
+    app.state.admission = admission
+    if admission is not None:
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+
+    flight = (
+        SingleFlight(settings.SINGLE_FLIGHT_WINDOW_SECONDS)
+        if settings.SINGLE_FLIGHT_ENABLED
+        else None
+    )
+    app.state.single_flight = flight
+    cache = _build_cache() if settings.CACHE_ENABLED else None
+    app.state.cache = cache
+    # Writes reach the caches through the bus; the lifespan connects it.
+    bus = InvalidationBus()
+    app.state.invalidation_bus = bus
+    if flight is not None:
+        bus.subscribe(lambda event: flight.invalidate(event.table), flight.clear)
+    if cache is not None:
+        cache.subscribe(bus)
+    index = ExerciseCatalogIndex() if settings.EXERCISE_INDEX_ENABLED else None
+    app.state.exercise_index = index
+    if index is not None:
+        index.subscribe(bus)
+    snapshot = (
+        CatalogSnapshotStore(Path(settings.CATALOG_SNAPSHOT_PATH))
+        if settings.CATALOG_SNAPSHOT_PATH
+        else None
+    )
+    app.state.catalog_snapshot = snapshot
+    if snapshot is not None:
+        snapshot.subscribe(bus)
+
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.allowed_hosts)
     app.add_middleware(
         CORSMiddleware,
@@ -89,28 +226,12 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    @app.middleware("http")
-    async def bind_request_id(
-        request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Bind a per-request id into the log context and echo it back to the client."""
-        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-        request.state.request_id = request_id
-        structlog.contextvars.clear_contextvars()
-        structlog.contextvars.bind_contextvars(request_id=request_id)
-        start = time.perf_counter()
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        logger.info(
-            "request",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status": response.status_code,
-                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
-            },
-        )
-        return response
+    app.add_middleware(ClientDisconnectMiddleware)
+
+    # Added last = outermost: every response, including CORS preflights and
+    # host rejections, is logged and carries a request id.
+    app.add_middleware(AccessLogMiddleware)
+    app.add_middleware(RequestIDMiddleware)
 
     app.include_router(_build_api_router())
 
@@ -120,8 +241,14 @@ def create_app() -> FastAPI:
         return {"status": "ok"}
 
     @app.get("/ready", tags=["health"])
-    async def ready(db: AsyncSession = Depends(get_db)) -> dict[str, str]:
-        """Readiness probe — database is reachable."""
+    async def ready(
+        response: Response, db: AsyncSession = Depends(get_db)
+    ) -> dict[str, str]:
+        """Readiness probe — database is reachable and the worker isn't saturated."""
+        if admission is not None and admission.saturated:
+            # Steer new traffic to other workers; skip the query, we're busy enough.
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            return {"status": "saturated"}
         await db.execute(text("SELECT 1"))
         return {"status": "ready"}
 
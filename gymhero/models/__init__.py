@@ -1,5 +1,6 @@
 from gymhero.database.base_class import Base
 from gymhero.models.body_part import BodyPart
+from gymhero.models.catalog import CatalogEntry, CatalogMetadata
 from gymhero.models.exercise import Exercise, ExerciseType
 from gymhero.models.level import Level
 from gymhero.models.training_plan import TrainingPlan, training_plan_training_unit
@@ -13,6 +14,8 @@ from gymhero.models.user import User
 __all__ = [
     "Base",
     "BodyPart",
+    "CatalogEntry",
+    "CatalogMetadata",
     "Exercise",
     "ExerciseType",
     "Level",
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from gymhero.database.base_class import Base
+
+
+class CatalogEntry(Base):
+    """Marks an exercise as seeded from the catalog, with its row's content hash."""
+
+    __tablename__ = "catalog_entries"
+
+    # CASCADE: deleting a catalog exercise through the API drops its entry too.
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"), primary_key=True
+    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CatalogEntry(exercise_id={self.exercise_id})>"
+
+
+class CatalogMetadata(Base):
+    """Version and source-file hash of the last sync of a named catalog."""
+
+    __tablename__ = "catalog_metadata"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    source_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<CatalogMetadata(name={self.name}, version={self.version})>"
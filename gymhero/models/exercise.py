@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gymhero.database.base_class import Base, TimestampMixin
@@ -7,9 +7,21 @@ from gymhero.database.base_class import Base, TimestampMixin
 class Exercise(TimestampMixin, Base):
     __tablename__ = "exercises"
 
+    # Sorted pages (``sort=``, id breaking ties) read these in order instead of
+    # sorting the matches; the owner ones also cover the owner_id foreign key.
+    __table_args__ = (
+        Index("exercises_created_at_id_idx", "created_at", "id"),
+        Index("exercises_updated_at_id_idx", "updated_at", "id"),
+        Index("exercises_owner_id_name_id_idx", "owner_id", "name", "id"),
+        Index("exercises_owner_id_created_at_id_idx", "owner_id", "created_at", "id"),
+        Index("exercises_owner_id_updated_at_id_idx", "owner_id", "updated_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Free-form, as in the catalog CSV ("Barbell", "Dumbbell", ...); a facet.
+    equipment: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     target_body_part_id: Mapped[int] = mapped_column(
         ForeignKey("body_parts.id"), index=True, nullable=False
     )
@@ -19,9 +31,7 @@ class Exercise(TimestampMixin, Base):
     level_id: Mapped[int] = mapped_column(
         ForeignKey("levels.id"), index=True, nullable=False
     )
-    owner_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), index=True, nullable=False
-    )
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     # Eager-loaded (selectin): the read schema ExerciseInDB embeds these as nested
     # {id, name} objects, so they must be loaded wherever an Exercise is returned
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, String, Table, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, String, Table, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gymhero.database.base_class import Base, TimestampMixin
@@ -11,10 +11,12 @@ training_plan_training_unit = Table(
         ForeignKey("training_plans.id"),
         primary_key=True,
     ),
+    # The primary key leads with training_plan_id; index the other side too.
     Column(
         "training_unit_id",
         ForeignKey("training_units.id"),
         primary_key=True,
+        index=True,
     ),
 )
 
@@ -22,14 +24,23 @@ training_plan_training_unit = Table(
 class TrainingPlan(TimestampMixin, Base):
     __tablename__ = "training_plans"
 
-    __table_args__ = (UniqueConstraint("name", "owner_id"),)
+    # The owner's sorted pages (``sort=``, id breaking ties) read these in
+    # order; they also cover the owner_id foreign key.
+    __table_args__ = (
+        UniqueConstraint("name", "owner_id"),
+        Index("training_plans_owner_id_name_id_idx", "owner_id", "name", "id"),
+        Index(
+            "training_plans_owner_id_created_at_id_idx", "owner_id", "created_at", "id"
+        ),
+        Index(
+            "training_plans_owner_id_updated_at_id_idx", "owner_id", "updated_at", "id"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
-    owner_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), index=True, nullable=False
-    )
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User", back_populates="training_plans")
     training_units = relationship(
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gymhero.database.base_class import Base, TimestampMixin
@@ -31,7 +31,11 @@ class TrainingUnitExercise(Base):
     training_unit_id: Mapped[int] = mapped_column(
         ForeignKey("training_units.id"), nullable=False
     )
-    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id"), nullable=False)
+    # The unique constraint leads with training_unit_id: exercise_id needs its own
+    # index for the FK check when an exercise is deleted.
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id"), index=True, nullable=False
+    )
 
     exercise = relationship("Exercise", lazy="selectin")
     sets: Mapped[list[PrescribedSet]] = relationship(
@@ -47,14 +51,23 @@ class TrainingUnitExercise(Base):
 class TrainingUnit(TimestampMixin, Base):
     __tablename__ = "training_units"
 
-    __table_args__ = (UniqueConstraint("name", "owner_id"),)
+    # The owner's sorted pages (``sort=``, id breaking ties) read these in
+    # order; they also cover the owner_id foreign key.
+    __table_args__ = (
+        UniqueConstraint("name", "owner_id"),
+        Index("training_units_owner_id_name_id_idx", "owner_id", "name", "id"),
+        Index(
+            "training_units_owner_id_created_at_id_idx", "owner_id", "created_at", "id"
+        ),
+        Index(
+            "training_units_owner_id_updated_at_id_idx", "owner_id", "updated_at", "id"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
-    owner_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), index=True, nullable=False
-    )
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User")
     # Link rows, not Exercise objects — each carries its own ordered prescription.
@@ -1,3 +1,5 @@
+from enum import StrEnum
+
 from pydantic import BaseModel
 
 
@@ -12,3 +14,30 @@ class Page[T](BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class Batch[T](BaseModel):
+    """Multi-get envelope: the entities found and the requested ids that weren't."""
+
+    items: list[T]
+    missing: list[int]
+
+
+class FacetCount[T](BaseModel):
+    """How many results have ``value`` in a facet."""
+
+    value: T
+    count: int
+
+
+class SortField(StrEnum):
+    """Columns a list can be sorted by; ``id`` breaks ties."""
+
+    NAME = "name"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class SortOrder(StrEnum):
+    ASC = "asc"
+    DESC = "desc"
@@ -3,6 +3,7 @@ import datetime
 from pydantic import BaseModel, ConfigDict, Field
 
 from gymhero.schemas.body_part import BodyPartOut
+from gymhero.schemas.common import FacetCount
 from gymhero.schemas.exercise_type import ExerciseTypeOut
 from gymhero.schemas.level import LevelOut
 
@@ -12,6 +13,9 @@ class ExerciseBase(BaseModel):
     description: str | None = Field(
         default=None, max_length=2000, title="The description of the exercise"
     )
+    equipment: str | None = Field(
+        default=None, max_length=255, title="The equipment the exercise needs"
+    )
 
 
 class ExerciseCreate(ExerciseBase):
@@ -26,6 +30,7 @@ class ExerciseCreate(ExerciseBase):
 class ExerciseUpdate(BaseModel):
     name: str | None = Field(default=None, max_length=255)
     description: str | None = Field(default=None, max_length=2000)
+    equipment: str | None = Field(default=None, max_length=255)
     target_body_part_id: int | None = None
     exercise_type_id: int | None = None
     level_id: int | None = None
@@ -52,3 +57,13 @@ class ExerciseSummary(BaseModel):
     owner_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ExerciseFacets(BaseModel):
+    # Counts under the request's filters, most first; a null equipment value
+    # counts exercises without one.
+    total: int
+    exercise_type_id: list[FacetCount[int]]
+    level_id: list[FacetCount[int]]
+    target_body_part_id: list[FacetCount[int]]
+    equipment: list[FacetCount[str | None]]
@@ -0,0 +1,78 @@
+"""Production server: gunicorn managing uvicorn workers (``python -m gymhero.server``).
+
+* Workers default to one per CPU the process may run on: each is an event loop,
+  so more would only compete for the same cores. ``WEB_CONCURRENCY`` overrides.
+* The app is imported once, in the master, and the workers fork from it, so
+  the modules, routes and pydantic schemas are shared copy-on-write rather than
+  built and held by every worker. Nothing at import time opens a connection —
+  the engine is built per worker in the app lifespan.
+* The garbage collector is off while the app loads and the loaded objects are
+  frozen before each fork: a collection in a worker would otherwise write to
+  every object it visits and un-share their pages.
+* Each worker opens its pool and primes the statement caches in the lifespan
+  (``gymhero.database.warmup``) before it accepts connections.
+"""
+
+import gc
+import os
+from collections.abc import Mapping
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+from gymhero.config import settings
+
+WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+
+def worker_count(environ: Mapping[str, str] = os.environ) -> int:
+    if concurrency := environ.get("WEB_CONCURRENCY"):
+        return max(int(concurrency), 1)
+    return os.process_cpu_count() or 1
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    # Move everything loaded so far out of the collector's reach.
+    gc.freeze()
+
+
+def post_fork(server: Arbiter, worker: Worker) -> None:
+    gc.enable()
+
+
+def options(environ: Mapping[str, str] = os.environ) -> dict[str, Any]:
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": worker_count(environ),
+        "worker_class": WORKER_CLASS,
+        "preload_app": True,
+        "pre_fork": pre_fork,
+        "post_fork": post_fork,
+    }
+
+
+class Server(BaseApplication):  # type: ignore[misc]
+    def __init__(self, options: dict[str, Any]) -> None:
+        self._options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self._options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        from gymhero.main import app
+
+        return app
+
+
+def main() -> None:
+    # Re-enabled in each worker by post_fork.
+    gc.disable()
+    Server(options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""Per-worker in-memory index of the shared exercise catalog.
+
+``/exercises/all`` is a filtered browse of a mostly static catalog, so each
+worker can hold the whole catalog and answer it without Postgres:
+
+* the rows as columns — ids and foreign keys in ``array('q')``, names,
+  descriptions and timestamps in parallel lists — one slot per exercise, in
+  id order;
+* a posting list (sorted slots) per ``exercise_type_id``, ``level_id``,
+  ``target_body_part_id`` and ``equipment`` value;
+* a trigram index over lower-cased names, narrowing the ``q`` substring match
+  to the rows containing every trigram of the query before checking them.
+
+The index is loaded in the app lifespan and then kept in sync incrementally:
+it subscribes to the invalidation bus (``gymhero.database.invalidation``) and
+re-reads just the exercise and reference rows each write touched. Until those
+re-reads land — and whenever it isn't loaded, or a query needs what it doesn't
+model (``LIKE`` wildcards in ``q``, ordering by name) — ``search`` returns
+``None`` and the caller goes to Postgres, so the index never serves an answer
+older than a write this worker has committed.
+
+An updated row is rewritten in its slot and moved between just the postings
+whose value changed. Deleted rows leave tombstones, and the columns are
+compacted once those make up half of them. A new id below the highest one
+(a transaction committing after a later one) is appended out of order; results
+are put back in id order until the next compaction.
+"""
+
+import asyncio
+import datetime
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from gymhero.database.invalidation import Invalidation, InvalidationBus
+from gymhero.log import get_logger
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+from gymhero.schemas.common import SortField
+
+log = get_logger(__name__)
+
+_COLUMNS = (
+    Exercise.id,
+    Exercise.name,
+    Exercise.description,
+    Exercise.equipment,
+    Exercise.created_at,
+    Exercise.updated_at,
+    Exercise.owner_id,
+    Exercise.exercise_type_id,
+    Exercise.level_id,
+    Exercise.target_body_part_id,
+)
+_REFERENCES: dict[str, type[ExerciseType] | type[Level] | type[BodyPart]] = {
+    "exercise_types": ExerciseType,
+    "levels": Level,
+    "body_parts": BodyPart,
+}
+_GRAM = 3
+
+
+@dataclass(frozen=True, slots=True)
+class Reference:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedExercise:
+    """A catalog row as the index serves it: shaped like ``ExerciseInDB``."""
+
+    id: int
+    name: str
+    description: str | None
+    equipment: str | None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    owner_id: int
+    exercise_type: Reference
+    level: Reference
+    target_body_part: Reference
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+def _contains(posting: array[int], slot: int) -> bool:
+    i = bisect_left(posting, slot)
+    return i < len(posting) and posting[i] == slot
+
+
+def _discard[K](postings: dict[K, array[int]], key: K, slot: int) -> None:
+    posting = postings[key]
+    del posting[bisect_left(posting, slot)]
+    if not posting:
+        del postings[key]
+
+
+def _add[K](postings: dict[K, array[int]], key: K, slot: int) -> None:
+    insort(postings.setdefault(key, array("q")), slot)
+
+
+def _move[K](postings: dict[K, array[int]], old: K, new: K, slot: int) -> None:
+    _discard(postings, old, slot)
+    _add(postings, new, slot)
+
+
+class ExerciseCatalogIndex:
+    def __init__(self) -> None:
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._ready = False
+        # (table, id) written but not re-read yet.
+        self._pending: set[tuple[str, int]] = set()
+        self._refresh: asyncio.Task[None] | None = None
+        # Held by whoever is changing the index from the database.
+        self._lock = asyncio.Lock()
+        self._clear()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready and not self._pending
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    async def load(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """(Re)build the whole index from the database."""
+        self._session_factory = session_factory
+        async with self._lock:
+            await self._build()
+
+    async def _build(self) -> None:
+        assert self._session_factory is not None
+        # Whatever was written before this point, the reads below see.
+        self._pending.clear()
+        async with self._session_factory() as session:
+            rows = (
+                await session.execute(select(*_COLUMNS).order_by(Exercise.id))
+            ).all()
+            references = {
+                table: dict(
+                    (await session.execute(select(model.id, model.name))).tuples().all()
+                )
+                for table, model in _REFERENCES.items()
+            }
+        self._clear(references)
+        for row in rows:
+            self._append(row)
+        self._ready = True
+        log.info("exercise catalog index loaded: %d exercises", len(self._slots))
+
+    def subscribe(self, bus: InvalidationBus) -> None:
+        bus.subscribe(self._on_invalidate, self._on_reset)
+
+    def search(
+        self,
+        *,
+        q: str | None = None,
+        exercise_type_id: int | None = None,
+        level_id: int | None = None,
+        target_body_part_id: int | None = None,
+        equipment: str | None = None,
+        sort: SortField | None = None,
+        descending: bool = False,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[IndexedExercise], int] | None:
+        """The page and total ``list_exercises`` would return, or ``None`` when
+        the index can't answer it exactly."""
+        if not self.ready or (q and ("%" in q or "_" in q or "\\" in q)):
+            return None
+        if sort == SortField.NAME:
+            return None  # names order by the database collation, not by str
+        postings = [
+            self._postings[column].get(value, array("q"))
+            for column, value in (
+                (0, exercise_type_id),
+                (1, level_id),
+                (2, target_body_part_id),
+            )
+            if value is not None
+        ]
+        if equipment is not None:
+            postings.append(self._equipment_postings.get(equipment, array("q")))
+        needle = q.lower() if q else ""
+        if len(needle) >= _GRAM:
+            postings.extend(
+                self._grams.get(gram, array("q")) for gram in _grams(needle)
+            )
+        matches = self._intersect(postings)
+        if needle:
+            matches = [slot for slot in matches if needle in self._lower_names[slot]]
+        if sort is not None:
+            stamps = self._created if sort == SortField.CREATED_AT else self._updated
+            matches.sort(
+                key=lambda slot: (stamps[slot], self._ids[slot]), reverse=descending
+            )
+        elif not self._in_id_order:
+            matches.sort(key=self._ids.__getitem__, reverse=descending)
+        elif descending:
+            matches.reverse()
+        return [self._row(slot) for slot in matches[skip : skip + limit]], len(matches)
+
+    def _intersect(self, postings: list[array[int]]) -> list[int]:
+        if not postings:
+            return [slot for slot in range(len(self._ids)) if self._alive[slot]]
+        # Walk the shortest list, binary-searching the others for each slot.
+        shortest, *others = sorted(postings, key=len)
+        return [
+            slot
+            for slot in shortest
+            if self._alive[slot] and all(_contains(other, slot) for other in others)
+        ]
+
+    def _row(self, slot: int) -> IndexedExercise:
+        type_id, level_id, part_id = (self._facets[c][slot] for c in range(3))
+        return IndexedExercise(
+            id=self._ids[slot],
+            name=self._names[slot],
+            description=self._descriptions[slot],
+            equipment=self._equipment[slot],
+            created_at=self._created[slot],
+            updated_at=self._updated[slot],
+            owner_id=self._owners[slot],
+            exercise_type=Reference(
+                type_id, self._references["exercise_types"][type_id]
+            ),
+            level=Reference(level_id, self._references["levels"][level_id]),
+            target_body_part=Reference(
+                part_id, self._references["body_parts"][part_id]
+            ),
+        )
+
+    def _clear(self, references: dict[str, dict[int, str]] | None = None) -> None:
+        self._ids = array("q")
+        self._owners = array("q")
+        self._facets = (array("q"), array("q"), array("q"))
+        self._alive = bytearray()
+        self._names: list[str] = []
+        self._lower_names: list[str] = []
+        self._descriptions: list[str | None] = []
+        self._equipment: list[str | None] = []
+        self._created: list[datetime.datetime] = []
+        self._updated: list[datetime.datetime] = []
+        self._slots: dict[int, int] = {}
+        # Whether slot order is id order, the order of an unsorted page.
+        self._in_id_order = True
+        self._postings: tuple[dict[int, array[int]], ...] = ({}, {}, {})
+        self._equipment_postings: dict[str | None, array[int]] = {}
+        self._grams: dict[str, array[int]] = {}
+        self._references = references or {table: {} for table in _REFERENCES}
+
+    def _append(self, row: Sequence[Any]) -> None:
+        exercise_id, name, description, equipment, created, updated, owner, *facets = (
+            row
+        )
+        slot = len(self._ids)
+        if self._ids and exercise_id < self._ids[-1]:
+            self._in_id_order = False
+        self._ids.append(exercise_id)
+        self._owners.append(owner)
+        self._alive.append(1)
+        self._names.append(name)
+        self._lower_names.append(name.lower())
+        self._descriptions.append(description)
+        self._equipment.append(equipment)
+        self._equipment_postings.setdefault(equipment, array("q")).append(slot)
+        self._created.append(created)
+        self._updated.append(updated)
+        self._slots[exercise_id] = slot
+        for column, value in enumerate(facets):
+            self._facets[column].append(value)
+            self._postings[column].setdefault(value, array("q")).append(slot)
+        for gram in _grams(name.lower()):
+            self._grams.setdefault(gram, array("q")).append(slot)
+
+    def _remove(self, exercise_id: int) -> None:
+        slot = self._slots.pop(exercise_id, None)
+        if slot is not None:
+            self._alive[slot] = 0
+
+    def _upsert(self, row: Sequence[Any]) -> None:
+        slot = self._slots.get(row[0])
+        if slot is None:
+            self._append(row)
+        else:
+            self._update(slot, row)
+
+    def _update(self, slot: int, row: Sequence[Any]) -> None:
+        _, name, description, equipment, created, updated, owner, *facets = row
+        self._owners[slot] = owner
+        self._descriptions[slot] = description
+        self._created[slot] = created
+        self._updated[slot] = updated
+        if equipment != self._equipment[slot]:
+            _move(self._equipment_postings, self._equipment[slot], equipment, slot)
+            self._equipment[slot] = equipment
+        for column, value in enumerate(facets):
+            if value != self._facets[column][slot]:
+                _move(self._postings[column], self._facets[column][slot], value, slot)
+                self._facets[column][slot] = value
+        if name != self._names[slot]:
+            lower = name.lower()
+            old_grams, new_grams = _grams(self._lower_names[slot]), _grams(lower)
+            for gram in old_grams - new_grams:
+                _discard(self._grams, gram, slot)
+            for gram in new_grams - old_grams:
+                _add(self._grams, gram, slot)
+            self._names[slot] = name
+            self._lower_names[slot] = lower
+
+    def _compact(self) -> None:
+        live = sorted(
+            (
+                self._ids[slot],
+                self._names[slot],
+                self._descriptions[slot],
+                self._equipment[slot],
+                self._created[slot],
+                self._updated[slot],
+                self._owners[slot],
+                *(self._facets[c][slot] for c in range(3)),
+            )
+            for slot in self._slots.values()
+        )
+        self._clear(self._references)
+        for row in live:
+            self._append(row)
+
+    def _on_invalidate(self, invalidation: Invalidation) -> None:
+        if invalidation.table != "exercises" and invalidation.table not in _REFERENCES:
+            return
+        if self._session_factory is None:
+            return  # not loaded yet; loading reads the write anyway
+        self._pending.add((invalidation.table, invalidation.id))
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._apply_pending())
+
+    def _on_reset(self) -> None:
+        if self._session_factory is None:
+            return
+        self._ready = False
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._apply_pending())
+
+    async def _apply_pending(self) -> None:
+        try:
+            async with self._lock:
+                if not self._ready:
+                    await self._build()
+                while self._pending:
+                    batch = set(self._pending)
+                    await self._reread(batch)
+                    self._pending -= batch
+        except (DBAPIError, OSError):
+            # Serve from Postgres until the next write or reconnect retries.
+            log.exception("exercise catalog index refresh failed")
+            self._ready = False
+
+    async def _reread(self, written: Iterable[tuple[str, int]]) -> None:
+        assert self._session_factory is not None
+        by_table: dict[str, set[int]] = {}
+        for table, row_id in written:
+            by_table.setdefault(table, set()).add(row_id)
+        exercise_ids = by_table.pop("exercises", set())
+        async with self._session_factory() as session:
+            rows = (
+                (
+                    await session.execute(
+                        select(*_COLUMNS).where(Exercise.id.in_(exercise_ids))
+                    )
+                ).all()
+                if exercise_ids
+                else []
+            )
+            names = {
+                table: dict(
+                    (
+                        await session.execute(
+                            select(model.id, model.name).where(model.id.in_(row_ids))
+                        )
+                    )
+                    .tuples()
+                    .all()
+                )
+                for table, model in _REFERENCES.items()
+                if (row_ids := by_table.get(table))
+            }
+        for table, row_ids in by_table.items():
+            for row_id in row_ids:
+                if row_id in names[table]:
+                    self._references[table][row_id] = names[table][row_id]
+                else:
+                    self._references[table].pop(row_id, None)
+        for exercise_id in exercise_ids - {row[0] for row in rows}:
+            self._remove(exercise_id)
+        for row in sorted(rows):
+            self._upsert(row)
+        if len(self._ids) > 2 * max(len(self._slots), 1):
+            self._compact()
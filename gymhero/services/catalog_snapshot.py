@@ -0,0 +1,313 @@
+"""Versioned, memory-mapped snapshot of the exercise catalog, shared by workers.
+
+A worker that keeps the catalog in its own memory keeps one copy of it per
+worker. A snapshot file instead holds every exercise's ``ExerciseInDB`` JSON,
+serialized ahead of time, behind an index sorted by id. Workers map the file
+read-only, so the page cache holds a single copy for all of them. A lookup
+returns a ``memoryview`` into the mapping, and the response writes it out
+without copying it.
+
+Layout, in native byte order (checked on open)::
+
+    header   magic, format, byte-order mark, catalog version, built at (µs),
+             exercise count n, reference row count m
+    ids      int64 [n]      ascending
+    stamps   int64 [n]      each exercise's updated_at, µs since the epoch
+    offsets  int64 [n + 1]  fragment i is blob[offsets[i]:offsets[i + 1]]
+    refs     int64 [3m]     (table, id, updated_at µs) of each reference row
+    blob     the JSON fragments
+
+``write_snapshot`` writes next to the target and renames it into place. A
+reader therefore opens either the old file or the new one, never half of one.
+A mapping keeps its file alive after the rename, so responses still being
+written from the old version are unaffected by the swap.
+
+A snapshot is only as fresh as the rows it was built from.
+``CatalogSnapshotStore`` checks each row's ``updated_at`` against the database
+before it serves a snapshot, then follows the invalidation bus. An exercise
+written after that check is served from Postgres again. A written reference
+row retires the whole snapshot until the next build, because many fragments
+embed it.
+"""
+
+import asyncio
+import datetime
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from gymhero.database.invalidation import Invalidation, InvalidationBus
+from gymhero.log import get_logger
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+
+log = get_logger(__name__)
+
+_MAGIC = b"GHCS"
+_FORMAT = 1
+_BYTE_ORDER_MARK = 0x0102
+_HEADER = struct.Struct("=4sHHqqqq")
+# Reference tables by their code in the refs section.
+REFERENCE_MODELS: tuple[type[ExerciseType] | type[Level] | type[BodyPart], ...] = (
+    ExerciseType,
+    Level,
+    BodyPart,
+)
+REFERENCE_TABLES = tuple(model.__tablename__ for model in REFERENCE_MODELS)
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+# (st_dev, st_ino, st_size, st_mtime_ns): changes whenever the file is replaced.
+type FileIdentity = tuple[int, int, int, int]
+
+
+class SnapshotError(Exception):
+    """The file is not a snapshot this version of the app can read."""
+
+
+def micros(moment: datetime.datetime) -> int:
+    """``moment`` as whole microseconds since the epoch, exactly."""
+    return (moment - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _identity(stat: os.stat_result) -> FileIdentity:
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def write_snapshot(
+    path: Path,
+    *,
+    version: int,
+    exercises: Iterable[tuple[int, int, bytes]],
+    references: Iterable[tuple[str, int, int]],
+) -> int:
+    """Write ``(id, updated_at µs, JSON)`` exercises, in ascending id order, and
+    ``(table, id, updated_at µs)`` reference rows to ``path``, atomically.
+
+    Returns the number of exercises written.
+    """
+    ids, stamps, offsets = array("q"), array("q"), array("q", [0])
+    fragments: list[bytes] = []
+    for exercise_id, stamp, fragment in exercises:
+        if ids and exercise_id <= ids[-1]:
+            raise ValueError("exercises must be in ascending id order")
+        ids.append(exercise_id)
+        stamps.append(stamp)
+        fragments.append(fragment)
+        offsets.append(offsets[-1] + len(fragment))
+    refs = array("q")
+    for table, row_id, stamp in references:
+        refs.extend((REFERENCE_TABLES.index(table), row_id, stamp))
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT,
+        _BYTE_ORDER_MARK,
+        version,
+        micros(datetime.datetime.now(datetime.UTC)),
+        len(ids),
+        len(refs) // 3,
+    )
+    partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+    try:
+        with partial.open("wb") as f:
+            f.write(header)
+            for section in (ids, stamps, offsets, refs):
+                section.tofile(f)
+            f.writelines(fragments)
+            f.flush()
+            os.fsync(f.fileno())
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return len(ids)
+
+
+class CatalogSnapshot:
+    """A read-only mapping of one snapshot file."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self.identity = _identity(os.fstat(f.fileno()))
+            if self.identity[2] < _HEADER.size:
+                raise SnapshotError(f"{path} is too short to be a catalog snapshot")
+            # The mapping outlives the descriptor, and the file after a rename.
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, file_format, mark, self.version, built_at, count, refs = (
+            _HEADER.unpack_from(view)
+        )
+        if magic != _MAGIC or file_format != _FORMAT or mark != _BYTE_ORDER_MARK:
+            raise SnapshotError(f"{path} is not a format {_FORMAT} catalog snapshot")
+        self.built_at = _EPOCH + datetime.timedelta(microseconds=built_at)
+        sections = []
+        position = _HEADER.size
+        for length in (count, count, count + 1, 3 * refs):
+            end = position + 8 * length
+            if end > len(view):
+                raise SnapshotError(f"{path} is truncated")
+            sections.append(view[position:end].cast("q"))
+            position = end
+        self._ids, self._stamps, self._offsets, self._refs = sections
+        self._blob = view[position:]
+        if self._offsets[-1] != len(self._blob):
+            raise SnapshotError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def fragment(self, exercise_id: int) -> memoryview | None:
+        """The exercise's ``ExerciseInDB`` JSON, as a view into the mapping."""
+        i = bisect_left(self._ids, exercise_id)
+        if i == len(self._ids) or self._ids[i] != exercise_id:
+            return None
+        return self._blob[self._offsets[i] : self._offsets[i + 1]]
+
+    def exercise_stamps(self) -> Iterator[tuple[int, int]]:
+        return zip(self._ids, self._stamps, strict=True)
+
+    def reference_stamps(self) -> Iterator[tuple[str, int, int]]:
+        refs = self._refs
+        for i in range(0, len(refs), 3):
+            yield REFERENCE_TABLES[refs[i]], refs[i + 1], refs[i + 2]
+
+
+class CatalogSnapshotStore:
+    """The snapshot at ``path`` this worker serves, once checked against the
+    database, swapped for each new version written there."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._current: CatalogSnapshot | None = None
+        # Exercises written since the snapshot was built: served from Postgres.
+        self._written: set[int] = set()
+        # Exercises written while a new version is being checked.
+        self._checking: set[int] | None = None
+        self._reference_writes = 0
+        self._resets = 0
+        # A file found stale, not to be checked again until it is replaced.
+        self._rejected: FileIdentity | None = None
+
+    @property
+    def version(self) -> int | None:
+        return self._current.version if self._current is not None else None
+
+    def fragment(self, exercise_id: int) -> memoryview | None:
+        """The exercise's response body, or ``None`` to read it from Postgres."""
+        if self._current is None or exercise_id in self._written:
+            return None
+        return self._current.fragment(exercise_id)
+
+    def subscribe(self, bus: InvalidationBus) -> None:
+        bus.subscribe(self._on_invalidate, self._on_reset)
+
+    async def refresh(self, session_factory: async_sessionmaker[AsyncSession]) -> bool:
+        """Swap in the file at ``path`` if it is new; return whether it was."""
+        try:
+            identity = _identity(self.path.stat())
+        except FileNotFoundError:
+            return False
+        if identity == self._rejected or (
+            self._current is not None and self._current.identity == identity
+        ):
+            return False
+        start = time.perf_counter()
+        snapshot = CatalogSnapshot(self.path)
+        reference_writes, resets = self._reference_writes, self._resets
+        # Whatever is written from here on is either seen by the check below or
+        # collected here, so nothing slips between the two.
+        self._checking = set()
+        try:
+            stale = await self._stale_exercises(session_factory, snapshot)
+            written = self._checking
+        finally:
+            self._checking = None
+        if resets != self._resets:
+            return False  # writes may have been missed; check it again next time
+        if stale is None or reference_writes != self._reference_writes:
+            self._rejected = snapshot.identity
+            log.warning(
+                "catalog snapshot version %d is older than its reference rows; "
+                "rebuild it",
+                snapshot.version,
+            )
+            return False
+        self._current, self._written = snapshot, stale | written
+        log.info(
+            "catalog snapshot version %d swapped in: %d exercises, %d stale, in %.3fs",
+            snapshot.version,
+            len(snapshot),
+            len(self._written),
+            time.perf_counter() - start,
+        )
+        return True
+
+    async def watch(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        """Refresh every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh(session_factory)
+            except (SnapshotError, DBAPIError, OSError):
+                log.exception("catalog snapshot refresh failed")
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def _stale_exercises(
+        session_factory: async_sessionmaker[AsyncSession], snapshot: CatalogSnapshot
+    ) -> set[int] | None:
+        """Ids whose row changed since ``snapshot`` was built, or ``None`` if a
+        reference row did."""
+        async with session_factory() as session:
+            exercises = dict(
+                (await session.execute(select(Exercise.id, Exercise.updated_at)))
+                .tuples()
+                .all()
+            )
+            references = {
+                (model.__tablename__, row_id): updated_at
+                for model in REFERENCE_MODELS
+                for row_id, updated_at in (
+                    await session.execute(select(model.id, model.updated_at))
+                ).tuples()
+            }
+        for table, row_id, stamp in snapshot.reference_stamps():
+            updated_at = references.get((table, row_id))
+            if updated_at is None or micros(updated_at) != stamp:
+                return None
+        return {
+            exercise_id
+            for exercise_id, stamp in snapshot.exercise_stamps()
+            if (updated_at := exercises.get(exercise_id)) is None
+            or micros(updated_at) != stamp
+        }
+
+    def _on_invalidate(self, invalidation: Invalidation) -> None:
+        if invalidation.table == "exercises":
+            self._written.add(invalidation.id)
+            if self._checking is not None:
+                self._checking.add(invalidation.id)
+        elif invalidation.table in REFERENCE_TABLES:
+            self._reference_writes += 1
+            if self._current is not None:
+                log.warning(
+                    "catalog snapshot version %d retired by a %s write",
+                    self._current.version,
+                    invalidation.table,
+                )
+                self._rejected, self._current = self._current.identity, None
+
+    def _on_reset(self) -> None:
+        # Writes may have gone unseen: serve nothing until the next refresh has
+        # checked the file again.
+        self._resets += 1
+        self._current, self._rejected = None, None
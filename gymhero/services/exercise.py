@@ -1,34 +1,128 @@
 """Exercise use-cases."""
 
+from collections.abc import Sequence
+from typing import Any
+
 from sqlalchemy import ColumnExpressionArgument
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from gymhero.api.authorization import authorize_owner_or_superuser
 from gymhero.crud import exercise_crud
+from gymhero.crud.loader import get_loader
 from gymhero.exceptions import EntityConflictError, EntityNotFoundError
 from gymhero.models.exercise import Exercise
 from gymhero.models.user import User
+from gymhero.schemas.common import SortField
 from gymhero.schemas.exercise import ExerciseCreate, ExerciseUpdate
+from gymhero.services.catalog_index import ExerciseCatalogIndex, IndexedExercise
+
+# A catalog page embeds each exercise's type, level and target body part.
+CATALOG_CACHE_TAGS = frozenset(
+    {"exercise:*", "exercise_type:*", "level:*", "body_part:*"}
+)
 
 
 async def list_exercises(
     db: AsyncSession,
     *,
+    index: ExerciseCatalogIndex | None = None,
     owner_id: int | None = None,
     q: str | None = None,
     exercise_type_id: int | None = None,
     level_id: int | None = None,
     target_body_part_id: int | None = None,
+    equipment: str | None = None,
+    sort: SortField | None = None,
+    descending: bool = False,
     skip: int = 0,
     limit: int = 10,
-) -> tuple[list[Exercise], int]:
+    options: Sequence[ORMOption] = (),
+) -> tuple[Sequence[Exercise | IndexedExercise], int]:
     """Return a filtered page of exercises and the total matching the filters.
 
     ``owner_id`` scopes to a single owner (the "my" view); ``q`` does a
-    case-insensitive partial match on the name. All filters are optional and
-    additive — no filters means the full catalog.
+    case-insensitive partial match on the name; ``equipment`` matches exactly.
+    All filters are optional and additive — no filters means the full catalog.
+    The page is ordered by ``sort`` (by id when not given), id breaking ties.
+    Catalog-wide queries are answered from ``index`` when it can, without a
+    query.
     """
+    if index is not None and owner_id is None:
+        indexed = index.search(
+            q=q,
+            exercise_type_id=exercise_type_id,
+            level_id=level_id,
+            target_body_part_id=target_body_part_id,
+            equipment=equipment,
+            sort=sort,
+            descending=descending,
+            skip=skip,
+            limit=limit,
+        )
+        if indexed is not None:
+            return indexed
+    filters = _filters(
+        owner_id=owner_id,
+        q=q,
+        exercise_type_id=exercise_type_id,
+        level_id=level_id,
+        target_body_part_id=target_body_part_id,
+        equipment=equipment,
+    )
+    items = await exercise_crud.get_many(
+        db,
+        *filters,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        descending=descending,
+        options=options,
+    )
+    total = await exercise_crud.count(db, *filters)
+    return items, total
+
+
+async def count_exercise_facets(
+    db: AsyncSession,
+    *,
+    q: str | None = None,
+    exercise_type_id: int | None = None,
+    level_id: int | None = None,
+    target_body_part_id: int | None = None,
+    equipment: str | None = None,
+) -> dict[str, Any]:
+    """Catalog counts per type, level, body part and equipment under the
+    ``list_exercises`` filters, in one aggregate query."""
+    facets, total = await exercise_crud.count_facets(
+        db,
+        *_filters(
+            q=q,
+            exercise_type_id=exercise_type_id,
+            level_id=level_id,
+            target_body_part_id=target_body_part_id,
+            equipment=equipment,
+        ),
+    )
+    return {
+        "total": total,
+        **{
+            name: [{"value": value, "count": count} for value, count in counts]
+            for name, counts in facets.items()
+        },
+    }
+
+
+def _filters(
+    *,
+    owner_id: int | None = None,
+    q: str | None = None,
+    exercise_type_id: int | None = None,
+    level_id: int | None = None,
+    target_body_part_id: int | None = None,
+    equipment: str | None = None,
+) -> list[ColumnExpressionArgument[bool]]:
     filters: list[ColumnExpressionArgument[bool]] = []
     if owner_id is not None:
         filters.append(Exercise.owner_id == owner_id)
@@ -40,18 +134,29 @@ async def list_exercises(
         filters.append(Exercise.level_id == level_id)
     if target_body_part_id is not None:
         filters.append(Exercise.target_body_part_id == target_body_part_id)
-    items = await exercise_crud.get_many(db, *filters, skip=skip, limit=limit)
-    total = await exercise_crud.count(db, *filters)
-    return items, total
+    if equipment is not None:
+        filters.append(Exercise.equipment == equipment)
+    return filters
 
 
-async def get_exercise(db: AsyncSession, exercise_id: int) -> Exercise:
-    exercise = await exercise_crud.get_one(db, Exercise.id == exercise_id)
+async def get_exercise(
+    db: AsyncSession, exercise_id: int, options: Sequence[ORMOption] = ()
+) -> Exercise:
+    exercise = await exercise_crud.get_by_id(db, exercise_id, options)
     if exercise is None:
         raise EntityNotFoundError(f"Exercise with id {exercise_id} not found")
     return exercise
 
 
+async def get_exercises(
+    db: AsyncSession, ids: Sequence[int], options: Sequence[ORMOption] = ()
+) -> tuple[list[Exercise], list[int]]:
+    """The exercises among ``ids`` (in request order) and the ids not found."""
+    if options:
+        return await exercise_crud.get_by_ids(db, ids, options=options)
+    return await get_loader(db, exercise_crud).load_many(ids)
+
+
 async def get_exercise_by_name(db: AsyncSession, name: str) -> Exercise:
     exercise = await exercise_crud.get_one(db, Exercise.name == name)
     if exercise is None:
@@ -84,7 +189,7 @@ async def update_exercise(
 
 
 async def delete_exercise(db: AsyncSession, *, exercise_id: int, actor: User) -> None:
-    exercise = await exercise_crud.get_one(db, Exercise.id == exercise_id)
+    exercise = await exercise_crud.get_by_id(db, exercise_id)
     if exercise is None:
         raise EntityNotFoundError(
             f"Exercise with id {exercise_id} not found. Cannot delete."
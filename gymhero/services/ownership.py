@@ -1,9 +1,12 @@
 """Owner-scoped fetch shared by owner-private resources (training units/plans)."""
 
-from sqlalchemy import ColumnExpressionArgument
+from collections.abc import Sequence
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from gymhero.crud.base import CRUDRepository
+from gymhero.crud.loader import get_loader
 from gymhero.database.base_class import Base
 from gymhero.exceptions import EntityNotFoundError
 from gymhero.models.user import User
@@ -13,21 +16,60 @@ async def get_owned_or_404[ModelT: Base](
     db: AsyncSession,
     *,
     crud: CRUDRepository[ModelT],
-    model: type[ModelT],
     entity_id: int,
     actor: User,
     entity: str,
+    options: Sequence[ORMOption] = (),
 ) -> ModelT:
     """Fetch an owner-private resource the actor may access, else 404.
 
     Non-owners get 404 (not 403) so the API never reveals that a resource they
-    cannot access exists. Superusers are unscoped and see everything.
+    cannot access exists. Superusers are unscoped and see everything. The
+    lookup goes through the identity map, so fetching the same resource again
+    within a request costs no query.
     """
-    # `model.id`/`model.owner_id` are mapped columns resolved at runtime (no SA plugin).
-    filters: list[ColumnExpressionArgument[bool]] = [model.id == entity_id]  # type: ignore[attr-defined]
-    if not actor.is_superuser:
-        filters.append(model.owner_id == actor.id)  # type: ignore[attr-defined]
-    obj = await crud.get_one(db, *filters)
-    if obj is None:
+    obj = await crud.get_by_id(db, entity_id, options)
+    if obj is None or not _may_access(obj, actor):
         raise EntityNotFoundError(f"{entity} with id {entity_id} not found")
     return obj
+
+
+async def get_owned_many[ModelT: Base](
+    db: AsyncSession,
+    *,
+    crud: CRUDRepository[ModelT],
+    ids: Sequence[int],
+    actor: User,
+    options: Sequence[ORMOption] = (),
+) -> tuple[list[ModelT], list[int]]:
+    """Batch form of ``get_owned_or_404``: the accessible resources among ``ids``
+    plus the missing ids, which don't fail the batch.
+
+    As with the 404, an id the actor may not access is reported missing exactly
+    like one that does not exist. Batched through the request's loader, unless
+    ``options`` shape the query.
+    """
+    found, _ = await (
+        crud.get_by_ids(db, ids, options=options)
+        if options
+        else get_loader(db, crud).load_many(ids)
+    )
+    accessible = {obj.id: obj for obj in found if _may_access(obj, actor)}  # type: ignore[attr-defined]
+    return (
+        [accessible[i] for i in ids if i in accessible],
+        [i for i in ids if i not in accessible],
+    )
+
+
+def owner_scope(actor: User) -> str:
+    """The slice of owner-private resources ``actor`` may access, as a cache scope.
+
+    Anything cached from a lookup authorized here must be keyed by it: an entry
+    then only ever serves callers who would pass the same check.
+    """
+    return "all" if actor.is_superuser else f"user:{actor.id}"
+
+
+def _may_access(obj: Base, actor: User) -> bool:
+    # `owner_id` is a mapped column resolved at runtime (no SA plugin).
+    return bool(actor.is_superuser) or obj.owner_id == actor.id  # type: ignore[attr-defined]
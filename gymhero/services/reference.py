@@ -24,8 +24,7 @@ async def get_by_id_or_404[ModelT: Base](
     entity: str,
     not_found_suffix: str = "",
 ) -> ModelT:
-    # `model.id` is a mapped column resolved at runtime (no static SA plugin here).
-    obj = await crud.get_one(db, model.id == entity_id)  # type: ignore[attr-defined]
+    obj = await crud.get_by_id(db, entity_id)
     if obj is None:
         raise EntityNotFoundError(
             f"{entity} with id {entity_id} not found{not_found_suffix}"
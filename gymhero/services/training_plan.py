@@ -1,15 +1,20 @@
 """Training-plan use-cases."""
 
+from collections.abc import Sequence
+
 from sqlalchemy import ColumnExpressionArgument
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from gymhero.crud import training_plan_crud, training_unit_crud
 from gymhero.exceptions import EntityConflictError, EntityNotFoundError
 from gymhero.models.training_plan import TrainingPlan
 from gymhero.models.training_unit import TrainingUnit
 from gymhero.models.user import User
+from gymhero.schemas.common import SortField
 from gymhero.schemas.training_plan import TrainingPlanCreate, TrainingPlanUpdate
-from gymhero.services.ownership import get_owned_or_404
+from gymhero.services import training_unit as training_unit_service
+from gymhero.services.ownership import get_owned_many, get_owned_or_404
 
 
 async def list_training_plans(
@@ -17,24 +22,59 @@ async def list_training_plans(
     *,
     owner_id: int | None = None,
     q: str | None = None,
+    sort: SortField | None = None,
+    descending: bool = False,
     skip: int = 0,
     limit: int = 10,
+    options: Sequence[ORMOption] = (),
 ) -> tuple[list[TrainingPlan], int]:
-    """Return a filtered page of training plans and the total matching."""
+    """Return a filtered, sorted page of training plans and the total matching."""
     filters: list[ColumnExpressionArgument[bool]] = []
     if owner_id is not None:
         filters.append(TrainingPlan.owner_id == owner_id)
     if q:
         filters.append(TrainingPlan.name.ilike(f"%{q}%"))
-    items = await training_plan_crud.get_many(db, *filters, skip=skip, limit=limit)
+    items = await training_plan_crud.get_many(
+        db,
+        *filters,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        descending=descending,
+        options=options,
+    )
     total = await training_plan_crud.count(db, *filters)
     return items, total
 
 
 async def get_training_plan(
-    db: AsyncSession, *, training_plan_id: int, actor: User
+    db: AsyncSession,
+    *,
+    training_plan_id: int,
+    actor: User,
+    options: Sequence[ORMOption] = (),
 ) -> TrainingPlan:
-    return await _get_owned_or_404(db, training_plan_id, actor)
+    return await _get_owned_or_404(db, training_plan_id, actor, options)
+
+
+def cache_tags(plan: TrainingPlan) -> set[str]:
+    """Everything a plan's detail is built from, as ``gymhero.cache`` tags."""
+    tags = {f"training_plan:{plan.id}", f"user:{plan.owner_id}"}
+    for unit in plan.training_units:
+        tags |= training_unit_service.cache_tags(unit)
+    return tags
+
+
+async def get_training_plans(
+    db: AsyncSession,
+    *,
+    ids: Sequence[int],
+    actor: User,
+    options: Sequence[ORMOption] = (),
+) -> tuple[list[TrainingPlan], list[int]]:
+    return await get_owned_many(
+        db, crud=training_plan_crud, ids=ids, actor=actor, options=options
+    )
 
 
 async def get_training_plan_by_name(
@@ -115,15 +155,18 @@ async def get_training_units(
 
 
 async def _get_owned_or_404(
-    db: AsyncSession, training_plan_id: int, actor: User
+    db: AsyncSession,
+    training_plan_id: int,
+    actor: User,
+    options: Sequence[ORMOption] = (),
 ) -> TrainingPlan:
     return await get_owned_or_404(
         db,
         crud=training_plan_crud,
-        model=TrainingPlan,
         entity_id=training_plan_id,
         actor=actor,
         entity="Training plan",
+        options=options,
     )
 
 
@@ -135,7 +178,6 @@ async def _get_unit_or_404(
     return await get_owned_or_404(
         db,
         crud=training_unit_crud,
-        model=TrainingUnit,
         entity_id=training_unit_id,
         actor=actor,
         entity="Training unit",
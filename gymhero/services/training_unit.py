@@ -1,19 +1,23 @@
 """Training-unit use-cases."""
 
+from collections.abc import Sequence
+
 from sqlalchemy import ColumnExpressionArgument
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from gymhero.crud import exercise_crud, training_unit_crud
 from gymhero.exceptions import EntityConflictError, EntityNotFoundError
 from gymhero.models.exercise import Exercise
 from gymhero.models.training_unit import TrainingUnit, TrainingUnitExercise
 from gymhero.models.user import User
+from gymhero.schemas.common import SortField
 from gymhero.schemas.training_unit import (
     PrescriptionUpdate,
     TrainingUnitCreate,
     TrainingUnitUpdate,
 )
-from gymhero.services.ownership import get_owned_or_404
+from gymhero.services.ownership import get_owned_many, get_owned_or_404
 
 
 async def list_training_units(
@@ -21,24 +25,61 @@ async def list_training_units(
     *,
     owner_id: int | None = None,
     q: str | None = None,
+    sort: SortField | None = None,
+    descending: bool = False,
     skip: int = 0,
     limit: int = 10,
+    options: Sequence[ORMOption] = (),
 ) -> tuple[list[TrainingUnit], int]:
-    """Return a filtered page of training units and the total matching."""
+    """Return a filtered, sorted page of training units and the total matching."""
     filters: list[ColumnExpressionArgument[bool]] = []
     if owner_id is not None:
         filters.append(TrainingUnit.owner_id == owner_id)
     if q:
         filters.append(TrainingUnit.name.ilike(f"%{q}%"))
-    items = await training_unit_crud.get_many(db, *filters, skip=skip, limit=limit)
+    items = await training_unit_crud.get_many(
+        db,
+        *filters,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        descending=descending,
+        options=options,
+    )
     total = await training_unit_crud.count(db, *filters)
     return items, total
 
 
 async def get_training_unit(
-    db: AsyncSession, *, training_unit_id: int, actor: User
+    db: AsyncSession,
+    *,
+    training_unit_id: int,
+    actor: User,
+    options: Sequence[ORMOption] = (),
 ) -> TrainingUnit:
-    return await _get_owned_or_404(db, training_unit_id, actor)
+    return await _get_owned_or_404(db, training_unit_id, actor, options)
+
+
+def cache_tags(unit: TrainingUnit) -> set[str]:
+    """Everything a unit's detail is built from, as ``gymhero.cache`` tags."""
+    tags = {f"training_unit:{unit.id}", f"user:{unit.owner_id}"}
+    for link in unit.exercises:
+        tags.add(f"training_unit_exercise:{link.id}")
+        tags.add(f"exercise:{link.exercise_id}")
+        tags.update(f"prescribed_set:{prescribed.id}" for prescribed in link.sets)
+    return tags
+
+
+async def get_training_units(
+    db: AsyncSession,
+    *,
+    ids: Sequence[int],
+    actor: User,
+    options: Sequence[ORMOption] = (),
+) -> tuple[list[TrainingUnit], list[int]]:
+    return await get_owned_many(
+        db, crud=training_unit_crud, ids=ids, actor=actor, options=options
+    )
 
 
 async def get_training_unit_by_name(
@@ -135,20 +176,23 @@ async def get_exercises(
 
 
 async def _get_owned_or_404(
-    db: AsyncSession, training_unit_id: int, actor: User
+    db: AsyncSession,
+    training_unit_id: int,
+    actor: User,
+    options: Sequence[ORMOption] = (),
 ) -> TrainingUnit:
     return await get_owned_or_404(
         db,
         crud=training_unit_crud,
-        model=TrainingUnit,
         entity_id=training_unit_id,
         actor=actor,
         entity="Training unit",
+        options=options,
     )
 
 
 async def _get_exercise_or_404(db: AsyncSession, exercise_id: int) -> Exercise:
-    exercise = await exercise_crud.get_one(db, Exercise.id == exercise_id)
+    exercise = await exercise_crud.get_by_id(db, exercise_id)
     if exercise is None:
         raise EntityNotFoundError(f"Exercise with id {exercise_id} not found")
     return exercise
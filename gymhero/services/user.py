@@ -17,7 +17,7 @@ from gymhero.security import get_password_hash
 async def get_user(
     db: AsyncSession, *, user_id: int, not_found_suffix: str = ""
 ) -> User:
-    user = await user_crud.get_one(db, User.id == user_id)
+    user = await user_crud.get_by_id(db, user_id)
     if user is None:
         raise EntityNotFoundError(f"User with id {user_id} not found{not_found_suffix}")
     return user
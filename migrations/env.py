@@ -23,10 +23,20 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
+from gymhero.database.migrations import (
+    MigrationPolicy,
+    retry_on_lock_timeout,
+    set_timeouts,
+)
 from gymhero.models import Base
 
 target_metadata = Base.metadata
 
+# MIGRATION_MODE / `-x mode=zero-downtime`: see gymhero.database.migrations.
+policy = MigrationPolicy.from_env(
+    os.environ, context.get_x_argument(as_dictionary=True)
+)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -68,9 +78,14 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=policy.zero_downtime,
+        migration_policy=policy,
     )
 
     with context.begin_transaction():
+        if policy.zero_downtime:
+            context.execute(f"SET lock_timeout = {policy.lock_timeout_ms}")
+            context.execute(f"SET statement_timeout = {policy.statement_timeout_ms}")
         context.run_migrations()
 
 
@@ -87,11 +102,26 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+    def run() -> None:
+        with connectable.connect() as connection:
+            if policy.zero_downtime:
+                set_timeouts(connection, policy)
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                # Zero-downtime: commit each revision on its own, so locks are
+                # held briefly and a retry resumes from the last one applied.
+                transaction_per_migration=policy.zero_downtime,
+                migration_policy=policy,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+
+    if policy.zero_downtime:
+        retry_on_lock_timeout(run, policy, what="migration")
+    else:
+        run()
 
 
 if context.is_offline_mode():
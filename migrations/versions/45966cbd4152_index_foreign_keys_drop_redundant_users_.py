@@ -0,0 +1,66 @@
+"""index foreign keys, drop redundant users id index
+
+Revision ID: 45966cbd4152
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 14:12:08.184751
+
+Generated by ``python -m scripts.audit_indexes``. CREATE/DROP INDEX
+CONCURRENTLY cannot run inside a transaction, so the statements run in an
+autocommit block and take no lock that blocks writes. A failed concurrent build
+leaves an INVALID index behind: drop it before re-running.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "45966cbd4152"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "training_plan_training_unit_training_unit_id_idx",
+            "training_plan_training_unit",
+            ["training_unit_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "training_unit_exercise_exercise_id_idx",
+            "training_unit_exercise",
+            ["exercise_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "users_id_idx",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "users_id_idx",
+            "users",
+            ["id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "training_unit_exercise_exercise_id_idx",
+            table_name="training_unit_exercise",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "training_plan_training_unit_training_unit_id_idx",
+            table_name="training_plan_training_unit",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,36 @@
+"""add exercises.equipment, indexed as a catalog facet
+
+Revision ID: a7b8c9d0e1f2
+Revises: 45966cbd4152
+Create Date: 2026-10-19 18:40:00.000000
+
+The column is nullable, so adding it does not rewrite the table; the next
+catalog sync (``python -m scripts.seed``) fills it in from the CSV. The index is
+built CONCURRENTLY, outside the revision's transaction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from gymhero.database.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "45966cbd4152"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("exercises", sa.Column("equipment", sa.String(), nullable=True))
+    create_index_concurrently("exercises_equipment_idx", "exercises", ["equipment"])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("exercises_equipment_idx", "exercises")
+    op.drop_column("exercises", "equipment")
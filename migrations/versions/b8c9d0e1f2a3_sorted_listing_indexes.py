@@ -0,0 +1,52 @@
+"""composite indexes for sorted listings, replacing the owner_id indexes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 20:05:00.000000
+
+Each index ends in ``id``, the tie-breaker of every sorted page, so a page is
+read in index order. The ``(owner_id, ...)`` ones lead with owner_id and make
+the plain owner_id indexes redundant; those are dropped once their
+replacements exist. Everything is built and dropped CONCURRENTLY, outside the
+revision's transaction.
+"""
+from typing import Sequence, Union
+
+from gymhero.database.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OWNED_TABLES = ("exercises", "training_units", "training_plans")
+SORT_COLUMNS = ("name", "created_at", "updated_at")
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        "exercises_created_at_id_idx", "exercises", ["created_at", "id"]
+    )
+    create_index_concurrently(
+        "exercises_updated_at_id_idx", "exercises", ["updated_at", "id"]
+    )
+    for table in OWNED_TABLES:
+        for column in SORT_COLUMNS:
+            create_index_concurrently(
+                f"{table}_owner_id_{column}_id_idx", table, ["owner_id", column, "id"]
+            )
+        drop_index_concurrently(f"{table}_owner_id_idx", table)
+
+
+def downgrade() -> None:
+    for table in OWNED_TABLES:
+        create_index_concurrently(f"{table}_owner_id_idx", table, ["owner_id"])
+        for column in SORT_COLUMNS:
+            drop_index_concurrently(f"{table}_owner_id_{column}_id_idx", table)
+    drop_index_concurrently("exercises_updated_at_id_idx", "exercises")
+    drop_index_concurrently("exercises_created_at_id_idx", "exercises")
@@ -0,0 +1,52 @@
+import sys
+from argparse import ArgumentParser
+
+from gymhero.config import get_settings
+from gymhero.database.db import get_ctx_db
+from gymhero.log import get_logger
+from gymhero.models import Base
+from scripts.core.indexes import audit, declared_schema, live_schema, write_migration
+
+log = get_logger(__name__)
+
+
+def build_argparser() -> ArgumentParser:
+    parser = ArgumentParser(
+        description="Report unindexed foreign keys and redundant indexes."
+    )
+    parser.add_argument(
+        "--env",
+        default="dev",
+        choices=["dev", "test"],
+        help="Database to introspect.",
+    )
+    parser.add_argument(
+        "--models-only",
+        action="store_true",
+        help="Audit Base.metadata only, without connecting to the database.",
+    )
+    parser.add_argument(
+        "--write-migration",
+        metavar="MESSAGE",
+        help="Write an Alembic revision fixing the database's findings.",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_argparser()
+    args = parser.parse_args()
+    if args.models_only and args.write_migration:
+        parser.error("--write-migration needs the database")
+    results = {"models": audit(*declared_schema(Base.metadata))}
+    if not args.models_only:
+        with get_ctx_db(get_settings(args.env).database_url) as session:
+            results["database"] = audit(*live_schema(session))
+
+    for source, result in results.items():
+        for line in result.report():
+            print(f"{source}: {line}")
+    if args.write_migration and not results["database"].clean:
+        path = write_migration(results["database"], args.write_migration)
+        log.info("Wrote %s", path)
+    sys.exit(0 if all(result.clean for result in results.values()) else 1)
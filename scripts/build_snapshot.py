@@ -0,0 +1,35 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from gymhero.config import get_settings
+from gymhero.database.db import get_ctx_db
+from scripts.core.snapshot import build_snapshot
+
+
+def build_argparser() -> ArgumentParser:
+    parser = ArgumentParser(
+        description="Compile the exercise catalog into a memory-mappable snapshot."
+    )
+    parser.add_argument(
+        "--env",
+        default="dev",
+        choices=["dev", "test"],
+        help="Database to read the catalog from.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Snapshot file to write (default: CATALOG_SNAPSHOT_PATH).",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_argparser()
+    args = parser.parse_args()
+    settings = get_settings(args.env)
+    output = args.output or settings.CATALOG_SNAPSHOT_PATH
+    if not output:
+        parser.error("--output is required when CATALOG_SNAPSHOT_PATH is not set")
+    with get_ctx_db(settings.database_url) as session:
+        build_snapshot(session, Path(output))
@@ -0,0 +1,129 @@
+"""COPY-based staging of the exercise catalog.
+
+Rows stream from the CSV into a temporary staging table in fixed-size ``COPY``
+chunks, from which ``scripts.core.sync`` merges them into the real tables with
+set-based statements. Nothing is sent as bind parameters, so catalog size is
+not capped by Postgres's parameter limit, and memory stays bounded by a chunk.
+"""
+
+import csv
+import io
+import itertools
+from collections.abc import Iterable
+
+from sqlalchemy import column, or_, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from gymhero.log import get_logger
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import ExerciseType
+from gymhero.models.level import Level
+from scripts.core.resources import ExerciseRow
+
+log = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Staging column -> CSV header it is copied from.
+_STAGED_COLUMNS = {
+    "name": "Title",
+    "description": "Desc",
+    "exercise_type": "Type",
+    "body_part": "BodyPart",
+    "level": "Level",
+    "equipment": "Equipment",
+}
+
+staging = table(
+    "exercise_staging", column("seq"), *(column(c) for c in _STAGED_COLUMNS)
+)
+
+
+def create_staging_table(session: Session) -> None:
+    # TEMP + ON COMMIT DROP: private to this connection, gone with the transaction.
+    # `seq` keeps file order so "first occurrence wins" survives the set-based merge.
+    columns = ", ".join(f"{c} text" for c in _STAGED_COLUMNS)
+    session.execute(
+        text(
+            f"CREATE TEMP TABLE {staging.name} (seq bigserial, {columns}) "
+            "ON COMMIT DROP"
+        )
+    )
+
+
+def copy_csv(
+    session: Session, table_name: str, columns: Iterable[str], buffer: io.StringIO
+) -> None:
+    """``COPY`` CSV ``buffer`` (read from the start) into ``table_name``."""
+    buffer.seek(0)
+    cursor = session.connection().connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def copy_rows(
+    session: Session,
+    rows: Iterable[ExerciseRow],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """``COPY`` ``rows`` into the staging table ``chunk_size`` at a time."""
+    headers = list(_STAGED_COLUMNS.values())
+    staged = 0
+    for chunk in itertools.batched(rows, chunk_size, strict=False):
+        buffer = io.StringIO()
+        # None is written as an unquoted empty field, which COPY reads as NULL.
+        csv.writer(buffer, lineterminator="\n").writerows(
+            # .get: older CSVs have no Equipment column.
+            [row.get(h) for h in headers]
+            for row in chunk
+        )
+        copy_csv(session, staging.name, _STAGED_COLUMNS, buffer)
+        staged += len(chunk)
+        log.debug("Staged %d rows", staged)
+    return staged
+
+
+def merge_reference_catalog(session: Session) -> None:
+    """Ensure every level, body part and exercise type named in staging exists."""
+    for model, source in (
+        (Level, staging.c.level),
+        (BodyPart, staging.c.body_part),
+        (ExerciseType, staging.c.exercise_type),
+    ):
+        session.execute(
+            pg_insert(model)
+            .from_select(["name"], select(source).distinct().where(source.is_not(None)))
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+
+
+def check_references(session: Session) -> None:
+    """Raise ``ValueError`` naming the staged exercises (first row per name)
+    whose level, exercise type or body part is missing, rather than let a merge
+    skip them."""
+    first_seen = (
+        select(staging)
+        .distinct(staging.c.name)
+        .where(staging.c.name.is_not(None))
+        .order_by(staging.c.name, staging.c.seq)
+        .subquery()
+    )
+    unresolved = session.scalars(
+        select(first_seen.c.name)
+        .outerjoin(BodyPart, BodyPart.name == first_seen.c.body_part)
+        .outerjoin(ExerciseType, ExerciseType.name == first_seen.c.exercise_type)
+        .outerjoin(Level, Level.name == first_seen.c.level)
+        .where(
+            or_(BodyPart.id.is_(None), ExerciseType.id.is_(None), Level.id.is_(None))
+        )
+        .order_by(first_seen.c.seq)
+    ).all()
+    if unresolved:
+        shown = ", ".join(repr(name) for name in unresolved[:10])
+        more = f" and {len(unresolved) - 10} more" if len(unresolved) > 10 else ""
+        raise ValueError(
+            f"{len(unresolved)} rows have no level, type or body part: {shown}{more}"
+        )
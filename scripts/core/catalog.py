@@ -4,9 +4,8 @@ from sqlalchemy.orm import Session
 
 from gymhero.log import get_logger
 from gymhero.models.body_part import BodyPart
-from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.exercise import ExerciseType
 from gymhero.models.level import Level
-from scripts.core.resources import ExerciseRow
 
 log = get_logger(__name__)
 
@@ -54,34 +53,3 @@ def create_exercise_types(session: Session, names: list[str]) -> list[ExerciseTy
     )
     log.debug("Ensured %d exercise types", len(exercise_types))
     return exercise_types
-
-
-def create_exercises(
-    session: Session,
-    rows: list[ExerciseRow],
-    body_part_ids: dict[str, int],
-    level_ids: dict[str, int],
-    exercise_type_ids: dict[str, int],
-    owner_id: int,
-) -> None:
-    if not rows:
-        return
-    session.execute(
-        pg_insert(Exercise)
-        .values(
-            [
-                {
-                    "name": row["Title"],
-                    "description": row["Desc"],
-                    "target_body_part_id": body_part_ids[row["BodyPart"]],
-                    "exercise_type_id": exercise_type_ids[row["Type"]],
-                    "level_id": level_ids[row["Level"]],
-                    "owner_id": owner_id,
-                }
-                for row in rows
-            ]
-        )
-        .on_conflict_do_nothing(index_elements=["name"])
-    )
-    session.commit()
-    log.debug("Ensured %d exercises", len(rows))
@@ -0,0 +1,339 @@
+"""Audit the schema for unindexed foreign keys and redundant indexes.
+
+Two sources feed the same audit: the models (``Base.metadata``) — what
+autogenerate would build — and the live Postgres catalog, which is what the
+database actually maintains on every write.
+
+* A foreign key is *unindexed* when no usable index leads with its columns:
+  deleting (or re-keying) a parent row then scans the child table to enforce
+  the constraint, and joins from the parent side cannot use an index.
+* An index is *redundant* when another index on the same table leads with the
+  same columns and enforces at least as much (a primary key covers a plain
+  index on ``id``; ``(a, b)`` covers ``(a)``). It buys nothing for reads and is
+  still written on every insert and update.
+
+Only plain btree indexes count: partial, expression, invalid or non-btree
+indexes neither cover a foreign key nor make another index redundant.
+``render_migration`` turns a live audit into an Alembic revision that builds
+and drops indexes ``CONCURRENTLY`` (``gymhero.database.migrations``).
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import MetaData, PrimaryKeyConstraint, UniqueConstraint, text
+from sqlalchemy.orm import Session
+
+MIGRATIONS_DIR = Path(__file__).parents[2] / "migrations"
+
+
+@dataclass(frozen=True)
+class IndexInfo:
+    table: str
+    name: str
+    columns: tuple[str, ...]
+    unique: bool = False
+    # Backs a primary key or unique constraint: dropping it drops the constraint.
+    constraint: bool = False
+    # Plain btree on columns, non-partial and valid.
+    usable: bool = True
+
+
+@dataclass(frozen=True)
+class ForeignKeyInfo:
+    table: str
+    name: str
+    columns: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MissingIndex:
+    foreign_key: ForeignKeyInfo
+
+    @property
+    def name(self) -> str:
+        # Same name the models' naming convention gives ``index=True``.
+        return f"{self.foreign_key.table}_{self.foreign_key.columns[0]}_idx"
+
+
+@dataclass(frozen=True)
+class RedundantIndex:
+    index: IndexInfo
+    covered_by: IndexInfo
+
+
+@dataclass
+class Audit:
+    missing: list[MissingIndex] = field(default_factory=list)
+    redundant: list[RedundantIndex] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.missing or self.redundant)
+
+    def report(self) -> list[str]:
+        lines = [
+            f"unindexed foreign key {m.foreign_key.table}"
+            f"({', '.join(m.foreign_key.columns)}) [{m.foreign_key.name}]"
+            for m in self.missing
+        ]
+        lines += [
+            f"redundant index {r.index.name} on {r.index.table}"
+            f"({', '.join(r.index.columns)}), covered by {r.covered_by.name}"
+            for r in self.redundant
+        ]
+        return lines
+
+
+def declared_schema(
+    metadata: MetaData,
+) -> tuple[list[IndexInfo], list[ForeignKeyInfo]]:
+    """Indexes and foreign keys the models declare."""
+    indexes: list[IndexInfo] = []
+    foreign_keys: list[ForeignKeyInfo] = []
+    for table in metadata.sorted_tables:
+        for constraint in table.constraints:
+            if isinstance(constraint, PrimaryKeyConstraint | UniqueConstraint):
+                indexes.append(
+                    IndexInfo(
+                        table.name,
+                        str(constraint.name),
+                        tuple(c.name for c in constraint.columns),
+                        unique=True,
+                        constraint=True,
+                    )
+                )
+        for index in table.indexes:
+            columns = tuple(getattr(e, "name", "") for e in index.expressions)
+            indexes.append(
+                IndexInfo(
+                    table.name,
+                    str(index.name),
+                    columns,
+                    unique=bool(index.unique),
+                    usable=all(columns)
+                    and index.dialect_options["postgresql"]["where"] is None,
+                )
+            )
+        for fk in table.foreign_key_constraints:
+            foreign_keys.append(
+                ForeignKeyInfo(
+                    table.name, str(fk.name), tuple(c.name for c in fk.columns)
+                )
+            )
+    return indexes, foreign_keys
+
+
+# Key columns only (INCLUDE columns don't lead a scan); expression entries
+# (attnum 0) come back NULL and make the index unusable for the audit.
+_LIVE_INDEXES = text("""
+SELECT t.relname AS table_name,
+       i.relname AS index_name,
+       ARRAY(
+           SELECT a.attname::text
+           FROM unnest(x.indkey) WITH ORDINALITY AS k(attnum, ord)
+           LEFT JOIN pg_attribute a
+               ON a.attrelid = x.indrelid AND a.attnum = k.attnum
+           WHERE k.ord <= x.indnkeyatts
+           ORDER BY k.ord
+       ) AS columns,
+       x.indisunique AS is_unique,
+       EXISTS (
+           SELECT 1 FROM pg_constraint c
+           WHERE c.conindid = x.indexrelid AND c.contype IN ('p', 'u', 'x')
+       ) AS is_constraint,
+       am.amname = 'btree'
+           AND x.indpred IS NULL
+           AND x.indexprs IS NULL
+           AND x.indisvalid AS usable
+FROM pg_index x
+JOIN pg_class i ON i.oid = x.indexrelid
+JOIN pg_class t ON t.oid = x.indrelid
+JOIN pg_am am ON am.oid = i.relam
+WHERE t.relnamespace = current_schema()::regnamespace
+ORDER BY t.relname, i.relname
+""")
+
+_LIVE_FOREIGN_KEYS = text("""
+SELECT t.relname AS table_name,
+       c.conname AS constraint_name,
+       ARRAY(
+           SELECT a.attname::text
+           FROM unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+           JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+           ORDER BY k.ord
+       ) AS columns
+FROM pg_constraint c
+JOIN pg_class t ON t.oid = c.conrelid
+WHERE c.contype = 'f' AND t.relnamespace = current_schema()::regnamespace
+ORDER BY t.relname, c.conname
+""")
+
+
+def live_schema(session: Session) -> tuple[list[IndexInfo], list[ForeignKeyInfo]]:
+    """Indexes and foreign keys the connected database actually has."""
+    indexes = [
+        IndexInfo(
+            row.table_name,
+            row.index_name,
+            tuple(c or "" for c in row.columns),
+            unique=row.is_unique,
+            constraint=row.is_constraint,
+            usable=row.usable and all(row.columns),
+        )
+        for row in session.execute(_LIVE_INDEXES)
+    ]
+    foreign_keys = [
+        ForeignKeyInfo(row.table_name, row.constraint_name, tuple(row.columns))
+        for row in session.execute(_LIVE_FOREIGN_KEYS)
+    ]
+    return indexes, foreign_keys
+
+
+def _strength(index: IndexInfo) -> tuple[bool, bool]:
+    return index.constraint, index.unique
+
+
+def _covered_by(index: IndexInfo, other: IndexInfo) -> bool:
+    if other.columns[: len(index.columns)] != index.columns:
+        return False
+    if len(other.columns) > len(index.columns):
+        # A unique prefix enforces something the wider index does not.
+        return not index.unique
+    if index.unique and not other.unique:
+        return False
+    # Identical keys: keep the stronger one; on a tie, the first by name.
+    return (_strength(other), index.name) > (_strength(index), other.name)
+
+
+def audit(indexes: list[IndexInfo], foreign_keys: list[ForeignKeyInfo]) -> Audit:
+    usable: dict[str, list[IndexInfo]] = {}
+    for index in indexes:
+        if index.usable:
+            usable.setdefault(index.table, []).append(index)
+
+    result = Audit()
+    for fk in foreign_keys:
+        width = len(fk.columns)
+        if not any(
+            set(index.columns[:width]) == set(fk.columns)
+            for index in usable.get(fk.table, [])
+        ):
+            result.missing.append(MissingIndex(fk))
+    for table_indexes in usable.values():
+        for index in table_indexes:
+            if index.constraint:
+                continue
+            covering = next(
+                (
+                    other
+                    for other in table_indexes
+                    if other is not index and _covered_by(index, other)
+                ),
+                None,
+            )
+            if covering is not None:
+                result.redundant.append(RedundantIndex(index, covering))
+    return result
+
+
+_MIGRATION = '''"""{message}
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {create_date}
+
+Generated by ``python -m scripts.audit_indexes``. Indexes are built and dropped
+CONCURRENTLY, outside the revision's transaction, so writes are never blocked;
+the helpers are safe to re-run after a failed build.
+"""
+from typing import Sequence, Union
+
+from gymhero.database.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "{revision}"
+down_revision: Union[str, None] = "{down_revision}"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+{upgrades}
+
+
+def downgrade() -> None:
+{downgrades}
+'''
+
+
+def _create(name: str, table: str, columns: tuple[str, ...], unique: bool) -> str:
+    return (
+        "    create_index_concurrently(\n"
+        f'        "{name}",\n'
+        f'        "{table}",\n'
+        f"        {json.dumps(list(columns))},\n"
+        + ("        unique=True,\n" if unique else "")
+        + "    )"
+    )
+
+
+def _drop(name: str, table: str) -> str:
+    return f'    drop_index_concurrently(\n        "{name}",\n        "{table}",\n    )'
+
+
+def render_migration(
+    result: Audit,
+    *,
+    message: str,
+    revision: str,
+    down_revision: str,
+    create_date: datetime,
+) -> str:
+    """Alembic revision adding the missing indexes and dropping redundant ones."""
+    upgrades = [
+        _create(m.name, m.foreign_key.table, m.foreign_key.columns, unique=False)
+        for m in result.missing
+    ] + [_drop(r.index.name, r.index.table) for r in result.redundant]
+    downgrades = [
+        _create(r.index.name, r.index.table, r.index.columns, r.index.unique)
+        for r in result.redundant
+    ] + [_drop(m.name, m.foreign_key.table) for m in reversed(result.missing)]
+    return _MIGRATION.format(
+        message=message,
+        revision=revision,
+        down_revision=down_revision,
+        create_date=create_date,
+        upgrades="\n".join(upgrades),
+        downgrades="\n".join(downgrades),
+    )
+
+
+def write_migration(result: Audit, message: str) -> Path:
+    """Write ``render_migration`` on top of the current head; return its path."""
+    scripts = ScriptDirectory(str(MIGRATIONS_DIR))
+    head = scripts.get_current_head()
+    if head is None:
+        raise RuntimeError("No migration head to build on")
+    revision = uuid4().hex[-12:]
+    slug = re.sub(r"\W+", "_", message.lower()).strip("_")[:40]
+    path = MIGRATIONS_DIR / "versions" / f"{revision}_{slug}.py"
+    path.write_text(
+        render_migration(
+            result,
+            message=message,
+            revision=revision,
+            down_revision=head,
+            create_date=datetime.now(),
+        )
+    )
+    return path
@@ -1,4 +1,5 @@
 import csv
+from collections.abc import Iterator
 from pathlib import Path
 
 EXERCISES_CSV = Path(__file__).resolve().parents[2] / "resources" / "exercises.csv"
@@ -9,21 +10,27 @@ _BLANKS = {"", "nan", "N/A"}
 type ExerciseRow = dict[str, str | None]
 
 
-def load_exercises() -> list[ExerciseRow]:
-    """Load exercise rows from the seed CSV, de-duplicated by title.
+def iter_exercises(path: Path = EXERCISES_CSV) -> Iterator[ExerciseRow]:
+    """Stream exercise rows from a seed CSV, one at a time, as they are read.
 
     Blank / placeholder cells are normalised to ``None`` so seeded rows carry
-    real NULLs instead of empty strings.
+    real NULLs instead of empty strings. Titles are *not* de-duplicated here —
+    that would mean remembering every title seen; the catalog sync does it in SQL.
     """
-    rows: list[ExerciseRow] = []
-    seen: set[str] = set()
-    with EXERCISES_CSV.open(newline="", encoding="utf-8") as fh:
+    with path.open(newline="", encoding="utf-8") as fh:
         for raw in csv.DictReader(fh):
-            title = raw["Title"]
-            if title in seen:
-                continue
-            seen.add(title)
-            rows.append({k: (None if v in _BLANKS else v) for k, v in raw.items()})
+            yield {k: (None if v in _BLANKS else v) for k, v in raw.items()}
+
+
+def load_exercises() -> list[ExerciseRow]:
+    """Load all exercise rows from the seed CSV, de-duplicated by title."""
+    rows: list[ExerciseRow] = []
+    seen: set[str | None] = set()
+    for row in iter_exercises():
+        if row["Title"] in seen:
+            continue
+        seen.add(row["Title"])
+        rows.append(row)
     return rows
 
 
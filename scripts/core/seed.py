@@ -1,60 +1,59 @@
 from argparse import ArgumentParser
+from pathlib import Path
 
 from gymhero.config import get_settings
 from gymhero.database.db import get_ctx_db
 from gymhero.log import get_logger
 from gymhero.models.user import User
-from scripts.core.catalog import (
-    create_body_parts,
-    create_exercise_types,
-    create_exercises,
-    create_levels,
-)
-from scripts.core.resources import load_exercises, unique_values
+from scripts.core.bulk import DEFAULT_CHUNK_SIZE
+from scripts.core.resources import EXERCISES_CSV
+from scripts.core.sync import sync_catalog
+from scripts.core.synthetic import USERS_PER_SCALE, seed_synthetic
 from scripts.core.users import create_first_superuser
 
 log = get_logger(__name__)
 
 
-def seed_database(env: str, limit: int | None = None) -> None:
-    """Seed ``env``'s database with the superuser and the exercise catalog.
+def seed_database(
+    env: str,
+    limit: int | None = None,
+    *,
+    csv_path: Path = EXERCISES_CSV,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    force: bool = False,
+) -> None:
+    """Seed ``env``'s database with the superuser and sync the exercise catalog.
 
-    The reference catalog (levels, body parts, exercise types) is derived from
-    the full CSV; ``limit`` caps only how many exercises are inserted.
+    The sync is incremental (see ``scripts.core.sync``): an unchanged CSV is a
+    no-op, otherwise only changed rows are written. The reference catalog
+    (levels, body parts, exercise types) is derived from the whole file;
+    ``limit`` caps how many exercises the catalog holds.
     """
     settings = get_settings(env)
     database_url = settings.database_url
     # Log host/db only — never the full URL, which carries the password.
     log.info("Seeding database %s", database_url.split("@")[-1])
 
-    rows = load_exercises()
-    exercise_rows = rows[:limit] if limit else rows
-
     with get_ctx_db(database_url) as session:
         superuser = create_first_superuser(session, settings)
-        level_ids = {
-            level.name: level.id
-            for level in create_levels(session, unique_values(rows, "Level"))
-        }
-        body_part_ids = {
-            body_part.name: body_part.id
-            for body_part in create_body_parts(session, unique_values(rows, "BodyPart"))
-        }
-        exercise_type_ids = {
-            exercise_type.name: exercise_type.id
-            for exercise_type in create_exercise_types(
-                session, unique_values(rows, "Type")
-            )
-        }
-        create_exercises(
+        stats = sync_catalog(
             session,
-            exercise_rows,
-            body_part_ids,
-            level_ids,
-            exercise_type_ids,
             superuser.id,
+            csv_path=csv_path,
+            limit=limit,
+            chunk_size=chunk_size,
+            force=force,
         )
-    log.info("Database seeded (%d exercises)", len(exercise_rows))
+    log.info("Database seeded (catalog version %d)", stats.version)
+
+
+def seed_synthetic_dataset(
+    env: str, scale: int, *, seed: int = 0, workers: int | None = None
+) -> None:
+    """Add the deterministic synthetic dataset on top of the seeded catalog."""
+    settings = get_settings(env)
+    with get_ctx_db(settings.database_url) as session:
+        seed_synthetic(session, scale, seed=seed, workers=workers)
 
 
 def seed_superuser(env: str) -> User:
@@ -81,4 +80,36 @@ def build_argparser() -> ArgumentParser:
         choices=["all", "superuser"],
         help="Seed the full catalog ('all') or only the superuser.",
     )
+    parser.add_argument(
+        "--csv",
+        type=Path,
+        default=EXERCISES_CSV,
+        help="Exercise catalog CSV to load.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows per COPY chunk (bounds memory).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Diff the catalog row by row even if the CSV is unchanged.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=0,
+        help=f"Also generate a synthetic dataset of N x {USERS_PER_SCALE} users.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed of the synthetic dataset."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes generating the synthetic dataset (default: CPU count).",
+    )
     return parser
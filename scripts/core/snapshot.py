@@ -0,0 +1,52 @@
+"""Compile the exercise catalog into a snapshot file workers can map.
+
+The snapshot is built from the database rather than straight from the CSV: its
+fragments are the API's ``ExerciseInDB`` responses, and ids, owners and
+timestamps only exist once the catalog has been synced (``scripts.seed``).
+"""
+
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from gymhero.log import get_logger
+from gymhero.models.catalog import CatalogMetadata
+from gymhero.models.exercise import Exercise
+from gymhero.schemas.exercise import ExerciseInDB
+from gymhero.services.catalog_snapshot import REFERENCE_MODELS, micros, write_snapshot
+from scripts.core.sync import CATALOG_NAME
+
+log = get_logger(__name__)
+
+
+def build_snapshot(session: Session, path: Path) -> int:
+    """Write every exercise and reference row to ``path``; return the version.
+
+    The version is the catalog's sync version. Reads run in one repeatable-read
+    transaction, so the exercises and references are from the same moment.
+    """
+    session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    metadata = session.get(CatalogMetadata, CATALOG_NAME)
+    version = metadata.version if metadata is not None else 0
+    exercises = (
+        (
+            exercise.id,
+            micros(exercise.updated_at),
+            ExerciseInDB.model_validate(exercise).model_dump_json().encode(),
+        )
+        for exercise in session.scalars(select(Exercise).order_by(Exercise.id))
+    )
+    references = [
+        (model.__tablename__, row_id, micros(updated_at))
+        for model in REFERENCE_MODELS
+        for row_id, updated_at in session.execute(select(model.id, model.updated_at))
+    ]
+    count = write_snapshot(
+        path, version=version, exercises=exercises, references=references
+    )
+    session.rollback()
+    log.info(
+        "Wrote catalog snapshot version %d (%d exercises) to %s", version, count, path
+    )
+    return version
@@ -0,0 +1,225 @@
+"""Incremental sync of the exercise catalog against its CSV.
+
+Every catalog-owned exercise has a ``catalog_entries`` row holding a hash of
+its CSV content, and ``catalog_metadata`` records the hash of the whole source
+file as of the last sync. A run whose file hash matches is a no-op decided by
+one primary-key lookup. Otherwise the file is staged via ``COPY`` and diffed
+against the entries with four set-based statements — adopt, update, delete,
+insert — so only rows whose content actually changed are written.
+
+Only exercises carrying an entry are ever updated or deleted: user-created
+exercises are never touched. A catalog exercise that has left the file but is
+still used by a training unit is detached (its entry dropped) rather than
+deleted.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from gymhero.log import get_logger
+from gymhero.models.catalog import CatalogMetadata
+from scripts.core.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    check_references,
+    copy_rows,
+    create_staging_table,
+    merge_reference_catalog,
+    staging,
+)
+from scripts.core.resources import EXERCISES_CSV, iter_exercises
+
+log = get_logger(__name__)
+
+CATALOG_NAME = "exercises"
+
+# First staged row per name, with resolved reference ids and a content hash.
+# json_build_array keeps NULL and the string "null" distinct, unlike concat.
+# LEFT JOINs: a row must never drop out of the source, or _DELETE would take
+# its exercise for gone; check_references has already rejected unresolved rows.
+_CREATE_SOURCE = text(
+    f"""
+    CREATE TEMP TABLE catalog_source ON COMMIT DROP AS
+    SELECT s.name, s.description, s.equipment,
+           bp.id AS target_body_part_id, et.id AS exercise_type_id, l.id AS level_id,
+           encode(sha256(convert_to(json_build_array(
+               s.description, s.exercise_type, s.body_part, s.level, s.equipment
+           )::text, 'UTF8')), 'hex') AS content_hash
+    FROM (
+        SELECT DISTINCT ON (name) * FROM {staging.name}
+        WHERE name IS NOT NULL ORDER BY name, seq
+    ) s
+    LEFT JOIN body_parts bp ON bp.name = s.body_part
+    LEFT JOIN exercise_types et ON et.name = s.exercise_type
+    LEFT JOIN levels l ON l.name = s.level
+    ORDER BY s.seq
+    LIMIT :limit
+    """
+)
+
+# Catalog exercises seeded before hashes existed: claim them with an empty hash
+# so the update below rewrites them once.
+_ADOPT = text(
+    """
+    INSERT INTO catalog_entries (exercise_id, content_hash)
+    SELECT e.id, '' FROM exercises e
+    JOIN catalog_source src ON src.name = e.name
+    WHERE e.owner_id = :owner_id
+      AND NOT EXISTS (SELECT 1 FROM catalog_entries ce WHERE ce.exercise_id = e.id)
+    """
+)
+
+_UPDATE = text(
+    """
+    WITH changed AS (
+        UPDATE exercises e
+        SET description = src.description,
+            equipment = src.equipment,
+            target_body_part_id = src.target_body_part_id,
+            exercise_type_id = src.exercise_type_id,
+            level_id = src.level_id,
+            updated_at = now()
+        FROM catalog_entries ce, catalog_source src
+        WHERE ce.exercise_id = e.id
+          AND src.name = e.name
+          AND ce.content_hash <> src.content_hash
+        RETURNING e.id, src.content_hash
+    )
+    UPDATE catalog_entries ce SET content_hash = changed.content_hash
+    FROM changed WHERE ce.exercise_id = changed.id
+    """
+)
+
+_DELETE = text(
+    """
+    WITH stale AS (
+        DELETE FROM catalog_entries ce USING exercises e
+        WHERE ce.exercise_id = e.id
+          AND NOT EXISTS (SELECT 1 FROM catalog_source src WHERE src.name = e.name)
+        RETURNING ce.exercise_id
+    )
+    DELETE FROM exercises e USING stale
+    WHERE e.id = stale.exercise_id
+      AND NOT EXISTS (
+          SELECT 1 FROM training_unit_exercise tue WHERE tue.exercise_id = e.id
+      )
+    """
+)
+
+# NOT EXISTS skips names taken by user-created exercises; ON CONFLICT covers a
+# concurrent writer.
+_INSERT = text(
+    """
+    WITH inserted AS (
+        INSERT INTO exercises (
+            name, description, equipment, target_body_part_id, exercise_type_id,
+            level_id, owner_id
+        )
+        SELECT src.name, src.description, src.equipment, src.target_body_part_id,
+               src.exercise_type_id, src.level_id, :owner_id
+        FROM catalog_source src
+        WHERE NOT EXISTS (SELECT 1 FROM exercises e WHERE e.name = src.name)
+        ON CONFLICT (name) DO NOTHING
+        RETURNING id, name
+    )
+    INSERT INTO catalog_entries (exercise_id, content_hash)
+    SELECT inserted.id, src.content_hash
+    FROM inserted JOIN catalog_source src ON src.name = inserted.name
+    """
+)
+
+
+@dataclass(frozen=True)
+class SyncStats:
+    version: int
+    inserted: int
+    updated: int
+    deleted: int
+    seconds: float
+    # Rows read from the file; 0 when the whole-file shortcut skipped it.
+    staged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.staged / self.seconds if self.seconds else 0.0
+
+
+def source_hash(path: Path, limit: int | None = None) -> str:
+    """SHA-256 of the file, salted with ``limit`` and the columns read from it
+    (either changes the catalog too)."""
+    with path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256")
+    digest.update(f"limit={limit};columns={','.join(staging.c.keys())}".encode())
+    return digest.hexdigest()
+
+
+def sync_catalog(
+    session: Session,
+    owner_id: int,
+    *,
+    csv_path: Path = EXERCISES_CSV,
+    limit: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    force: bool = False,
+) -> SyncStats:
+    """Bring the exercise catalog in line with ``csv_path`` and commit.
+
+    ``force`` skips the whole-file shortcut and diffs row by row, e.g. after
+    catalog rows were edited by hand. Raises ``ValueError``, before any exercise is
+    touched, if a row lacks its level, exercise type or body part.
+    """
+    start = time.perf_counter()
+    digest = source_hash(csv_path, limit)
+    current = session.get(CatalogMetadata, CATALOG_NAME)
+    version = current.version if current else 0
+    if current is not None and current.source_hash == digest and not force:
+        log.info("Catalog unchanged (version %d)", version)
+        return SyncStats(version, 0, 0, 0, time.perf_counter() - start)
+
+    create_staging_table(session)
+    staged = copy_rows(session, iter_exercises(csv_path), chunk_size)
+    merge_reference_catalog(session)
+    check_references(session)
+    session.execute(_CREATE_SOURCE, {"limit": limit})
+    session.execute(text("ANALYZE catalog_source"))
+
+    session.execute(_ADOPT, {"owner_id": owner_id})
+    updated = session.execute(_UPDATE).rowcount
+    deleted = session.execute(_DELETE).rowcount
+    inserted = session.execute(_INSERT, {"owner_id": owner_id}).rowcount
+
+    if inserted or updated or deleted or current is None:
+        version += 1
+    session.execute(
+        pg_insert(CatalogMetadata)
+        .values(name=CATALOG_NAME, version=version, source_hash=digest)
+        .on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": version, "source_hash": digest, "synced_at": func.now()},
+        )
+    )
+    session.commit()
+    stats = SyncStats(
+        version, inserted, updated, deleted, time.perf_counter() - start, staged
+    )
+    log.info(
+        "Catalog synced to version %d: %d inserted, %d updated, %d deleted "
+        "from %d rows in %.2fs (%.0f rows/s)",
+        stats.version,
+        stats.inserted,
+        stats.updated,
+        stats.deleted,
+        stats.staged,
+        stats.seconds,
+        stats.rows_per_second,
+    )
+    return stats
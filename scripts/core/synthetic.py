@@ -0,0 +1,438 @@
+"""Deterministic synthetic dataset at a configurable scale (``--scale N``).
+
+Scale ``N`` adds ``N * USERS_PER_SCALE`` users on top of the seeded catalog,
+each with their own exercises, training units (with prescribed sets) and plans.
+Volumes are skewed the way real usage is: a Pareto-distributed activity level
+makes most users light and a few power users own hundreds of rows, plans are a
+separate long tail, and sets per exercise cluster around 3-4.
+
+Everything derives from ``random.Random(f"{seed}:{user_index}")``, so the same
+seed and scale produce the same rows. Ids are assigned up front from per-user
+row counts, which lets blocks of users be generated in a process pool and
+``COPY``-ed straight into the real tables in any order.
+"""
+
+import csv
+import io
+import itertools
+import os
+import random
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from gymhero.log import get_logger
+from gymhero.models.exercise import Exercise
+from gymhero.models.training_plan import TrainingPlan, training_plan_training_unit
+from gymhero.models.training_unit import (
+    PrescribedSet,
+    TrainingUnit,
+    TrainingUnitExercise,
+)
+from gymhero.models.user import User
+from gymhero.security import get_password_hash
+from scripts.core.bulk import copy_csv
+from scripts.core.catalog import create_body_parts, create_exercise_types, create_levels
+from scripts.core.resources import load_exercises, unique_values
+
+log = get_logger(__name__)
+
+USERS_PER_SCALE = 5
+BLOCK_SIZE = 100  # users per worker task
+SYNTHETIC_PASSWORD = "synthetic-password"
+_EMAIL = "synthetic{}@example.com"
+# Fixed anchor for created_at/updated_at, so timestamps are reproducible too.
+_ANCHOR = datetime(2024, 1, 1, tzinfo=UTC)
+
+MAX_EXERCISES = 1000
+MAX_UNITS = 500
+MAX_PLANS = 200
+MAX_UNITS_PER_PLAN = 6
+# Unit size is triangular(2, 10, mode 5); the catalog must cover the maximum.
+MAX_EXERCISES_PER_UNIT = 10
+_SETS = (1, 2, 3, 4, 5, 6, 8)
+_SETS_WEIGHTS = (3, 7, 45, 25, 14, 5, 1)
+_REPS = (3, 5, 6, 8, 10, 12, 15, 20)
+_REPS_WEIGHTS = (3, 12, 8, 20, 25, 18, 10, 4)
+_UNIT_NAMES = ("Push", "Pull", "Legs", "Upper", "Lower", "Full body", "Core", "Arms")
+_PLAN_NAMES = ("PPL", "Upper/Lower", "FBW", "Strength block", "Hypertrophy block")
+
+# Columns each table is COPY-ed with, in FK-safe load order. prescribed_set
+# takes its id from its sequence: nothing references it.
+_COLUMNS: dict[str, tuple[str, ...]] = {
+    User.__tablename__: (
+        "id",
+        "email",
+        "full_name",
+        "hashed_password",
+        "created_at",
+        "updated_at",
+    ),
+    Exercise.__tablename__: (
+        "id",
+        "name",
+        "description",
+        "target_body_part_id",
+        "exercise_type_id",
+        "level_id",
+        "owner_id",
+        "created_at",
+        "updated_at",
+    ),
+    TrainingUnit.__tablename__: (
+        "id",
+        "name",
+        "description",
+        "owner_id",
+        "created_at",
+        "updated_at",
+    ),
+    TrainingUnitExercise.__tablename__: ("id", "training_unit_id", "exercise_id"),
+    PrescribedSet.__tablename__: (
+        "training_unit_exercise_id",
+        "set_number",
+        "reps",
+        "weight",
+    ),
+    TrainingPlan.__tablename__: (
+        "id",
+        "name",
+        "description",
+        "owner_id",
+        "created_at",
+        "updated_at",
+    ),
+    training_plan_training_unit.name: ("training_plan_id", "training_unit_id"),
+}
+_ID_TABLES = (User, Exercise, TrainingUnit, TrainingUnitExercise, TrainingPlan)
+
+
+@dataclass(frozen=True)
+class UserShape:
+    """How many rows one user owns — drawn first, so ids can be laid out."""
+
+    exercises: int
+    unit_sizes: tuple[int, ...]
+    plans: int
+
+    @property
+    def links(self) -> int:
+        return sum(self.unit_sizes)
+
+
+@dataclass(frozen=True)
+class Block:
+    """A run of consecutive users and the first id of each of their tables."""
+
+    first_user: int
+    users: int
+    user_id: int
+    exercise_id: int
+    unit_id: int
+    link_id: int
+    plan_id: int
+
+
+@dataclass(frozen=True)
+class Context:
+    """Read-only inputs every worker needs; shipped once per process."""
+
+    seed: int
+    password_hash: str
+    catalog_names: tuple[str, ...]
+    catalog_exercise_ids: tuple[int, ...]
+    body_part_ids: tuple[int, ...]
+    exercise_type_ids: tuple[int, ...]
+    level_ids: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SyntheticStats:
+    users: int
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def user_rng(seed: int, user_index: int) -> random.Random:
+    return random.Random(f"{seed}:{user_index}")
+
+
+def user_shape(rng: random.Random) -> UserShape:
+    # Pareto with alpha ~1.16 is the 80/20 rule: most users are light, a few
+    # power users hit the caps.
+    activity = rng.paretovariate(1.16)
+    exercises = min(MAX_EXERCISES, int(4 * activity) - 1)
+    units = min(MAX_UNITS, int(3 * activity) - 1)
+    unit_sizes = tuple(
+        round(rng.triangular(2, MAX_EXERCISES_PER_UNIT, 5)) for _ in range(units)
+    )
+    # Plans are their own long tail: most users keep none or one.
+    plans = min(MAX_PLANS, units, int(rng.paretovariate(1.5)) - 1)
+    return UserShape(exercises, unit_sizes, plans)
+
+
+def plan_blocks(
+    shapes: Sequence[UserShape], first_ids: dict[str, int], block_size: int
+) -> list[Block]:
+    """Split users into blocks and give each block its id offsets."""
+    blocks = []
+    next_ids = dict(first_ids)
+    for first_user in range(0, len(shapes), block_size):
+        chunk = shapes[first_user : first_user + block_size]
+        blocks.append(
+            Block(
+                first_user=first_user,
+                users=len(chunk),
+                user_id=next_ids["users"],
+                exercise_id=next_ids["exercises"],
+                unit_id=next_ids["training_units"],
+                link_id=next_ids["training_unit_exercise"],
+                plan_id=next_ids["training_plans"],
+            )
+        )
+        next_ids["users"] += len(chunk)
+        next_ids["exercises"] += sum(s.exercises for s in chunk)
+        next_ids["training_units"] += sum(len(s.unit_sizes) for s in chunk)
+        next_ids["training_unit_exercise"] += sum(s.links for s in chunk)
+        next_ids["training_plans"] += sum(s.plans for s in chunk)
+    return blocks
+
+
+_context: Context
+_catalog_weights: list[float]
+
+
+def _init_worker(context: Context) -> None:
+    global _context, _catalog_weights
+    _context = context
+    # Zipf-like popularity: a handful of catalog exercises show up everywhere.
+    _catalog_weights = list(
+        itertools.accumulate(
+            1 / rank for rank in range(1, len(context.catalog_exercise_ids) + 1)
+        )
+    )
+
+
+def _timestamps(rng: random.Random) -> tuple[str, str]:
+    created = _ANCHOR + timedelta(seconds=rng.randrange(365 * 86400))
+    updated = created + timedelta(seconds=rng.randrange(30 * 86400))
+    return created.isoformat(), updated.isoformat()
+
+
+def _pick_exercises(rng: random.Random, own: range, k: int) -> list[int]:
+    # Half own exercises, half popular catalog ones; unique within the unit.
+    catalog = _context.catalog_exercise_ids
+    picked: dict[int, None] = {}
+    while len(picked) < k:
+        if own and rng.random() < 0.5:
+            picked.setdefault(own[rng.randrange(len(own))], None)
+        else:
+            picked.setdefault(
+                rng.choices(catalog, cum_weights=_catalog_weights)[0], None
+            )
+    return list(picked)
+
+
+def generate_block(block: Block) -> tuple[dict[str, str], int]:
+    """Render one block of users as COPY-ready CSV per table, plus its row count."""
+    buffers = {name: io.StringIO() for name in _COLUMNS}
+    writers = {
+        name: csv.writer(buf, lineterminator="\n") for name, buf in buffers.items()
+    }
+    rows = 0
+
+    def emit(table_name: str, row: Sequence[object]) -> None:
+        nonlocal rows
+        rows += 1
+        writers[table_name].writerow(row)
+
+    ctx = _context
+    user_id = block.user_id
+    exercise_id, unit_id = block.exercise_id, block.unit_id
+    link_id, plan_id = block.link_id, block.plan_id
+
+    for user_index in range(block.first_user, block.first_user + block.users):
+        rng = user_rng(ctx.seed, user_index)
+        shape = user_shape(rng)  # same draws as the planner: ids line up
+        emit(
+            "users",
+            (
+                user_id,
+                _EMAIL.format(user_index),
+                f"Synthetic User {user_index}",
+                ctx.password_hash,
+                *_timestamps(rng),
+            ),
+        )
+
+        own = range(exercise_id, exercise_id + shape.exercises)
+        for eid in own:
+            base = ctx.catalog_names[rng.randrange(len(ctx.catalog_names))]
+            emit(
+                "exercises",
+                (
+                    eid,
+                    f"{base} #{eid}",  # names are globally unique
+                    None if rng.random() < 0.3 else f"Custom variation of {base}.",
+                    rng.choice(ctx.body_part_ids),
+                    rng.choice(ctx.exercise_type_ids),
+                    rng.choice(ctx.level_ids),
+                    user_id,
+                    *_timestamps(rng),
+                ),
+            )
+        exercise_id += shape.exercises
+
+        units = range(unit_id, unit_id + len(shape.unit_sizes))
+        for n, (uid, size) in enumerate(zip(units, shape.unit_sizes, strict=True), 1):
+            emit(
+                "training_units",
+                (
+                    uid,
+                    f"{rng.choice(_UNIT_NAMES)} {n}",
+                    None,
+                    user_id,
+                    *_timestamps(rng),
+                ),
+            )
+            for eid in _pick_exercises(rng, own, size):
+                emit("training_unit_exercise", (link_id, uid, eid))
+                sets = rng.choices(_SETS, _SETS_WEIGHTS)[0]
+                reps = rng.choices(_REPS, _REPS_WEIGHTS)[0]
+                # A fifth of exercises are bodyweight; the rest ramp up by 2.5 kg.
+                weight = (
+                    None
+                    if rng.random() < 0.2
+                    else round(rng.lognormvariate(3.5, 0.6) / 2.5) * 2.5
+                )
+                for set_number in range(1, sets + 1):
+                    emit(
+                        "prescribed_set",
+                        (
+                            link_id,
+                            set_number,
+                            reps,
+                            None if weight is None else weight + 2.5 * (set_number - 1),
+                        ),
+                    )
+                link_id += 1
+        unit_id += len(shape.unit_sizes)
+
+        for n in range(1, shape.plans + 1):
+            emit(
+                "training_plans",
+                (
+                    plan_id,
+                    f"{rng.choice(_PLAN_NAMES)} {n}",
+                    None,
+                    user_id,
+                    *_timestamps(rng),
+                ),
+            )
+            k = rng.randint(1, min(MAX_UNITS_PER_PLAN, len(units)))
+            for uid in rng.sample(units, k):
+                emit("training_plan_training_unit", (plan_id, uid))
+            plan_id += 1
+        user_id += 1
+    return {name: buf.getvalue() for name, buf in buffers.items()}, rows
+
+
+def _next_ids(session: Session) -> dict[str, int]:
+    return {
+        model.__tablename__: (session.scalar(select(func.max(model.id))) or 0) + 1
+        for model in _ID_TABLES
+    }
+
+
+def _build_context(session: Session, seed: int) -> Context:
+    # The reference catalog comes from the seed CSV, via the same helpers as the
+    # regular seed; synthetic exercises reuse its titles as name stems.
+    rows = load_exercises()
+    catalog_ids = tuple(session.scalars(select(Exercise.id).order_by(Exercise.id)))
+    if len(catalog_ids) < MAX_EXERCISES_PER_UNIT:
+        raise RuntimeError("Seed the exercise catalog before the synthetic dataset")
+    return Context(
+        seed=seed,
+        # One bcrypt hash shared by every synthetic user: hashing per user would
+        # dominate the run.
+        password_hash=get_password_hash(SYNTHETIC_PASSWORD),
+        catalog_names=tuple(str(row["Title"]) for row in rows),
+        catalog_exercise_ids=catalog_ids,
+        body_part_ids=tuple(
+            b.id for b in create_body_parts(session, unique_values(rows, "BodyPart"))
+        ),
+        exercise_type_ids=tuple(
+            t.id for t in create_exercise_types(session, unique_values(rows, "Type"))
+        ),
+        level_ids=tuple(
+            level.id for level in create_levels(session, unique_values(rows, "Level"))
+        ),
+    )
+
+
+def _generate(
+    context: Context, blocks: list[Block], workers: int
+) -> Iterator[tuple[dict[str, str], int]]:
+    if workers <= 1:
+        _init_worker(context)
+        yield from map(generate_block, blocks)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(context,)
+    ) as pool:
+        yield from pool.map(generate_block, blocks)
+
+
+def seed_synthetic(
+    session: Session,
+    scale: int,
+    *,
+    seed: int = 0,
+    workers: int | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> SyntheticStats | None:
+    """Add the scale-``scale`` synthetic dataset; ``None`` if already present."""
+    if session.scalar(select(User.id).where(User.email == _EMAIL.format(0))):
+        log.info("Synthetic dataset already present, skipping")
+        return None
+
+    start = time.perf_counter()
+    users = scale * USERS_PER_SCALE
+    context = _build_context(session, seed)
+    shapes = [user_shape(user_rng(seed, i)) for i in range(users)]
+    blocks = plan_blocks(shapes, _next_ids(session), block_size)
+    rows = 0
+    for tables, block_rows in _generate(
+        context, blocks, workers or os.cpu_count() or 1
+    ):
+        for table_name, columns in _COLUMNS.items():
+            copy_csv(session, table_name, columns, io.StringIO(tables[table_name]))
+        rows += block_rows
+    # Ids were supplied explicitly; move the sequences past them.
+    for model in _ID_TABLES:
+        session.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{model.__tablename__}', 'id'), "
+                f"(SELECT max(id) FROM {model.__tablename__}))"
+            )
+        )
+    session.commit()
+
+    stats = SyntheticStats(users, rows, time.perf_counter() - start)
+    log.info(
+        "Generated %d synthetic users, %d rows in %.2fs (%.0f rows/s)",
+        stats.users,
+        stats.rows,
+        stats.seconds,
+        stats.rows_per_second,
+    )
+    return stats
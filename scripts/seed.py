@@ -1,5 +1,10 @@
 from gymhero.log import get_logger
-from scripts.core.seed import build_argparser, seed_database, seed_superuser
+from scripts.core.seed import (
+    build_argparser,
+    seed_database,
+    seed_superuser,
+    seed_synthetic_dataset,
+)
 
 log = get_logger(__name__)
 
@@ -9,4 +14,10 @@ if __name__ == "__main__":
     if args.target == "superuser":
         seed_superuser(args.env)
     else:
-        seed_database(args.env)
+        seed_database(
+            args.env, csv_path=args.csv, chunk_size=args.chunk_size, force=args.force
+        )
+        if args.scale:
+            seed_synthetic_dataset(
+                args.env, args.scale, seed=args.seed, workers=args.workers
+            )
@@ -70,6 +70,7 @@ async def create_exercise(
     owner: User,
     name: str | None = None,
     description: str | None = None,
+    equipment: str | None = None,
     body_part: BodyPart | None = None,
     level: Level | None = None,
     exercise_type: ExerciseType | None = None,
@@ -82,6 +83,7 @@ async def create_exercise(
         Exercise(
             name=name or _unique("Exercise"),
             description=description,
+            equipment=equipment,
             target_body_part_id=body_part.id,
             exercise_type_id=exercise_type.id,
             level_id=level.id,
@@ -0,0 +1,106 @@
+import asyncio
+import fnmatch
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+class StandInRedis:
+    """Just enough of a Redis server, over RESP2, for the cache backend."""
+
+    def __init__(self, password: str | None = None) -> None:
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self.connections: list[asyncio.StreamWriter] = []
+        self.port = 0
+
+    @asynccontextmanager
+    async def running(self) -> AsyncGenerator["StandInRedis"]:
+        server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        async with server:
+            yield self
+            for writer in self.connections:
+                writer.close()
+
+    def drop_connections(self) -> None:
+        for writer in self.connections:
+            writer.close()
+        self.connections.clear()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections.append(writer)
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await self._read_command(reader)
+                self.commands.append(command)
+                name = command[0].upper()
+                if name == b"AUTH":
+                    authenticated = command[-1].decode() == self.password
+                    reply: Any = "OK" if authenticated else Exception("WRONGPASS")
+                elif not authenticated:
+                    reply = Exception("NOAUTH Authentication required.")
+                else:
+                    reply = self._execute(name, command[1:])
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+        count = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args = []
+        for _ in range(count):
+            size = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    def _get(self, key: bytes) -> bytes | None:
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _execute(self, name: bytes, args: list[bytes]) -> Any:
+        if name in (b"SELECT", b"PING"):
+            return "OK"
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"MGET":
+            return [self._get(key) for key in args]
+        if name == b"SET":
+            expires = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (args[1], expires)
+            return "OK"
+        if name == b"INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return value
+        if name == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [key for key in self.data if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return [b"0", keys]
+        return Exception(f"ERR unknown command '{name.decode()}'")
+
+
+def _encode(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(map(_encode, reply))
@@ -1,10 +1,14 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from testcontainers.postgres import PostgresContainer
 
+from gymhero.database.invalidation import INVALIDATION_BUS
+from gymhero.database.session import get_local_session
 from gymhero.main import app
 from gymhero.models import Base
 from gymhero.models.body_part import BodyPart
@@ -41,11 +45,28 @@ async def db(engine: AsyncEngine) -> AsyncGenerator[AsyncSession]:
         yield session
 
 
+@pytest.fixture
+def sync_session(_postgres_container: PostgresContainer) -> Generator[Session]:
+    # The seed scripts are sync (psycopg2): COPY needs the raw DBAPI cursor.
+    session = get_local_session(_postgres_container.get_connection_url())()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 @pytest.fixture
 async def client(engine: AsyncEngine) -> AsyncGenerator[AsyncClient]:
     # The lifespan isn't run under ASGITransport, so populate the state that the
     # real get_db reads from — this exercises get_db itself, no override needed.
-    app.state.db_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    # Writes through the app invalidate its caches, which start empty every test.
+    app.state.db_session_factory = async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        info={INVALIDATION_BUS: app.state.invalidation_bus},
+    )
+    if app.state.cache is not None:
+        await app.state.cache.clear()
     # raise_app_exceptions=False: behave like a real HTTP client — an unhandled
     # server error comes back as a 500 response, not a re-raised Python exception.
     transport = ASGITransport(app=app, raise_app_exceptions=False)
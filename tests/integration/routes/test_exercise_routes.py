@@ -154,6 +154,101 @@ async def test_search_total_reflects_filter_not_page(
     assert response.json()["total"] == 3  # total reflects all matches
 
 
+async def test_filter_exercises_by_equipment(
+    client: AsyncClient,
+    user_headers: dict[str, str],
+    regular_user: User,
+    db: AsyncSession,
+) -> None:
+    await create_exercise(db, owner=regular_user, name="Curl", equipment="Dumbbell")
+    await create_exercise(db, owner=regular_user, name="Plank")
+    response = await client.get(
+        "/api/v1/exercises/all", params={"equipment": "Dumbbell"}, headers=user_headers
+    )
+    assert [item["name"] for item in page_items(response)] == ["Curl"]
+    assert page_items(response)[0]["equipment"] == "Dumbbell"
+
+
+async def test_sorted_exercises_break_ties_by_id(
+    client: AsyncClient,
+    user_headers: dict[str, str],
+    regular_user: User,
+    db: AsyncSession,
+) -> None:
+    created = [
+        await create_exercise(db, owner=regular_user, name=name)
+        for name in ("Row", "Curl", "Plank")
+    ]
+    ids = [exercise.id for exercise in created]
+    pages = {}
+    for params in (
+        {"sort": "name"},
+        {"sort": "created_at", "order": "desc"},
+        {"order": "desc"},
+    ):
+        response = await client.get(
+            "/api/v1/exercises/my", params=params, headers=user_headers
+        )
+        pages[params.get("sort")] = [item["id"] for item in page_items(response)]
+    assert pages["name"] == [ids[1], ids[2], ids[0]]
+    assert pages["created_at"] == ids[::-1]
+    assert pages[None] == ids[::-1]
+
+
+async def test_facets_count_each_value_under_the_filters(
+    client: AsyncClient,
+    user_headers: dict[str, str],
+    regular_user: User,
+    db: AsyncSession,
+) -> None:
+    strength = await create_exercise_type(db)
+    cardio = await create_exercise_type(db)
+    level = await create_level(db)
+    for name, exercise_type, equipment in (
+        ("Bench Press", strength, "Barbell"),
+        ("Bench Dips", strength, None),
+        ("Bench Step-up", cardio, "Barbell"),
+        ("Squat", strength, "Barbell"),
+    ):
+        await create_exercise(
+            db,
+            owner=regular_user,
+            name=name,
+            exercise_type=exercise_type,
+            level=level,
+            equipment=equipment,
+        )
+    response = await client.get(
+        "/api/v1/exercises/facets", params={"q": "bench"}, headers=user_headers
+    )
+    assert response.status_code == 200
+    facets = response.json()
+    assert facets["total"] == 3
+    assert facets["exercise_type_id"] == [
+        {"value": strength.id, "count": 2},
+        {"value": cardio.id, "count": 1},
+    ]
+    assert facets["level_id"] == [{"value": level.id, "count": 3}]
+    assert len(facets["target_body_part_id"]) == 3
+    assert facets["equipment"] == [
+        {"value": "Barbell", "count": 2},
+        {"value": None, "count": 1},
+    ]
+
+
+async def test_facets_of_an_empty_catalog(
+    client: AsyncClient, user_headers: dict[str, str]
+) -> None:
+    response = await client.get("/api/v1/exercises/facets", headers=user_headers)
+    assert response.json() == {
+        "total": 0,
+        "exercise_type_id": [],
+        "level_id": [],
+        "target_body_part_id": [],
+        "equipment": [],
+    }
+
+
 async def test_search_on_my_scopes_to_owner(
     client: AsyncClient,
     user_headers: dict[str, str],
@@ -382,3 +477,33 @@ async def test_delete_exercise_not_owner_returns_403(
     )
     assert response.status_code == 403
     assert response.json()["detail"] == "Not enough permissions to delete exercise"
+
+
+async def test_get_exercises_by_ids_reports_missing(
+    client: AsyncClient,
+    user_headers: dict[str, str],
+    regular_user: User,
+    db: AsyncSession,
+) -> None:
+    first = await create_exercise(db, owner=regular_user)
+    second = await create_exercise(db, owner=regular_user)
+    response = await client.get(
+        "/api/v1/exercises/",
+        params={"ids": f"{second.id},10000,{first.id},{second.id}"},
+        headers=user_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["id"] for e in body["items"]] == [second.id, first.id]
+    assert body["missing"] == [10000]
+
+
+async def test_get_exercises_by_ids_rejects_bad_input(
+    client: AsyncClient, user_headers: dict[str, str]
+) -> None:
+    too_many = ",".join(str(i) for i in range(1, 102))
+    for ids in ("1,x", "", too_many, "1," * 100 + "1", "2147483648", "1" * 20):
+        response = await client.get(
+            "/api/v1/exercises/", params={"ids": ids}, headers=user_headers
+        )
+        assert response.status_code == 422, ids
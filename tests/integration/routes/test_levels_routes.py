@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
@@ -17,6 +19,19 @@ async def test_get_levels_returns_paginated_items(
     ]
 
 
+async def test_concurrent_identical_level_lists_are_coalesced(
+    client: AsyncClient, seeded_levels: list[Level]
+) -> None:
+    responses = await asyncio.gather(
+        *(client.get("/api/v1/levels/all", params={"limit": 2}) for _ in range(8))
+    )
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    outcomes = [r.headers["X-Single-Flight"] for r in responses]
+    assert outcomes.count("leader") + outcomes.count("coalesced") == 8
+    assert outcomes.count("leader") < 8
+
+
 async def test_get_levels_pagination_skip_and_limit(
     client: AsyncClient, seeded_levels: list[Level]
 ) -> None:
@@ -178,10 +193,10 @@ class _FakeSuperuser:
 async def test_delete_level_db_error_returns_clean_500_without_leak(
     client: AsyncClient, mocker: MockerFixture
 ) -> None:
-    # get_one now yields a non-Level object, so the delete blows up inside the
+    # get_by_id now yields a non-Level object, so the delete blows up inside the
     # service; the error handler must map that to a generic 500 with no leak.
     mocker.patch(
-        "gymhero.crud.base.CRUDRepository.get_one", return_value=_FakeSuperuser()
+        "gymhero.crud.base.CRUDRepository.get_by_id", return_value=_FakeSuperuser()
     )
     response = await client.delete("/api/v1/levels/4242", headers=auth_headers(4242))
     assert response.status_code == 500
@@ -193,7 +208,7 @@ async def test_update_level_db_error_returns_clean_500_without_leak(
     client: AsyncClient, mocker: MockerFixture
 ) -> None:
     mocker.patch(
-        "gymhero.crud.base.CRUDRepository.get_one", return_value=_FakeSuperuser()
+        "gymhero.crud.base.CRUDRepository.get_by_id", return_value=_FakeSuperuser()
     )
     response = await client.put(
         "/api/v1/levels/4242",
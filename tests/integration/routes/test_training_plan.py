@@ -60,6 +60,20 @@ async def test_get_all_training_plans_superuser_paginates(
     assert len(page_items(response)) == 3
 
 
+async def test_get_my_training_plans_sorted_by_updated_at(
+    client: AsyncClient, db: AsyncSession, world: PlanWorld
+) -> None:
+    world.other_plans[0].description = "touched"
+    await db.commit()
+    response = await client.get(
+        "/api/v1/training-plans/all/my",
+        params={"sort": "updated_at", "order": "desc"},
+        headers=world.other_headers,
+    )
+    assert response.status_code == 200
+    assert [item["name"] for item in page_items(response)][0] == "other-plan-0"
+
+
 async def test_search_training_plans_on_my_filters_by_name(
     client: AsyncClient, world: PlanWorld
 ) -> None:
@@ -530,3 +544,17 @@ async def test_get_training_units_in_missing_plan_returns_404(
         "/api/v1/training-plans/999999/training-units", headers=world.owner_headers
     )
     assert response.status_code == 404
+
+
+async def test_get_training_plans_by_ids_scopes_to_owner(
+    client: AsyncClient, world: PlanWorld
+) -> None:
+    own, foreign = world.other_plans[0], world.owner_plans[0]
+    response = await client.get(
+        "/api/v1/training-plans/",
+        params={"ids": f"{foreign.id},{own.id}"},
+        headers=world.other_headers,
+    )
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["items"]] == [own.id]
+    assert response.json()["missing"] == [foreign.id]
@@ -133,6 +133,31 @@ async def test_search_training_units_all_superuser_spans_owners(
     assert response.json()["total"] == len(world.other_units)
 
 
+async def test_get_my_training_units_sorted_by_name_descending(
+    client: AsyncClient, world: UnitWorld
+) -> None:
+    response = await client.get(
+        "/api/v1/training-units/all/my",
+        params={"sort": "name", "order": "desc", "limit": 2},
+        headers=world.other_headers,
+    )
+    assert response.status_code == 200
+    assert [item["name"] for item in page_items(response)] == [
+        "other-unit-2",
+        "other-unit-1",
+    ]
+
+
+async def test_get_all_training_units_unknown_sort_returns_422(
+    client: AsyncClient, world: UnitWorld
+) -> None:
+    for params in ({"sort": "description"}, {"sort": "name", "order": "up"}):
+        response = await client.get(
+            "/api/v1/training-units/all", params=params, headers=world.owner_headers
+        )
+        assert response.status_code == 422
+
+
 async def test_get_training_unit_by_id_owner_returns_it(
     client: AsyncClient, world: UnitWorld
 ) -> None:
@@ -623,3 +648,31 @@ async def test_set_prescription_not_owned_unit_returns_404(
         headers=world.other_headers,
     )
     assert response.status_code == 404
+
+
+async def test_get_training_units_by_ids_scopes_to_owner(
+    client: AsyncClient, world: UnitWorld
+) -> None:
+    own, foreign = world.other_units[0], world.owner_units[0]
+    response = await client.get(
+        "/api/v1/training-units/",
+        params={"ids": f"{own.id},{foreign.id},999999"},
+        headers=world.other_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    # Someone else's unit is reported exactly like a missing one.
+    assert [u["id"] for u in body["items"]] == [own.id]
+    assert body["missing"] == [foreign.id, 999999]
+
+
+async def test_get_training_units_by_ids_superuser_is_unscoped(
+    client: AsyncClient, world: UnitWorld
+) -> None:
+    ids = [world.other_units[0].id, world.owner_units[1].id]
+    response = await client.get(
+        "/api/v1/training-units/",
+        params={"ids": ",".join(map(str, ids))},
+        headers=world.owner_headers,
+    )
+    assert [u["id"] for u in response.json()["items"]] == ids
@@ -0,0 +1,262 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from gymhero.database.invalidation import INVALIDATION_BUS, InvalidationBus
+from gymhero.main import app
+from gymhero.models.body_part import BodyPart
+from gymhero.models.exercise import Exercise, ExerciseType
+from gymhero.models.level import Level
+from gymhero.models.user import User
+from gymhero.schemas.common import Page, SortField
+from gymhero.schemas.exercise import ExerciseInDB
+from gymhero.services.catalog_index import ExerciseCatalogIndex
+from gymhero.services.exercise import list_exercises
+from tests.helpers import create_exercise, page_items
+
+
+@pytest.fixture
+async def catalog(
+    db: AsyncSession,
+    regular_user: User,
+    seeded_levels: list[Level],
+    seeded_body_parts: list[BodyPart],
+    seeded_exercise_types: list[ExerciseType],
+) -> list[Exercise]:
+    names = ["Bench Press", "Incline Bench", "Back Squat", "Front Squat", "Deadlift", "Press Up"]
+    return [
+        await create_exercise(
+            db,
+            owner=regular_user,
+            name=name,
+            level=seeded_levels[i % 3],
+            body_part=seeded_body_parts[i % 2],
+            exercise_type=seeded_exercise_types[i % 3],
+            equipment="Barbell" if "Squat" in name or "Bench" in name else None,
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+@pytest.fixture
+def bus() -> InvalidationBus:
+    return InvalidationBus()
+
+
+@pytest.fixture
+def factory(engine: AsyncEngine, bus: InvalidationBus) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False, info={INVALIDATION_BUS: bus})
+
+
+@pytest.fixture
+async def index(
+    catalog: list[Exercise], bus: InvalidationBus, factory: async_sessionmaker[AsyncSession]
+) -> ExerciseCatalogIndex:
+    index = ExerciseCatalogIndex()
+    index.subscribe(bus)
+    await index.load(factory)
+    return index
+
+
+async def _settled(index: ExerciseCatalogIndex) -> None:
+    for _ in range(100):
+        if index.ready:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("index never caught up")
+
+
+def _dump(items: object) -> list[dict[str, object]]:
+    return Page[ExerciseInDB].model_validate(
+        {"items": items, "total": 0, "skip": 0, "limit": 1}, from_attributes=True
+    ).model_dump()["items"]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        lambda levels, parts, types: {},
+        lambda levels, parts, types: {"q": "bench"},
+        lambda levels, parts, types: {"q": "SQU"},
+        lambda levels, parts, types: {"q": "up"},
+        lambda levels, parts, types: {"q": "nothing like it"},
+        lambda levels, parts, types: {"level_id": levels[0].id},
+        lambda levels, parts, types: {"level_id": levels[1].id, "target_body_part_id": parts[1].id},
+        lambda levels, parts, types: {"q": "press", "exercise_type_id": types[0].id},
+        lambda levels, parts, types: {"skip": 2, "limit": 3},
+        lambda levels, parts, types: {"equipment": "Barbell"},
+        lambda levels, parts, types: {"equipment": "Barbell", "q": "squat"},
+        lambda levels, parts, types: {"sort": SortField.CREATED_AT, "descending": True},
+        lambda levels, parts, types: {"sort": SortField.UPDATED_AT, "q": "press"},
+        lambda levels, parts, types: {"descending": True, "skip": 1, "limit": 2},
+    ],
+)
+async def test_index_answers_like_postgres(
+    db: AsyncSession,
+    index: ExerciseCatalogIndex,
+    seeded_levels: list[Level],
+    seeded_body_parts: list[BodyPart],
+    seeded_exercise_types: list[ExerciseType],
+    filters: Callable[..., dict[str, Any]],
+) -> None:
+    query = filters(seeded_levels, seeded_body_parts, seeded_exercise_types)
+    from_db, total = await list_exercises(db, **query)
+    from_index, index_total = await list_exercises(db, index=index, **query)
+    assert index_total == total
+    assert _dump(from_index) == _dump(from_db)
+
+
+async def test_like_wildcards_go_to_postgres(index: ExerciseCatalogIndex) -> None:
+    assert index.search(q="Bench%") is None
+    assert index.search(q="Bench") is not None
+
+
+async def test_name_order_goes_to_postgres(index: ExerciseCatalogIndex) -> None:
+    # Postgres orders names by its collation, which str comparison doesn't match.
+    assert index.search(sort=SortField.NAME) is None
+    assert index.search(sort=SortField.CREATED_AT) is not None
+
+
+async def test_writes_are_applied_incrementally(
+    index: ExerciseCatalogIndex,
+    factory: async_sessionmaker[AsyncSession],
+    catalog: list[Exercise],
+) -> None:
+    async with factory() as session:
+        squat = await session.get(Exercise, catalog[2].id)
+        assert squat is not None
+        squat.name = "Box Squat"
+        await session.delete(await session.get(Exercise, catalog[4].id))
+        session.add(
+            Exercise(
+                name="Goblet Squat",
+                target_body_part_id=squat.target_body_part_id,
+                exercise_type_id=squat.exercise_type_id,
+                level_id=squat.level_id,
+                owner_id=squat.owner_id,
+            )
+        )
+        level = await session.get(Level, squat.level_id)
+        assert level is not None
+        level.name = "Expert"
+        await session.commit()
+
+    # Committed but not re-read yet: the index defers to Postgres.
+    assert index.search() is None
+    await _settled(index)
+
+    names = {item.name: item for item in index.search(q="squat", limit=10)[0]}  # type: ignore[index]
+    assert set(names) == {"Box Squat", "Front Squat", "Goblet Squat"}
+    assert names["Box Squat"].level.name == "Expert"
+    assert index.search(q="deadlift") == ([], 0)
+    assert len(index) == len(catalog)
+
+
+async def test_reset_reloads_the_index(
+    db: AsyncSession, index: ExerciseCatalogIndex, bus: InvalidationBus, regular_user: User
+) -> None:
+    # Written without telling the bus, as by another worker while disconnected.
+    await create_exercise(db, owner=regular_user, name="Hip Thrust")
+    bus.reset()
+    await _settled(index)
+    assert index.search(q="thrust")[1] == 1  # type: ignore[index]
+
+
+async def test_catalog_route_serves_from_the_index(
+    client: AsyncClient,
+    index: ExerciseCatalogIndex,
+    user_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def no_query(*args: object, **kwargs: object) -> None:
+        raise AssertionError("queried Postgres")
+
+    monkeypatch.setattr("gymhero.services.exercise.exercise_crud.get_many", no_query)
+    app.state.exercise_index = index
+    try:
+        response = await client.get(
+            "/api/v1/exercises/all", params={"q": "press"}, headers=user_headers
+        )
+    finally:
+        app.state.exercise_index = None
+    assert response.status_code == 200
+    assert {item["name"] for item in page_items(response)} == {"Bench Press", "Press Up"}
+
+
+async def _same_as_postgres(
+    index: ExerciseCatalogIndex, factory: async_sessionmaker[AsyncSession], **query: Any
+) -> None:
+    async with factory() as session:
+        from_db, total = await list_exercises(session, **query)
+    assert index.search(**query) is not None
+    from_index, index_total = await list_exercises(session, index=index, **query)
+    assert (index_total, _dump(from_index)) == (total, _dump(from_db))
+
+
+async def test_updates_are_applied_in_place(
+    index: ExerciseCatalogIndex,
+    factory: async_sessionmaker[AsyncSession],
+    catalog: list[Exercise],
+    seeded_levels: list[Level],
+    seeded_body_parts: list[BodyPart],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def no_compaction() -> None:
+        raise AssertionError("rebuilt the index")
+
+    monkeypatch.setattr(index, "_compact", no_compaction)
+    slots = len(index._ids)
+    async with factory() as session:
+        bench = await session.get(Exercise, catalog[0].id)
+        assert bench is not None
+        bench.name = "Floor Press"
+        bench.equipment = "Dumbbell"
+        bench.level_id = seeded_levels[2].id
+        bench.target_body_part_id = seeded_body_parts[1].id
+        await session.commit()
+    await _settled(index)
+
+    assert len(index._ids) == slots
+    for query in (
+        {},
+        {"q": "bench"},
+        {"q": "floor"},
+        {"equipment": "Barbell"},
+        {"equipment": "Dumbbell"},
+        {"level_id": seeded_levels[0].id},
+        {"level_id": seeded_levels[2].id},
+        {"target_body_part_id": seeded_body_parts[1].id, "q": "press"},
+    ):
+        await _same_as_postgres(index, factory, **query)
+
+
+async def test_ids_inserted_out_of_order_are_served_in_id_order(
+    index: ExerciseCatalogIndex,
+    factory: async_sessionmaker[AsyncSession],
+    catalog: list[Exercise],
+) -> None:
+    first = catalog[0]
+    async with factory() as session:
+        await session.delete(await session.get(Exercise, first.id))
+        await session.commit()
+    await _settled(index)
+    async with factory() as session:
+        session.add(
+            Exercise(
+                id=first.id,
+                name="Bench Press",
+                target_body_part_id=first.target_body_part_id,
+                exercise_type_id=first.exercise_type_id,
+                level_id=first.level_id,
+                owner_id=first.owner_id,
+            )
+        )
+        await session.commit()
+    await _settled(index)
+
+    for query in ({}, {"descending": True}, {"q": "press"}, {"skip": 1, "limit": 3}):
+        await _same_as_postgres(index, factory, **query)
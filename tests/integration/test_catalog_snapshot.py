@@ -0,0 +1,184 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import msgpack
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from gymhero.database.invalidation import INVALIDATION_BUS, InvalidationBus
+from gymhero.main import app
+from gymhero.models.exercise import Exercise
+from gymhero.models.level import Level
+from gymhero.models.user import User
+from gymhero.services.catalog_snapshot import (
+    CatalogSnapshot,
+    CatalogSnapshotStore,
+    SnapshotError,
+)
+from scripts.core.snapshot import build_snapshot
+from tests.helpers import create_exercise
+
+
+@pytest.fixture
+async def catalog(db: AsyncSession, regular_user: User) -> list[Exercise]:
+    return [
+        await create_exercise(db, owner=regular_user, name=name)
+        for name in ("Squat", "Bench Press", "Deadlift")
+    ]
+
+
+@pytest.fixture
+def path(tmp_path: Path, sync_session: Session, catalog: list[Exercise]) -> Path:
+    path = tmp_path / "catalog.snapshot"
+    build_snapshot(sync_session, path)
+    return path
+
+
+@pytest.fixture
+def bus() -> InvalidationBus:
+    return InvalidationBus()
+
+
+@pytest.fixture
+def factory(engine: AsyncEngine, bus: InvalidationBus) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False, info={INVALIDATION_BUS: bus})
+
+
+@pytest.fixture
+async def store(
+    path: Path, bus: InvalidationBus, factory: async_sessionmaker[AsyncSession]
+) -> AsyncGenerator[CatalogSnapshotStore]:
+    store = CatalogSnapshotStore(path)
+    store.subscribe(bus)
+    assert await store.refresh(factory)
+    app.state.catalog_snapshot = store
+    yield store
+    app.state.catalog_snapshot = None
+
+
+async def test_snapshot_serves_the_same_bytes_as_postgres(
+    client: AsyncClient,
+    catalog: list[Exercise],
+    path: Path,
+    user_headers: dict[str, str],
+    factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = f"/api/v1/exercises/{catalog[1].id}"
+    from_db = await client.get(url, headers=user_headers)
+
+    async def no_query(*args: object, **kwargs: object) -> None:
+        raise AssertionError("queried Postgres")
+
+    monkeypatch.setattr("gymhero.services.exercise.get_exercise", no_query)
+    store = CatalogSnapshotStore(path)
+    assert await store.refresh(factory)
+    app.state.catalog_snapshot = store
+    try:
+        from_snapshot = await client.get(url, headers=user_headers)
+    finally:
+        app.state.catalog_snapshot = None
+    assert from_snapshot.status_code == 200
+    assert from_snapshot.content == from_db.content
+
+
+async def test_snapshot_fragments_are_served_as_msgpack(
+    client: AsyncClient,
+    catalog: list[Exercise],
+    store: CatalogSnapshotStore,
+    user_headers: dict[str, str],
+) -> None:
+    url = f"/api/v1/exercises/{catalog[1].id}"
+    as_json = await client.get(url, headers=user_headers)
+    packed = await client.get(
+        url, headers={**user_headers, "Accept": "application/msgpack"}
+    )
+    assert packed.status_code == 200
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content) == as_json.json()
+
+
+async def test_exercises_written_after_the_check_come_from_postgres(
+    client: AsyncClient,
+    catalog: list[Exercise],
+    store: CatalogSnapshotStore,
+    factory: async_sessionmaker[AsyncSession],
+    user_headers: dict[str, str],
+) -> None:
+    async with factory() as session:
+        squat = await session.get(Exercise, catalog[0].id)
+        assert squat is not None
+        squat.name = "Back Squat"
+        await session.commit()
+    url = f"/api/v1/exercises/{catalog[0].id}"
+    assert store.fragment(catalog[0].id) is None
+    assert (await client.get(url, headers=user_headers)).json()["name"] == "Back Squat"
+    assert store.fragment(catalog[1].id) is not None
+
+
+async def test_rows_changed_before_the_check_are_not_served(
+    db: AsyncSession,
+    catalog: list[Exercise],
+    path: Path,
+    factory: async_sessionmaker[AsyncSession],
+) -> None:
+    catalog[2].description = "Hinge"
+    await db.commit()
+    store = CatalogSnapshotStore(path)
+    assert await store.refresh(factory)
+    assert store.fragment(catalog[2].id) is None
+    assert store.fragment(catalog[0].id) is not None
+
+
+async def test_reference_write_retires_the_snapshot_until_a_rebuild(
+    catalog: list[Exercise],
+    path: Path,
+    sync_session: Session,
+    store: CatalogSnapshotStore,
+    factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with factory() as session:
+        level = await session.get(Level, catalog[0].level_id)
+        assert level is not None
+        level.name = "Expert"
+        await session.commit()
+    assert store.fragment(catalog[0].id) is None
+    assert not await store.refresh(factory)
+
+    build_snapshot(sync_session, path)
+    assert await store.refresh(factory)
+    body = store.fragment(catalog[0].id)
+    assert body is not None and b'"Expert"' in bytes(body)
+
+
+async def test_views_into_a_replaced_version_stay_valid(
+    catalog: list[Exercise],
+    path: Path,
+    sync_session: Session,
+    store: CatalogSnapshotStore,
+    factory: async_sessionmaker[AsyncSession],
+) -> None:
+    old = store.fragment(catalog[0].id)
+    assert old is not None
+    before = bytes(old)
+
+    build_snapshot(sync_session, path)
+    assert await store.refresh(factory)
+    assert not await store.refresh(factory)  # unchanged file: nothing to swap
+    assert bytes(old) == before
+
+
+@pytest.mark.parametrize("content", [b"", b"not a snapshot at all, but long enough to read"])
+def test_unreadable_files_are_rejected(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(content)
+    with pytest.raises(SnapshotError):
+        CatalogSnapshot(path)
+
+
+def test_truncated_files_are_rejected(path: Path) -> None:
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(SnapshotError, match="truncated"):
+        CatalogSnapshot(path)
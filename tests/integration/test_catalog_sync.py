@@ -0,0 +1,229 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from gymhero.models.catalog import CatalogEntry, CatalogMetadata
+from gymhero.models.exercise import Exercise
+from gymhero.models.level import Level
+from gymhero.models.training_unit import TrainingUnit, TrainingUnitExercise
+from gymhero.models.user import User
+from scripts.core.sync import CATALOG_NAME, sync_catalog
+
+HEADER = "Title,Desc,Type,BodyPart,Level\n"
+CSV = HEADER + (
+    "Squat,Barbell back squat,Strength,Legs,Beginner\n"
+    "Bench press,,Strength,Chest,Intermediate\n"
+    "Deadlift,Hinge,Strength,Back,Advanced\n"
+)
+
+
+@pytest.fixture
+def owner(sync_session: Session) -> User:
+    user = User(email="seed@example.com", hashed_password="x", is_superuser=True)
+    sync_session.add(user)
+    sync_session.commit()
+    return user
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "exercises.csv"
+    path.write_text(CSV)
+    return path
+
+
+def _descriptions(session: Session) -> dict[str, str | None]:
+    return dict(session.execute(select(Exercise.name, Exercise.description)).all())
+
+
+def test_first_sync_inserts_catalog_and_records_version(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    # chunk_size=2 forces several COPY round trips.
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path, chunk_size=2)
+
+    assert (stats.version, stats.inserted, stats.updated, stats.deleted) == (1, 3, 0, 0)
+    assert stats.staged == 3 and stats.rows_per_second > 0
+    assert _descriptions(sync_session) == {
+        "Squat": "Barbell back squat",
+        "Bench press": None,
+        "Deadlift": "Hinge",
+    }
+    assert len(sync_session.scalars(select(CatalogEntry)).all()) == 3
+    assert sync_session.get(CatalogMetadata, CATALOG_NAME).version == 1
+
+
+def test_unchanged_file_is_a_no_op(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert not stats.changed
+    assert stats.version == 1
+
+
+def test_forced_sync_of_unchanged_rows_writes_nothing(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path, force=True)
+
+    assert not stats.changed
+    assert stats.version == 1
+
+
+def test_sync_applies_only_the_diff(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    csv_path.write_text(
+        HEADER
+        + "Squat,Front squat,Strength,Legs,Beginner\n"
+        + "Bench press,,Strength,Chest,Intermediate\n"
+        + "Lunge,,Strength,Legs,Beginner\n"
+    )
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert (stats.version, stats.inserted, stats.updated, stats.deleted) == (2, 1, 1, 1)
+    assert _descriptions(sync_session) == {
+        "Squat": "Front squat",
+        "Bench press": None,
+        "Lunge": None,
+    }
+
+
+def test_sync_never_touches_user_exercises(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    user = User(email="user@example.com", hashed_password="x")
+    squat = sync_session.scalars(select(Exercise).where(Exercise.name == "Squat")).one()
+    sync_session.add(user)
+    sync_session.flush()
+    sync_session.add(
+        Exercise(
+            name="My curl",
+            target_body_part_id=squat.target_body_part_id,
+            exercise_type_id=squat.exercise_type_id,
+            level_id=squat.level_id,
+            owner_id=user.id,
+        )
+    )
+    sync_session.commit()
+    csv_path.write_text(HEADER + "My curl,Catalog curl,Strength,Arms,Beginner\n")
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert stats.inserted == 0
+    assert _descriptions(sync_session) == {"My curl": None}
+
+
+def test_removed_exercise_in_use_is_detached_not_deleted(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    deadlift = sync_session.scalars(
+        select(Exercise).where(Exercise.name == "Deadlift")
+    ).one()
+    unit = TrainingUnit(name="Pull day", owner_id=owner.id)
+    unit.exercises.append(TrainingUnitExercise(exercise_id=deadlift.id))
+    sync_session.add(unit)
+    sync_session.commit()
+    csv_path.write_text(CSV.replace("Deadlift,Hinge,Strength,Back,Advanced\n", ""))
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert stats.deleted == 0
+    assert "Deadlift" in _descriptions(sync_session)
+    assert sync_session.get(CatalogEntry, deadlift.id) is None
+
+
+def test_sync_adopts_catalog_seeded_without_hashes(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    sync_session.execute(delete(CatalogEntry))
+    sync_session.execute(delete(CatalogMetadata))
+    sync_session.commit()
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    # Adopted rows are rewritten once, so later diffs see their hashes.
+    assert (stats.inserted, stats.updated) == (0, 3)
+    assert len(sync_session.scalars(select(CatalogEntry)).all()) == 3
+    forced = sync_catalog(sync_session, owner.id, csv_path=csv_path, force=True)
+    assert not forced.changed
+
+
+def test_limit_caps_the_catalog(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path, limit=2)
+
+    assert stats.deleted == 1
+    assert set(_descriptions(sync_session)) == {"Squat", "Bench press"}
+
+
+def test_equipment_is_synced_when_the_file_has_it(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    csv_path.write_text(
+        "Title,Desc,Type,BodyPart,Equipment,Level\n"
+        "Squat,Barbell back squat,Strength,Legs,Barbell,Beginner\n"
+        "Bench press,,Strength,Chest,,Intermediate\n"
+        "Deadlift,Hinge,Strength,Back,Barbell,Advanced\n"
+    )
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert (stats.inserted, stats.updated, stats.deleted) == (0, 2, 0)
+    assert dict(sync_session.execute(select(Exercise.name, Exercise.equipment)).all()) == {
+        "Squat": "Barbell",
+        "Bench press": None,
+        "Deadlift": "Barbell",
+    }
+
+
+def test_first_occurrence_per_title_wins(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    csv_path.write_text(CSV + "Squat,Later duplicate,Strength,Legs,Expert\n")
+
+    stats = sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+    assert (stats.staged, stats.inserted) == (4, 3)
+    assert _descriptions(sync_session)["Squat"] == "Barbell back squat"
+    # The reference catalog covers every staged row, duplicates included.
+    assert "Expert" in set(sync_session.scalars(select(Level.name)))
+
+
+def test_rows_missing_a_reference_are_rejected(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    csv_path.write_text(CSV + "Plank,,Strength,Core,\n")
+
+    with pytest.raises(ValueError, match="1 rows have no level.*'Plank'"):
+        sync_catalog(sync_session, owner.id, csv_path=csv_path)
+
+
+def test_unresolved_row_fails_before_its_exercise_is_deleted(
+    sync_session: Session, owner: User, csv_path: Path
+) -> None:
+    sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    csv_path.write_text(CSV.replace("Hinge,Strength,Back,Advanced", "Hinge,Strength,,"))
+
+    with pytest.raises(ValueError, match="'Deadlift'"):
+        sync_catalog(sync_session, owner.id, csv_path=csv_path)
+    sync_session.rollback()
+
+    deadlift = sync_session.scalars(
+        select(Exercise).where(Exercise.name == "Deadlift")
+    ).one()
+    assert sync_session.get(CatalogEntry, deadlift.id) is not None
+    assert sync_session.get(CatalogMetadata, CATALOG_NAME).version == 1
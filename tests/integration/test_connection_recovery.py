@@ -0,0 +1,87 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from gymhero.database.health import ping_idle_connections
+from gymhero.database.session import get_async_engine, get_async_session_factory
+from gymhero.models.level import Level
+
+
+@pytest.fixture
+async def pooled_engine(_async_url: str) -> AsyncGenerator[AsyncEngine]:
+    # A single pooled connection, so every checkout reuses the one we kill.
+    pooled = get_async_engine(_async_url, pool_size=1, max_overflow=0)
+    yield pooled
+    await pooled.dispose()
+
+
+async def _backend_pid(pooled_engine: AsyncEngine) -> int:
+    async with pooled_engine.connect() as conn:
+        return (await conn.execute(select(func.pg_backend_pid()))).scalar_one()
+
+
+async def _terminate(engine: AsyncEngine, pid: int) -> None:
+    # Simulates the server (or a proxy) dropping a connection idle in our pool.
+    async with engine.connect() as conn:
+        await conn.execute(
+            text("SELECT pg_terminate_backend(:pid, 5000)"), {"pid": pid}
+        )
+
+
+async def test_stale_connection_read_is_retried(
+    engine: AsyncEngine, pooled_engine: AsyncEngine
+) -> None:
+    stale_pid = await _backend_pid(pooled_engine)
+    await _terminate(engine, stale_pid)
+
+    async with get_async_session_factory(pooled_engine)() as session:
+        result = await session.execute(select(func.pg_backend_pid()))
+        assert result.scalar_one() != stale_pid
+
+
+async def test_stale_connection_get_is_retried(
+    engine: AsyncEngine, pooled_engine: AsyncEngine
+) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(insert(Level).values(name="Elite"))
+    await _terminate(engine, await _backend_pid(pooled_engine))
+
+    async with get_async_session_factory(pooled_engine)() as session:
+        level = await session.get(Level, 1)
+    assert level is not None and level.name == "Elite"
+
+
+async def test_stale_connection_write_is_not_retried(
+    engine: AsyncEngine, pooled_engine: AsyncEngine
+) -> None:
+    await _terminate(engine, await _backend_pid(pooled_engine))
+
+    async with get_async_session_factory(pooled_engine)() as session:
+        with pytest.raises(DBAPIError) as exc_info:
+            await session.execute(insert(Level).values(name="Elite"))
+    assert exc_info.value.connection_invalidated
+
+
+async def test_ping_idle_connections_pings_each_idle_connection(
+    pooled_engine: AsyncEngine,
+) -> None:
+    await _backend_pid(pooled_engine)
+    assert await ping_idle_connections(pooled_engine) == 1
+
+
+async def test_ping_idle_connections_replaces_stale_connection(
+    engine: AsyncEngine, pooled_engine: AsyncEngine
+) -> None:
+    stale_pid = await _backend_pid(pooled_engine)
+    await _terminate(engine, stale_pid)
+
+    assert await ping_idle_connections(pooled_engine) == 0
+    # The sweep absorbed the failure; the next request gets a live connection.
+    assert await _backend_pid(pooled_engine) != stale_pid
+
+
+async def test_ping_idle_connections_skips_null_pool(engine: AsyncEngine) -> None:
+    assert await ping_idle_connections(engine) == 0
@@ -0,0 +1,77 @@
+import msgpack
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from gymhero.models.user import User
+from tests.helpers import create_exercise, create_training_plan, create_training_unit
+
+MSGPACK = {"Accept": "application/msgpack"}
+
+
+async def test_responses_carry_the_json_body_as_msgpack(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    exercise = await create_exercise(db, owner=regular_user, name="Squat")
+    for url, params in (
+        ("/api/v1/exercises/my", {}),
+        (f"/api/v1/exercises/{exercise.id}", {}),
+        (f"/api/v1/exercises/{exercise.id}", {"fields": "name,level"}),
+        ("/api/v1/levels/all", {}),
+        ("/api/v1/auth/me", {}),
+    ):
+        as_json = await client.get(url, params=params, headers=user_headers)
+        packed = await client.get(url, params=params, headers={**user_headers, **MSGPACK})
+        assert packed.status_code == 200
+        assert packed.headers["content-type"] == "application/msgpack"
+        assert "Accept" in packed.headers["vary"] and "Accept" in as_json.headers["vary"]
+        assert msgpack.unpackb(packed.content) == as_json.json()
+        assert len(packed.content) < len(as_json.content)
+
+
+async def test_cached_bodies_are_kept_per_format(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    unit = await create_training_unit(db, owner=regular_user)
+    plan = await create_training_plan(db, owner=regular_user, training_units=[unit])
+    url = f"/api/v1/training-plans/{plan.id}"
+
+    as_json = await client.get(url, headers=user_headers)
+    first = await client.get(url, headers={**user_headers, **MSGPACK})
+    second = await client.get(url, headers={**user_headers, **MSGPACK})
+    assert [first.headers["X-Cache"], second.headers["X-Cache"]] == ["miss", "hit"]
+    assert second.content == first.content
+    assert msgpack.unpackb(second.content) == as_json.json()
+    again = await client.get(url, headers=user_headers)
+    assert again.headers["X-Cache"] == "hit" and again.content == as_json.content
+
+
+async def test_msgpack_request_bodies(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    unit = await create_training_unit(db, owner=regular_user, name="Legs")
+    response = await client.put(
+        f"/api/v1/training-units/{unit.id}",
+        content=msgpack.packb({"name": "Arms"}),
+        headers={**user_headers, "Content-Type": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "Arms"
+
+
+async def test_malformed_and_invalid_msgpack_bodies(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    unit = await create_training_unit(db, owner=regular_user)
+    url = f"/api/v1/training-units/{unit.id}"
+    headers = {**user_headers, **MSGPACK, "Content-Type": "application/msgpack"}
+
+    malformed = await client.put(url, content=b"\xc1", headers=headers)
+    assert malformed.status_code == 400
+    # Errors are JSON whatever was asked for.
+    assert malformed.json() == {"detail": "Malformed MessagePack body"}
+    assert "Accept" in malformed.headers["vary"]
+
+    invalid = await client.put(url, content=msgpack.packb({"name": 5}), headers=headers)
+    assert invalid.status_code == 422
+    assert invalid.headers["content-type"] == "application/json"
+    assert "Accept" in invalid.headers["vary"]
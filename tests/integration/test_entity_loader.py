@@ -0,0 +1,87 @@
+import asyncio
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from gymhero.crud import level_crud
+from gymhero.crud.loader import get_loader
+from gymhero.models.level import Level
+from tests.helpers import create_level
+
+
+@contextmanager
+def _statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    executed: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def levels(db: AsyncSession) -> list[Level]:
+    return [await create_level(db) for _ in range(3)]
+
+
+@pytest.fixture
+async def fresh(
+    engine: AsyncEngine, levels: list[Level]
+) -> AsyncGenerator[AsyncSession]:
+    # An empty identity map, unlike `db` which created the levels.
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+async def test_get_by_id_uses_the_identity_map(
+    engine: AsyncEngine, fresh: AsyncSession, levels: list[Level]
+) -> None:
+    with _statements(engine) as executed:
+        first = await level_crud.get_by_id(fresh, levels[0].id)
+        again = await level_crud.get_by_id(fresh, levels[0].id)
+    assert first is again
+    assert len(executed) == 1
+
+
+async def test_concurrent_loads_share_one_query(
+    engine: AsyncEngine, fresh: AsyncSession, levels: list[Level]
+) -> None:
+    loader = get_loader(fresh, level_crud)
+    with _statements(engine) as executed:
+        loaded = await asyncio.gather(
+            loader.load(levels[2].id),
+            loader.load(levels[0].id),
+            loader.load(levels[2].id),
+            loader.load(10_000),
+        )
+    assert [obj.id if obj else None for obj in loaded] == [
+        levels[2].id,
+        levels[0].id,
+        levels[2].id,
+        None,
+    ]
+    assert len(executed) == 1
+
+
+async def test_load_many_skips_rows_already_in_the_session(
+    engine: AsyncEngine, fresh: AsyncSession, levels: list[Level]
+) -> None:
+    held = await level_crud.get_by_id(fresh, levels[1].id)
+    ids = [level.id for level in levels]
+    with _statements(engine) as executed:
+        found, missing = await get_loader(fresh, level_crud).load_many(ids)
+        again, _ = await get_loader(fresh, level_crud).load_many(ids)
+    assert [obj.id for obj in found] == ids
+    assert found[1] is held
+    assert missing == []
+    # Only the two rows the session didn't hold were queried, once.
+    assert len(executed) == 1
+    assert again == found
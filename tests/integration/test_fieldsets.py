@@ -0,0 +1,177 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from gymhero.models.exercise import Exercise
+from gymhero.models.training_plan import TrainingPlan
+from gymhero.models.user import User
+from tests.helpers import (
+    create_exercise,
+    create_training_plan,
+    create_training_unit,
+    page_items,
+)
+
+
+@contextmanager
+def _statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    executed: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def exercise(db: AsyncSession, regular_user: User) -> Exercise:
+    return await create_exercise(
+        db, owner=regular_user, name="Squat", description="Knees out"
+    )
+
+
+@pytest.fixture
+async def plan(
+    client: AsyncClient,
+    db: AsyncSession,
+    regular_user: User,
+    user_headers: dict[str, str],
+    exercise: Exercise,
+) -> TrainingPlan:
+    unit = await create_training_unit(
+        db, owner=regular_user, name="Legs", exercises=[exercise]
+    )
+    response = await client.patch(
+        f"/api/v1/training-units/{unit.id}/exercises/{exercise.id}",
+        json={"sets": [{"reps": 5, "weight": 100}]},
+        headers=user_headers,
+    )
+    assert response.status_code == 200
+    return await create_training_plan(
+        db, owner=regular_user, name="Strength", training_units=[unit]
+    )
+
+
+async def test_fields_narrow_the_payload_and_the_select(
+    client: AsyncClient,
+    engine: AsyncEngine,
+    exercise: Exercise,
+    user_headers: dict[str, str],
+) -> None:
+    with _statements(engine) as executed:
+        response = await client.get(
+            "/api/v1/exercises/my", params={"fields": "name"}, headers=user_headers
+        )
+    assert page_items(response) == [{"name": "Squat", "id": exercise.id}]
+    selects = [s for s in executed if "FROM exercises" in s and "count" not in s]
+    assert len(selects) == 1 and "description" not in selects[0]
+    # No embedded references asked for, so none loaded.
+    assert not [s for s in executed if "FROM levels" in s]
+
+
+async def test_a_field_naming_a_reference_embeds_it(
+    client: AsyncClient, exercise: Exercise, user_headers: dict[str, str]
+) -> None:
+    response = await client.get(
+        f"/api/v1/exercises/{exercise.id}",
+        params={"fields": "level"},
+        headers=user_headers,
+    )
+    assert response.json() == {
+        "id": exercise.id,
+        "level": {"id": exercise.level_id, "name": exercise.level.name},
+    }
+
+
+async def test_expand_decides_how_deep_a_plan_is_loaded(
+    client: AsyncClient,
+    engine: AsyncEngine,
+    plan: TrainingPlan,
+    user_headers: dict[str, str],
+) -> None:
+    url = f"/api/v1/training-plans/{plan.id}"
+    with _statements(engine) as executed:
+        flat = await client.get(url, params={"expand": ""}, headers=user_headers)
+    assert "training_units" not in flat.json()
+    assert not [s for s in executed if "training_units" in s.split("FROM")[-1]]
+
+    units = await client.get(
+        url, params={"expand": "training_units"}, headers=user_headers
+    )
+    [unit] = units.json()["training_units"]
+    assert unit["name"] == "Legs" and "exercises" not in unit
+
+    deep = await client.get(
+        url,
+        params={"expand": "training_units.exercises.sets"},
+        headers=user_headers,
+    )
+    [link] = deep.json()["training_units"][0]["exercises"]
+    assert link["exercise"]["name"] == "Squat"
+    assert link["sets"] == [{"set_number": 1, "reps": 5, "weight": 100.0}]
+
+
+async def test_the_default_is_the_full_schema(
+    client: AsyncClient, plan: TrainingPlan, user_headers: dict[str, str]
+) -> None:
+    url = f"/api/v1/training-plans/{plan.id}"
+    plain = await client.get(url, headers=user_headers)
+    expanded = await client.get(
+        url,
+        params={"expand": "training_units.exercises.sets"},
+        headers=user_headers,
+    )
+    assert plain.json() == expanded.json()
+    assert plain.json()["training_units"][0]["exercises"][0]["sets"]
+
+
+async def test_sparse_pages_and_batches(
+    client: AsyncClient, plan: TrainingPlan, user_headers: dict[str, str]
+) -> None:
+    page = await client.get(
+        "/api/v1/training-units/all/my",
+        params={"fields": "name", "sort": "name"},
+        headers=user_headers,
+    )
+    assert page_items(page) == [{"name": "Legs", "id": plan.training_units[0].id}]
+    assert page.json()["total"] == 1
+
+    batch = await client.get(
+        "/api/v1/training-plans/",
+        params={"ids": f"{plan.id},999999", "fields": "owner_id"},
+        headers=user_headers,
+    )
+    assert batch.json() == {
+        "items": [{"id": plan.id, "owner_id": plan.owner_id}],
+        "missing": [999999],
+    }
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"fields": "name,password"},
+        {"expand": "owner"},
+        {"expand": "training_units.exercises.exercise"},
+        {"expand": "training_units.nope"},
+    ],
+)
+async def test_unknown_fields_and_paths_are_rejected(
+    client: AsyncClient,
+    plan: TrainingPlan,
+    user_headers: dict[str, str],
+    params: dict[str, str],
+) -> None:
+    response = await client.get(
+        f"/api/v1/training-plans/{plan.id}", params=params, headers=user_headers
+    )
+    assert response.status_code == 422
@@ -1,4 +1,9 @@
+from unittest.mock import PropertyMock
+
 from httpx import AsyncClient
+from pytest_mock import MockerFixture
+
+from gymhero.api.admission import AdmissionController
 
 
 async def test_health_is_public(client: AsyncClient) -> None:
@@ -17,3 +22,23 @@ async def test_request_id_header_present(client: AsyncClient) -> None:
     response = await client.get("/health")
     headers = {key.lower(): value for key, value in response.headers.items()}
     assert "x-request-id" in headers
+
+
+async def test_ready_reports_saturation(
+    client: AsyncClient, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(
+        AdmissionController, "saturated", new_callable=PropertyMock, return_value=True
+    )
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "saturated"}
+
+
+async def test_shed_request_returns_503_with_retry_after(
+    client: AsyncClient, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(AdmissionController, "acquire", return_value=False)
+    response = await client.get("/api/v1/levels/all")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,46 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from scripts.core.indexes import audit, live_schema
+
+
+@pytest.fixture
+def extra_indexes(sync_session: Session) -> Generator[None]:
+    sync_session.execute(text("CREATE INDEX extra_users_id ON users (id)"))
+    sync_session.execute(
+        text("CREATE INDEX extra_level_idx ON exercises (level_id, owner_id)")
+    )
+    sync_session.execute(
+        text("CREATE INDEX extra_partial ON exercises (level_id) WHERE owner_id = 1")
+    )
+    sync_session.execute(text("DROP INDEX training_unit_exercise_exercise_id_idx"))
+    sync_session.commit()
+    yield
+    sync_session.execute(
+        text("DROP INDEX extra_users_id, extra_level_idx, extra_partial")
+    )
+    sync_session.execute(
+        text(
+            "CREATE INDEX training_unit_exercise_exercise_id_idx "
+            "ON training_unit_exercise (exercise_id)"
+        )
+    )
+    sync_session.commit()
+
+
+def test_schema_built_from_the_models_is_clean(sync_session: Session) -> None:
+    assert audit(*live_schema(sync_session)).report() == []
+
+
+@pytest.mark.usefixtures("extra_indexes")
+def test_live_audit_finds_drift(sync_session: Session) -> None:
+    result = audit(*live_schema(sync_session))
+
+    assert [m.foreign_key.columns for m in result.missing] == [("exercise_id",)]
+    assert sorted((r.index.name, r.covered_by.name) for r in result.redundant) == [
+        ("exercises_level_id_idx", "extra_level_idx"),
+        ("extra_users_id", "users_pkey"),
+    ]
@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from gymhero.database.invalidation import Invalidation, InvalidationBus
+from gymhero.database.session import get_async_session_factory
+from gymhero.models.level import Level
+
+
+@pytest.fixture
+async def received(_async_url: str) -> AsyncGenerator[asyncio.Queue[Invalidation]]:
+    bus = InvalidationBus()
+    queue: asyncio.Queue[Invalidation] = asyncio.Queue()
+    connected = asyncio.Event()
+    bus.subscribe(queue.put_nowait, connected.set)
+    dsn = _async_url.replace("postgresql+asyncpg://", "postgresql://")
+    listener = asyncio.create_task(bus.listen(dsn))
+    await asyncio.wait_for(connected.wait(), 10)
+    yield queue
+    listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await listener
+
+
+def _publishing(engine: AsyncEngine) -> AsyncSession:
+    return get_async_session_factory(engine, publish_invalidations=True)()
+
+
+async def test_committed_writes_are_announced(
+    engine: AsyncEngine, received: asyncio.Queue[Invalidation]
+) -> None:
+    async with _publishing(engine) as session:
+        session.add(Level(name="Elite"))
+        await session.commit()
+        level = (await session.execute(select(Level))).scalar_one()
+        created = await asyncio.wait_for(received.get(), 5)
+        assert (created.table, created.id) == ("levels", level.id)
+
+        level.name = "Pro"
+        await session.commit()
+        updated = await asyncio.wait_for(received.get(), 5)
+        assert (updated.table, updated.id) == ("levels", level.id)
+        assert updated.version > created.version
+
+        await session.delete(level)
+        await session.commit()
+        deleted = await asyncio.wait_for(received.get(), 5)
+        assert (deleted.table, deleted.id) == ("levels", level.id)
+
+
+async def test_rolled_back_writes_are_not_announced(
+    engine: AsyncEngine, received: asyncio.Queue[Invalidation]
+) -> None:
+    async with _publishing(engine) as session:
+        session.add(Level(name="Elite"))
+        await session.flush()
+        await session.rollback()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(received.get(), 0.5)
+
+
+async def test_plain_sessions_do_not_publish(
+    db: AsyncSession, received: asyncio.Queue[Invalidation]
+) -> None:
+    db.add(Level(name="Elite"))
+    await db.commit()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(received.get(), 0.5)
+
+
+async def test_sessions_with_a_bus_tell_it_on_commit(engine: AsyncEngine) -> None:
+    bus = InvalidationBus()
+    received: list[Invalidation] = []
+    bus.subscribe(received.append, lambda: None, remote=False)
+    factory = get_async_session_factory(engine, invalidation_bus=bus)
+
+    async with factory() as session:
+        session.add(Level(name="Elite"))
+        await session.flush()
+        assert received == []
+        await session.commit()
+    assert [(event.table, event.version > 0) for event in received] == [("levels", True)]
+
+    async with factory() as session:
+        session.add(Level(name="Pro"))
+        await session.flush()
+        await session.rollback()
+    assert len(received) == 1
@@ -33,3 +33,17 @@ async def test_unhandled_error_returns_clean_500_with_request_id(
     assert response.status_code == 500
     assert response.json()["detail"] == "Internal server error"
     assert response.headers["x-request-id"] == "trace-500"
+
+
+async def test_request_id_is_set_on_cors_preflight(client: AsyncClient) -> None:
+    # The request-id middleware wraps CORS, so even short-circuited preflights
+    # carry the id back.
+    response = await client.options(
+        "/api/v1/levels/all",
+        headers={
+            "Origin": "http://example.com",
+            "Access-Control-Request-Method": "GET",
+            "X-Request-ID": "trace-preflight",
+        },
+    )
+    assert response.headers["x-request-id"] == "trace-preflight"
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.types import Message
+
+from gymhero.config import settings
+from gymhero.crud.base import CRUDRepository
+from gymhero.main import app
+
+LIST_URL = "/api/v1/levels/all"
+
+
+async def _slow_get_many(
+    self: CRUDRepository[Any], db: AsyncSession, *filters: Any, **kwargs: Any
+) -> list[Any]:
+    await db.execute(select(func.pg_sleep(30)))
+    return []
+
+
+@pytest.fixture
+def slow_list(mocker: MockerFixture) -> None:
+    mocker.patch.object(CRUDRepository, "get_many", _slow_get_many)
+
+
+async def test_request_timeout_header_cancels_slow_query(
+    client: AsyncClient, slow_list: None
+) -> None:
+    start = time.monotonic()
+    response = await client.get(LIST_URL, headers={"X-Request-Timeout": "0.2"})
+    assert response.status_code == 504
+    assert response.json()["detail"] == "Request timed out"
+    assert time.monotonic() - start < 5
+
+
+async def test_route_timeout_setting_applies_without_header(
+    client: AsyncClient, slow_list: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_ROUTES", f"{LIST_URL}=0.2")
+    response = await client.get(LIST_URL)
+    assert response.status_code == 504
+
+
+async def test_request_timeout_header_is_capped(
+    client: AsyncClient, slow_list: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX_SECONDS", 0.2)
+    response = await client.get(LIST_URL, headers={"X-Request-Timeout": "300"})
+    assert response.status_code == 504
+
+
+async def test_pool_timeout_returns_503_with_retry_after(
+    client: AsyncClient, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(
+        CRUDRepository, "get_many", side_effect=PoolTimeoutError("pool exhausted")
+    )
+    response = await client.get(LIST_URL)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+async def test_client_disconnect_cancels_in_flight_query(
+    client: AsyncClient, engine: AsyncEngine, slow_list: None
+) -> None:
+    # Drive the app directly: httpx can't hang up mid-request.
+    async def receive() -> Message:
+        if not requested.is_set():
+            requested.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(0.5)  # the query is running by now
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    requested = asyncio.Event()
+    sent: list[Message] = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": LIST_URL,
+        "raw_path": LIST_URL.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test")],
+        "client": ("testclient", 1234),
+        "server": ("test", 80),
+    }
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    assert sent == []
+    assert scope["state"]["client_disconnected"] is True
+    # The cancel request reaches the server asynchronously; give it a moment.
+    for _ in range(20):
+        async with engine.connect() as conn:
+            sleeping = await conn.scalar(
+                text(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE state = 'active' AND query LIKE '%pg_sleep%' "
+                    "AND pid <> pg_backend_pid()"
+                )
+            )
+        if sleeping == 0:
+            break
+        await asyncio.sleep(0.1)
+    assert sleeping == 0
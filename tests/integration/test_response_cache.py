@@ -0,0 +1,131 @@
+from collections.abc import Iterator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from gymhero.api.singleflight import SingleFlight
+from gymhero.main import app
+from gymhero.models.user import User
+from tests.helpers import (
+    create_exercise,
+    create_training_plan,
+    create_training_unit,
+    page_items,
+)
+
+
+@pytest.fixture
+def remembering_flight(monkeypatch: pytest.MonkeyPatch) -> Iterator[SingleFlight]:
+    flight: SingleFlight = app.state.single_flight
+    monkeypatch.setattr(flight, "window", 60.0)
+    yield flight
+    flight.clear()
+
+
+async def test_training_plan_detail_is_cached_until_the_plan_changes(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    plan = await create_training_plan(db, owner=regular_user, name="Push")
+    url = f"/api/v1/training-plans/{plan.id}"
+
+    first = await client.get(url, headers=user_headers)
+    second = await client.get(url, headers=user_headers)
+    assert [first.headers["X-Cache"], second.headers["X-Cache"]] == ["miss", "hit"]
+    assert second.content == first.content
+
+    await client.put(url, json={"name": "Pull"}, headers=user_headers)
+    updated = await client.get(url, headers=user_headers)
+    assert updated.headers["X-Cache"] == "miss"
+    assert updated.json()["name"] == "Pull"
+
+
+async def test_cached_detail_is_not_served_outside_the_owner_scope(
+    client: AsyncClient,
+    db: AsyncSession,
+    regular_user: User,
+    user_headers: dict[str, str],
+    other_user_headers: dict[str, str],
+    superuser_headers: dict[str, str],
+) -> None:
+    unit = await create_training_unit(db, owner=regular_user)
+    url = f"/api/v1/training-units/{unit.id}"
+    assert (await client.get(url, headers=user_headers)).status_code == 200
+
+    assert (await client.get(url, headers=other_user_headers)).status_code == 404
+    as_superuser = await client.get(url, headers=superuser_headers)
+    assert as_superuser.status_code == 200
+    assert as_superuser.headers["X-Cache"] == "miss"
+
+
+async def test_prescription_change_invalidates_the_unit_and_its_plans(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    exercise = await create_exercise(db, owner=regular_user)
+    unit = await create_training_unit(db, owner=regular_user, exercises=[exercise])
+    plan = await create_training_plan(db, owner=regular_user, training_units=[unit])
+    unit_url = f"/api/v1/training-units/{unit.id}"
+    plan_url = f"/api/v1/training-plans/{plan.id}"
+    for url in (unit_url, plan_url, unit_url, plan_url):
+        await client.get(url, headers=user_headers)
+
+    response = await client.patch(
+        f"{unit_url}/exercises/{exercise.id}",
+        json={"sets": [{"reps": 5, "weight": 100}]},
+        headers=user_headers,
+    )
+    assert response.status_code == 200
+
+    for url, sets_of in ((unit_url, lambda body: body), (plan_url, lambda body: body["training_units"][0])):
+        refreshed = await client.get(url, headers=user_headers)
+        assert refreshed.headers["X-Cache"] == "miss"
+        assert sets_of(refreshed.json())["exercises"][0]["sets"] == [
+            {"set_number": 1, "reps": 5, "weight": 100.0}
+        ]
+
+
+async def test_exercise_catalog_is_invalidated_by_new_exercises(
+    client: AsyncClient, db: AsyncSession, regular_user: User, user_headers: dict[str, str]
+) -> None:
+    exercise = await create_exercise(db, owner=regular_user, name="Squat")
+    url = "/api/v1/exercises/all"
+    assert page_items(await client.get(url, headers=user_headers))[0]["name"] == "Squat"
+    assert (await client.get(url, headers=user_headers)).headers["X-Cache"] == "hit"
+
+    await client.post(
+        "/api/v1/exercises/",
+        json={
+            "name": "Deadlift",
+            "target_body_part_id": exercise.target_body_part_id,
+            "exercise_type_id": exercise.exercise_type_id,
+            "level_id": exercise.level_id,
+        },
+        headers=user_headers,
+    )
+    refreshed = await client.get(url, headers=user_headers)
+    assert refreshed.headers["X-Cache"] == "miss"
+    assert {item["name"] for item in page_items(refreshed)} == {"Squat", "Deadlift"}
+
+
+async def test_single_flight_window_is_invalidated_by_lookup_renames(
+    client: AsyncClient,
+    db: AsyncSession,
+    regular_user: User,
+    user_headers: dict[str, str],
+    superuser_headers: dict[str, str],
+    remembering_flight: SingleFlight,
+) -> None:
+    exercise = await create_exercise(db, owner=regular_user)
+    url = "/api/v1/exercises/my"
+    await client.get(url, headers=user_headers)
+    remembered = await client.get(url, headers=user_headers)
+    assert remembered.headers["X-Single-Flight"] == "cached"
+
+    await client.put(
+        f"/api/v1/levels/{exercise.level_id}",
+        json={"name": "Renamed"},
+        headers=superuser_headers,
+    )
+    refreshed = await client.get(url, headers=user_headers)
+    assert refreshed.headers["X-Single-Flight"] == "leader"
+    assert page_items(refreshed)[0]["level"]["name"] == "Renamed"
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from gymhero.models.exercise import Exercise
+from gymhero.models.training_unit import PrescribedSet, TrainingUnit
+from gymhero.models.user import User
+from scripts.core.sync import sync_catalog
+from scripts.core.synthetic import USERS_PER_SCALE, seed_synthetic
+
+
+@pytest.fixture
+def catalog(sync_session: Session) -> None:
+    owner = User(email="seed@example.com", hashed_password="x", is_superuser=True)
+    sync_session.add(owner)
+    sync_session.commit()
+    sync_catalog(sync_session, owner.id, limit=200)
+
+
+def _count(session: Session, model: type) -> int:
+    return session.scalar(select(func.count()).select_from(model)) or 0
+
+
+@pytest.mark.usefixtures("catalog")
+def test_seed_synthetic_generates_scaled_dataset(sync_session: Session) -> None:
+    stats = seed_synthetic(sync_session, 2, seed=1, workers=2, block_size=3)
+
+    assert stats is not None
+    assert stats.users == 2 * USERS_PER_SCALE
+    assert _count(sync_session, User) == 1 + stats.users
+    assert _count(sync_session, Exercise) > 200
+    assert _count(sync_session, TrainingUnit) > 0
+    assert _count(sync_session, PrescribedSet) > 0
+    # Sequences were moved past the explicit ids: ORM inserts still work.
+    sync_session.add(User(email="after@example.com", hashed_password="x"))
+    sync_session.commit()
+
+
+@pytest.mark.usefixtures("catalog")
+def test_seed_synthetic_skips_when_already_present(sync_session: Session) -> None:
+    seed_synthetic(sync_session, 1, workers=1)
+    exercises = _count(sync_session, Exercise)
+
+    assert seed_synthetic(sync_session, 1, workers=1) is None
+    assert _count(sync_session, Exercise) == exercises
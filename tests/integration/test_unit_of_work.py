@@ -0,0 +1,81 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from gymhero.config import settings
+from gymhero.main import create_app
+from gymhero.models.user import User
+from tests.helpers import create_exercise, create_training_unit
+
+
+@pytest.fixture
+async def uow_client(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[AsyncClient]:
+    # The router dependency is chosen at app build time, so flip the flag first.
+    monkeypatch.setattr(settings, "DB_UNIT_OF_WORK", True)
+    app = create_app()
+    app.state.db_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(
+        transport=transport, base_url="http://test", follow_redirects=True
+    ) as http_client:
+        yield http_client
+
+
+async def test_composite_write_commits_once(
+    uow_client: AsyncClient,
+    db: AsyncSession,
+    regular_user: User,
+    user_headers: dict[str, str],
+    mocker: MockerFixture,
+) -> None:
+    exercise = await create_exercise(db, owner=regular_user)
+    unit = await create_training_unit(db, owner=regular_user, exercises=[exercise])
+    commit = mocker.spy(AsyncSession, "commit")
+
+    response = await uow_client.patch(
+        f"/api/v1/training-units/{unit.id}/exercises/{exercise.id}",
+        json={"sets": [{"reps": 5, "weight": 100}, {"reps": 5, "weight": 105}]},
+        headers=user_headers,
+    )
+
+    assert response.status_code == 200
+    assert [s["set_number"] for s in response.json()["exercises"][0]["sets"]] == [1, 2]
+    assert commit.call_count == 1
+
+
+async def test_write_is_visible_after_request(
+    uow_client: AsyncClient, superuser: User, superuser_headers: dict[str, str]
+) -> None:
+    created = await uow_client.post(
+        "/api/v1/levels/", json={"name": "Elite"}, headers=superuser_headers
+    )
+    assert created.status_code == 201
+
+    fetched = await uow_client.get(f"/api/v1/levels/{created.json()['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["name"] == "Elite"
+
+
+async def test_unique_violation_still_maps_to_409(
+    uow_client: AsyncClient,
+    superuser: User,
+    superuser_headers: dict[str, str],
+    mocker: MockerFixture,
+) -> None:
+    await uow_client.post(
+        "/api/v1/levels/", json={"name": "Elite"}, headers=superuser_headers
+    )
+    commit = mocker.spy(AsyncSession, "commit")
+
+    response = await uow_client.post(
+        "/api/v1/levels/", json={"name": "Elite"}, headers=superuser_headers
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Level with name Elite already exists"
+    commit.assert_not_called()
@@ -0,0 +1,28 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from gymhero.database.session import get_async_engine
+from gymhero.database.warmup import warm_pool
+from gymhero.main import _hot_statements
+
+
+@pytest.fixture
+async def pooled_engine(_async_url: str) -> AsyncGenerator[AsyncEngine]:
+    pooled = get_async_engine(_async_url, pool_size=3, max_overflow=0)
+    yield pooled
+    await pooled.dispose()
+
+
+async def test_warm_pool_fills_the_pool(pooled_engine: AsyncEngine) -> None:
+    assert await warm_pool(pooled_engine, 3) == 3
+    assert pooled_engine.pool.checkedin() == 3  # type: ignore[attr-defined]
+
+
+async def test_warm_pool_runs_the_hot_statements(pooled_engine: AsyncEngine) -> None:
+    # Every hot statement must compile and run against the real schema.
+    statements = _hot_statements()
+    await warm_pool(pooled_engine, 3, statements)
+    cache = pooled_engine.sync_engine._compiled_cache
+    assert cache is not None and len(cache) >= len(statements)
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from gymhero.api.admission import AdmissionController, Priority
+from gymhero.config import settings
+
+
+async def _queue(
+    controller: AdmissionController, priority: Priority
+) -> asyncio.Task[bool]:
+    task = asyncio.create_task(controller.acquire(priority))
+    await asyncio.sleep(0)  # let it reach the queue
+    return task
+
+
+async def test_admits_up_to_max_in_flight() -> None:
+    controller = AdmissionController(2, 4, 1.0)
+    assert await controller.acquire(Priority.NORMAL)
+    assert await controller.acquire(Priority.NORMAL)
+    assert controller.in_flight == 2
+    assert not controller.saturated
+
+
+async def test_release_hands_slot_to_highest_priority_first() -> None:
+    controller = AdmissionController(1, 4, 1.0)
+    await controller.acquire(Priority.NORMAL)
+    low = await _queue(controller, Priority.LOW)
+    high = await _queue(controller, Priority.HIGH)
+    assert controller.saturated
+
+    controller.release()
+    assert await high
+    assert not low.done()
+    controller.release()
+    assert await low
+    assert controller.in_flight == 1
+
+
+async def test_full_queue_sheds_immediately() -> None:
+    controller = AdmissionController(1, 1, 1.0)
+    await controller.acquire(Priority.NORMAL)
+    queued = await _queue(controller, Priority.NORMAL)
+
+    assert not await controller.acquire(Priority.NORMAL)
+    assert controller.shed == 1
+    queued.cancel()
+
+
+async def test_full_queue_evicts_lower_priority_waiter() -> None:
+    controller = AdmissionController(1, 1, 1.0)
+    await controller.acquire(Priority.NORMAL)
+    bulk = await _queue(controller, Priority.LOW)
+    probe = await _queue(controller, Priority.HIGH)
+
+    assert not await bulk
+    controller.release()
+    assert await probe
+
+
+async def test_queue_wait_times_out() -> None:
+    controller = AdmissionController(1, 4, 0.01)
+    await controller.acquire(Priority.NORMAL)
+    assert not await controller.acquire(Priority.NORMAL)
+    assert controller.queued == 0
+    controller.release()
+    assert controller.in_flight == 0
+
+
+def test_priority_by_path() -> None:
+    controller = AdmissionController(
+        1,
+        1,
+        1.0,
+        high_priority_paths=["/health"],
+        low_priority_paths=["/api/v1/exercises/all"],
+    )
+    assert controller.priority("/health") is Priority.HIGH
+    assert controller.priority("/api/v1/exercises/all/") is Priority.LOW
+    assert controller.priority("/api/v1/exercises/my") is Priority.NORMAL
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/exercises/my",
+        "/api/v1/training-plans/all/my",
+        "/api/v1/training-units/all/my",
+    ],
+)
+async def test_default_config_sheds_owner_lists_first(path: str) -> None:
+    controller = AdmissionController(
+        1,
+        1,
+        1.0,
+        high_priority_paths=settings.admission_high_priority_paths,
+        low_priority_paths=settings.admission_low_priority_paths,
+    )
+    await controller.acquire(Priority.NORMAL)
+    listing = await _queue(controller, controller.priority(path))
+    interactive = await _queue(controller, controller.priority("/api/v1/auth/me"))
+
+    assert not await listing
+    controller.release()
+    assert await interactive
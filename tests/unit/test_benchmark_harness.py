@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from benchmarks.harness import (
+    RouteResult,
+    compare,
+    load_results,
+    percentiles,
+    write_results,
+)
+
+RESULT = RouteResult(
+    requests=100,
+    p50_ms=10.0,
+    p95_ms=20.0,
+    p99_ms=30.0,
+    throughput_rps=500.0,
+    statements_per_request=3.0,
+    allocated_bytes_per_request=4096,
+)
+
+
+def test_percentiles_of_uniform_latencies() -> None:
+    p50, p95, p99 = percentiles([float(i) for i in range(1, 101)])
+    assert (round(p50), round(p95), round(p99)) == (50, 95, 99)
+
+
+def test_percentiles_of_a_single_sample() -> None:
+    assert percentiles([7.0]) == (7.0, 7.0, 7.0)
+
+
+def test_compare_allows_drift_within_tolerance() -> None:
+    baseline = {"p50_ms": 9.0, "throughput_rps": 550.0}
+    assert compare(RESULT, baseline, tolerance=0.25) == []
+
+
+def test_compare_flags_slower_latency_and_lower_throughput() -> None:
+    baseline = {"p95_ms": 10.0, "throughput_rps": 1000.0}
+    regressions = compare(RESULT, baseline, tolerance=0.25)
+    assert [r.split(":")[0] for r in regressions] == ["p95_ms", "throughput_rps"]
+
+
+def test_compare_gates_statement_count_exactly() -> None:
+    regressions = compare(RESULT, {"statements_per_request": 2.0}, tolerance=1.0)
+    assert regressions == ["statements_per_request: 3.0 vs baseline 2.0"]
+
+
+def test_results_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "results.json"
+    assert load_results(path) == {"routes": {}, "plans": {}}
+
+    write_results(path, {"health": RESULT}, {"requests": 100})
+
+    document = load_results(path)
+    assert document["meta"]["requests"] == 100
+    assert document["routes"]["health"]["p95_ms"] == 20.0
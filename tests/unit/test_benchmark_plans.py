@@ -0,0 +1,65 @@
+from benchmarks.plans import PlanSummary, check_cost, check_plan, summarize
+
+PLAN = {
+    "Node Type": "Sort",
+    "Sort Key": ["prescribed_set.set_number"],
+    "Total Cost": 120.5,
+    "Plans": [
+        {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "exercises"},
+                {"Node Type": "Index Scan", "Relation Name": "prescribed_set"},
+            ],
+        }
+    ],
+}
+
+
+def test_summarize_lists_nodes_depth_first() -> None:
+    summary = summarize("SELECT 1", PLAN)
+    assert summary.total_cost == 120.5
+    assert summary.nodes == [
+        "Sort",
+        "Nested Loop",
+        "Seq Scan on exercises",
+        "Index Scan on prescribed_set",
+    ]
+
+
+def test_check_plan_flags_scans_of_large_tables_and_sorts() -> None:
+    problems = check_plan(PLAN, large=frozenset({"exercises"}))
+    assert problems == [
+        "unexpected sort on prescribed_set.set_number",
+        "sequential scan of large table exercises",
+    ]
+
+
+def test_check_plan_accepts_declared_scans_and_sort_keys() -> None:
+    assert (
+        check_plan(
+            PLAN,
+            large=frozenset({"exercises"}),
+            seq_scans_allowed=frozenset({"exercises"}),
+            sorts_allowed=frozenset({"prescribed_set.set_number"}),
+        )
+        == []
+    )
+
+
+def test_check_plan_ignores_scans_of_small_tables() -> None:
+    problems = check_plan(
+        PLAN, large=frozenset(), sorts_allowed=frozenset({"prescribed_set.set_number"})
+    )
+    assert problems == []
+
+
+def test_check_cost_against_the_stored_plan() -> None:
+    current = PlanSummary("SELECT 1", 200.0, ["Seq Scan on exercises"])
+    stored = {"sql": "SELECT 1", "total_cost": 100.0, "nodes": ["Index Scan"]}
+    assert check_cost(current, stored, tolerance=1.0) == []
+    assert check_cost(current, stored, tolerance=0.5) == [
+        "cost 200.0 vs stored 100.0 (plan was Index Scan)"
+    ]
+    # A changed statement is a new shape, not a regression.
+    assert check_cost(current, {**stored, "sql": "SELECT 2"}, tolerance=0.0) == []
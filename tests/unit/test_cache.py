@@ -0,0 +1,193 @@
+import asyncio
+from collections.abc import Iterable, Sequence
+
+import pytest
+
+from gymhero.cache import Cache, MemoryBackend, Outcome, row_tag
+
+
+class _Producer:
+    def __init__(self, body: bytes = b"{}", tags: Iterable[str] = ()) -> None:
+        self.body = body
+        self.tags = list(tags)
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> tuple[bytes, Iterable[str]]:
+        self.calls += 1
+        await self.release.wait()
+        return self.body, self.tags
+
+
+def _cache(**kwargs: float) -> Cache:
+    return Cache(MemoryBackend(), ttl=kwargs.get("ttl", 60), stale_ttl=kwargs.get("stale_ttl", 0))
+
+
+async def test_second_fetch_is_a_hit() -> None:
+    cache = _cache()
+    produce = _Producer(b"plan")
+    assert await cache.fetch("k", produce) == (b"plan", Outcome.MISS)
+    assert await cache.fetch("k", produce) == (b"plan", Outcome.HIT)
+    assert produce.calls == 1
+
+
+async def test_row_invalidation_drops_the_row_and_its_wildcard_only() -> None:
+    cache = _cache()
+    produce = _Producer()
+    await cache.fetch("unit 1", _Producer(tags=["training_unit:1", "exercise:5"]))
+    await cache.fetch("unit 2", _Producer(tags=["training_unit:2", "exercise:6"]))
+    await cache.fetch("catalog", _Producer(tags=["exercise:*"]))
+
+    await cache.invalidate("exercise:5")
+    assert (await cache.fetch("unit 1", produce))[1] == Outcome.MISS
+    assert (await cache.fetch("unit 2", produce))[1] == Outcome.HIT
+    assert (await cache.fetch("catalog", produce))[1] == Outcome.MISS
+
+
+async def test_wildcard_invalidation_drops_the_whole_family() -> None:
+    cache = _cache()
+    produce = _Producer()
+    await cache.fetch("unit 1", _Producer(tags=["exercise:5"]))
+    await cache.fetch("catalog", _Producer(tags=["exercise:*"]))
+    await cache.fetch("user", _Producer(tags=["user:3"]))
+
+    await cache.invalidate("exercise:*")
+    assert (await cache.fetch("unit 1", produce))[1] == Outcome.MISS
+    assert (await cache.fetch("catalog", produce))[1] == Outcome.MISS
+    assert (await cache.fetch("user", produce))[1] == Outcome.HIT
+
+
+async def test_concurrent_misses_collapse_into_one_produce() -> None:
+    cache = _cache()
+    produce = _Producer()
+    produce.release.clear()
+    tasks = [asyncio.create_task(cache.fetch("k", produce)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    produce.release.set()
+    outcomes = [outcome for _, outcome in await asyncio.gather(*tasks)]
+
+    assert produce.calls == 1
+    assert sorted(outcomes) == sorted([Outcome.MISS] + [Outcome.COALESCED] * 4)
+
+
+async def test_stale_entries_are_served_while_one_caller_refreshes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("gymhero.cache.base.time.time", lambda: now[0])
+    cache = _cache(ttl=10, stale_ttl=30)
+    await cache.fetch("k", _Producer(b"old"))
+    now[0] += 15
+
+    refresh = _Producer(b"new")
+    refresh.release.clear()
+    refresher = asyncio.create_task(cache.fetch("k", refresh))
+    await asyncio.sleep(0.01)
+    assert await cache.fetch("k", refresh) == (b"old", Outcome.STALE)
+    refresh.release.set()
+    assert await refresher == (b"new", Outcome.MISS)
+    assert await cache.fetch("k", refresh) == (b"new", Outcome.HIT)
+    assert refresh.calls == 1
+
+
+async def test_invalidated_entries_are_never_served_stale(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("gymhero.cache.base.time.time", lambda: now[0])
+    cache = _cache(ttl=10, stale_ttl=30)
+    await cache.fetch("k", _Producer(b"old", ["training_plan:1"]))
+    now[0] += 15
+    await cache.invalidate("training_plan:1")
+
+    refresh = _Producer(b"new")
+    refresh.release.clear()
+    refresher = asyncio.create_task(cache.fetch("k", refresh))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(cache.fetch("k", refresh))
+    refresh.release.set()
+    assert await refresher == (b"new", Outcome.MISS)
+    assert await follower == (b"new", Outcome.COALESCED)
+
+
+async def test_result_computed_across_an_invalidation_is_not_stored() -> None:
+    cache = _cache()
+    produce = _Producer(b"stale", ["training_unit:1"])
+    produce.release.clear()
+    leader = asyncio.create_task(cache.fetch("k", produce))
+    await asyncio.sleep(0.01)
+    await cache.invalidate("training_unit:1")
+    produce.release.set()
+    assert await leader == (b"stale", Outcome.MISS)
+    assert (await cache.fetch("k", produce))[1] == Outcome.MISS
+
+
+async def test_errors_are_shared_and_not_cached() -> None:
+    cache = _cache()
+
+    async def fail() -> tuple[bytes, Iterable[str]]:
+        await asyncio.sleep(0.01)
+        raise LookupError("boom")
+
+    results = await asyncio.gather(
+        cache.fetch("k", fail), cache.fetch("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(result, LookupError) for result in results)
+    assert (await cache.fetch("k", _Producer()))[1] == Outcome.MISS
+
+
+class _DownBackend(MemoryBackend):
+    shared = True
+
+    async def get(self, key: str) -> bytes | None:
+        raise ConnectionRefusedError("down")
+
+    async def counters(self, names: Sequence[str]) -> list[int]:
+        raise ConnectionRefusedError("down")
+
+    async def bump(self, names: Sequence[str], ttl: float) -> None:
+        raise ConnectionRefusedError("down")
+
+
+async def test_unreachable_backend_falls_back_to_produce() -> None:
+    cache = Cache(_DownBackend(), ttl=60)
+    produce = _Producer(b"fresh")
+    assert await cache.fetch("k", produce) == (b"fresh", Outcome.MISS)
+    assert await cache.fetch("k", produce) == (b"fresh", Outcome.MISS)
+    await cache.invalidate("exercise:1")
+    assert produce.calls == 2
+
+
+async def test_memory_backend_evicts_least_recently_used_entries() -> None:
+    backend = MemoryBackend(max_entries=2)
+    await backend.set("a", b"1", 60)
+    await backend.set("b", b"2", 60)
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3", 60)
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+
+
+async def test_memory_backend_expires_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [50.0]
+    monkeypatch.setattr("gymhero.cache.backends.time.monotonic", lambda: now[0])
+    backend = MemoryBackend()
+    await backend.set("a", b"1", 5)
+    now[0] += 6
+    assert await backend.get("a") is None
+
+
+async def test_evicted_counters_never_read_back_lower() -> None:
+    backend = MemoryBackend(max_counters=2)
+    await backend.bump(["a"], 60)
+    (recorded,) = await backend.counters(["a"])
+    await backend.bump(["b", "c"], 60)
+    assert (await backend.counters(["a"]))[0] >= recorded
+    assert await backend.counters(["never bumped"]) == await backend.counters(["a"])
+
+
+def test_row_tags_use_the_entity_name() -> None:
+    assert row_tag("exercises", 5) == "exercise:5"
+    assert row_tag("prescribed_set", 9) == "prescribed_set:9"
+    assert row_tag("catalog_entries", [1, 2]) == "catalog_entries:1:2"
@@ -0,0 +1,49 @@
+import asyncio
+
+from starlette.types import Message, Receive, Scope, Send
+
+from gymhero.api.middleware import CLIENT_DISCONNECTED, ClientDisconnectMiddleware
+
+
+def _scope() -> Scope:
+    return {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def test_cancellation_swallowed_by_the_app_is_withdrawn() -> None:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            pass  # e.g. a handler cleaning up and returning anyway
+
+    async def receive() -> Message:
+        return {"type": "http.disconnect"}
+
+    scope = _scope()
+    await ClientDisconnectMiddleware(app)(scope, receive, _send)
+
+    task = asyncio.current_task()
+    assert task is not None and task.cancelling() == 0
+    assert scope["state"][CLIENT_DISCONNECTED] is True
+    await asyncio.sleep(0)  # no cancellation left to surface here
+
+
+async def test_unread_request_body_is_buffered_up_to_a_bound() -> None:
+    received = 0
+
+    async def receive() -> Message:
+        nonlocal received
+        received += 1
+        await asyncio.sleep(0)
+        return {"type": "http.request", "body": b"x" * 1024, "more_body": True}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await asyncio.sleep(0.05)  # never reads the body
+
+    await ClientDisconnectMiddleware(app)(_scope(), receive, _send)
+
+    assert received <= ClientDisconnectMiddleware.BUFFERED_MESSAGES + 1
@@ -12,7 +12,12 @@ dotenv.load_dotenv(".env.defaults")
 def test_properly_read_config(test_settings) -> None:
     for key in type(test_settings).model_fields:
         value = getattr(test_settings, key)
-        actual = value.get_secret_value() if isinstance(value, SecretStr) else str(value)
+        if value is None:
+            actual = ""
+        elif isinstance(value, SecretStr):
+            actual = value.get_secret_value()
+        else:
+            actual = str(value)
         assert actual == os.environ[key]
 
 
@@ -37,3 +42,27 @@ def test_production_rejects_committed_dev_secret(monkeypatch) -> None:
 def test_get_settings_rejects_unknown_env() -> None:
     with pytest.raises(ValueError, match="Invalid environment"):
         get_settings("staging")
+
+
+@pytest.mark.parametrize("routes", ["/api/v1/exercises/all", "/health=soon", "/health=0"])
+def test_malformed_route_timeouts_fail_at_startup(monkeypatch, routes: str) -> None:
+    monkeypatch.setenv("REQUEST_TIMEOUT_ROUTES", routes)
+    with pytest.raises(ValidationError, match="REQUEST_TIMEOUT_ROUTES"):
+        get_settings("test")
+
+
+def test_route_timeouts_are_parsed(monkeypatch) -> None:
+    monkeypatch.setenv("REQUEST_TIMEOUT_ROUTES", "/api/v1/exercises/all=5, /health=1,")
+    assert get_settings("test").request_timeout_routes == {
+        "/api/v1/exercises/all": 5.0,
+        "/health": 1.0,
+    }
+
+
+def test_admission_limit_follows_the_pool_unless_set(monkeypatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT", "")
+    assert get_settings("test").admission_max_in_flight == 6
+    monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT", "0")
+    assert get_settings("test").admission_max_in_flight == 0
@@ -49,7 +49,7 @@ async def test_get_current_user_returns_user_when_found(mocker) -> None:
     token_mock = mocker.Mock()
     token_mock.sub = 1
     user_mock = mocker.Mock(spec=User)
-    mocker.patch.object(user_crud, "get_one", mocker.AsyncMock(return_value=user_mock))
+    mocker.patch.object(user_crud, "get_by_id", mocker.AsyncMock(return_value=user_mock))
 
     result = await get_current_user(db=db_mock, token=token_mock)
 
@@ -60,7 +60,7 @@ async def test_get_current_user_raises_404_when_missing(mocker) -> None:
     db_mock = mocker.AsyncMock()
     token_mock = mocker.Mock()
     token_mock.sub = 1
-    mocker.patch.object(user_crud, "get_one", mocker.AsyncMock(return_value=None))
+    mocker.patch.object(user_crud, "get_by_id", mocker.AsyncMock(return_value=None))
 
     with pytest.raises(HTTPException) as exc_info:
         await get_current_user(db=db_mock, token=token_mock)
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from gymhero.models import Base
+from scripts.core.indexes import (
+    ForeignKeyInfo,
+    IndexInfo,
+    audit,
+    declared_schema,
+    render_migration,
+)
+
+PKEY = IndexInfo("users", "users_pkey", ("id",), unique=True, constraint=True)
+LINK_PKEY = IndexInfo(
+    "link", "link_pkey", ("plan_id", "unit_id"), unique=True, constraint=True
+)
+PLAN_FK = ForeignKeyInfo("link", "link_plan_id_fkey", ("plan_id",))
+UNIT_FK = ForeignKeyInfo("link", "link_unit_id_fkey", ("unit_id",))
+
+
+def test_models_declare_no_unindexed_foreign_keys_or_redundant_indexes() -> None:
+    assert audit(*declared_schema(Base.metadata)).report() == []
+
+
+def test_foreign_key_needs_an_index_leading_with_its_columns() -> None:
+    result = audit([LINK_PKEY], [PLAN_FK, UNIT_FK])
+    assert [m.foreign_key for m in result.missing] == [UNIT_FK]
+    assert result.missing[0].name == "link_unit_id_idx"
+
+
+def test_partial_or_expression_indexes_do_not_cover_a_foreign_key() -> None:
+    unusable = IndexInfo("link", "link_unit_id_idx", ("unit_id",), usable=False)
+    assert audit([LINK_PKEY, unusable], [UNIT_FK]).missing
+
+
+def test_plain_index_on_the_primary_key_is_redundant() -> None:
+    result = audit([PKEY, IndexInfo("users", "users_id_idx", ("id",))], [])
+    assert [(r.index.name, r.covered_by.name) for r in result.redundant] == [
+        ("users_id_idx", "users_pkey")
+    ]
+
+
+def test_prefix_of_a_wider_index_is_redundant_unless_unique() -> None:
+    prefix = IndexInfo("link", "link_plan_id_idx", ("plan_id",))
+    unique_prefix = IndexInfo("link", "link_plan_id_key", ("plan_id",), unique=True)
+    suffix = IndexInfo("link", "link_unit_id_idx", ("unit_id",))
+
+    result = audit([LINK_PKEY, prefix, unique_prefix, suffix], [])
+
+    assert [r.index.name for r in result.redundant] == ["link_plan_id_idx"]
+
+
+def test_exact_duplicates_keep_exactly_one() -> None:
+    first = IndexInfo("users", "a_idx", ("email",))
+    second = IndexInfo("users", "b_idx", ("email",))
+    result = audit([second, first], [])
+    assert [(r.index.name, r.covered_by.name) for r in result.redundant] == [
+        ("b_idx", "a_idx")
+    ]
+
+
+def test_render_migration_uses_the_concurrent_helpers() -> None:
+    result = audit(
+        [LINK_PKEY, PKEY, IndexInfo("users", "users_id_idx", ("id",))], [UNIT_FK]
+    )
+    source = render_migration(
+        result,
+        message="index audit",
+        revision="abc123",
+        down_revision="e5f6a7b8c9d0",
+        create_date=datetime(2026, 1, 1),
+    )
+
+    compile(source, "migration.py", "exec")
+    assert 'down_revision: Union[str, None] = "e5f6a7b8c9d0"' in source
+    upgrade, downgrade = source.split("def downgrade")
+    assert (
+        'create_index_concurrently(\n        "link_unit_id_idx",\n        "link",\n'
+        '        ["unit_id"],\n    )' in upgrade
+    )
+    assert (
+        'drop_index_concurrently(\n        "users_id_idx",\n        "users",' in upgrade
+    )
+    assert 'create_index_concurrently(\n        "users_id_idx",' in downgrade
+    assert 'drop_index_concurrently(\n        "link_unit_id_idx",' in downgrade
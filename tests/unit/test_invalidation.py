@@ -0,0 +1,55 @@
+import json
+
+from gymhero.database.invalidation import (
+    _MAX_PAYLOAD,
+    Invalidation,
+    InvalidationBus,
+    _payload_chunks,
+)
+
+
+def _bus() -> tuple[InvalidationBus, list[Invalidation], list[str]]:
+    bus = InvalidationBus()
+    received: list[Invalidation] = []
+    resets: list[str] = []
+    bus.subscribe(received.append, lambda: resets.append("reset"))
+    return bus, received, resets
+
+
+def test_dispatch_fans_out_one_event_per_row() -> None:
+    bus, received, _ = _bus()
+    bus.dispatch(json.dumps({"version": "812", "rows": [["exercises", 4], ["levels", 1]]}))
+    assert received == [Invalidation("exercises", 4, 812), Invalidation("levels", 1, 812)]
+
+
+def test_malformed_payloads_are_ignored() -> None:
+    bus, received, _ = _bus()
+    for payload in ("not json", "{}", json.dumps({"version": "x", "rows": []})):
+        bus.dispatch(payload)
+    assert received == []
+
+
+def test_reset_reaches_every_subscriber() -> None:
+    bus, _, resets = _bus()
+    bus.reset()
+    assert resets == ["reset"]
+
+
+def test_large_flushes_are_split_under_the_notify_limit() -> None:
+    rows = [("training_units", n) for n in range(2000)]
+    chunks = _payload_chunks(rows)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= _MAX_PAYLOAD for chunk in chunks)
+    assert [tuple(row) for chunk in chunks for row in json.loads(chunk)] == rows
+
+
+def test_local_only_subscribers_skip_other_workers_events() -> None:
+    bus = InvalidationBus()
+    local: list[Invalidation] = []
+    resets: list[str] = []
+    bus.subscribe(local.append, lambda: resets.append("reset"), remote=False)
+    bus.dispatch(json.dumps({"version": "1", "rows": [["levels", 1]]}))
+    bus.reset()
+    bus.publish_local([Invalidation("levels", 2, 2)])
+    assert local == [Invalidation("levels", 2, 2)]
+    assert resets == []
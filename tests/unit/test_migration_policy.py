@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from gymhero.database import migrations
+from gymhero.database.migrations import (
+    MigrationPolicy,
+    is_lock_timeout,
+    retry_on_lock_timeout,
+)
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode: str) -> None:
+        self.pgcode = pgcode
+
+
+def _error(pgcode: str) -> OperationalError:
+    return OperationalError("ALTER TABLE ...", {}, _PgError(pgcode))
+
+
+def test_policy_defaults_to_the_plain_mode() -> None:
+    policy = MigrationPolicy.from_env({})
+    assert policy == MigrationPolicy()
+    assert not policy.zero_downtime
+
+
+def test_policy_reads_the_environment_and_x_mode() -> None:
+    environ = {
+        "MIGRATION_MODE": "",
+        "MIGRATION_LOCK_TIMEOUT_MS": "500",
+        "MIGRATION_STATEMENT_TIMEOUT_MS": "10000",
+        "MIGRATION_RETRIES": "2",
+        "MIGRATION_RETRY_DELAY_SECONDS": "0.5",
+    }
+    policy = MigrationPolicy.from_env(environ, {"mode": "zero-downtime"})
+    assert policy == MigrationPolicy("zero-downtime", 500, 10_000, 2, 0.5)
+    assert policy.zero_downtime
+
+
+def test_policy_rejects_unknown_modes() -> None:
+    with pytest.raises(ValueError, match="Unknown migration mode"):
+        MigrationPolicy.from_env({"MIGRATION_MODE": "yolo"})
+
+
+def test_is_lock_timeout() -> None:
+    assert is_lock_timeout(_error("55P03"))
+    assert not is_lock_timeout(_error("57014"))  # statement timeout
+    assert not is_lock_timeout(ValueError())
+
+
+def test_retry_backs_off_until_the_lock_is_free(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    delays: list[float] = []
+    monkeypatch.setattr(migrations.time, "sleep", delays.append)
+    outcomes = iter([_error("55P03"), _error("55P03"), "done"])
+
+    def attempt() -> str:
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy = MigrationPolicy(retries=3, retry_delay_seconds=0.5)
+    assert retry_on_lock_timeout(attempt, policy, what="test") == "done"
+    assert delays == [0.5, 1.0]
+
+
+def test_retry_gives_up_after_the_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(migrations.time, "sleep", lambda _: None)
+    calls = 0
+
+    def attempt() -> None:
+        nonlocal calls
+        calls += 1
+        raise _error("55P03")
+
+    with pytest.raises(OperationalError):
+        retry_on_lock_timeout(attempt, MigrationPolicy(retries=2), what="test")
+    assert calls == 3
+
+
+def test_other_errors_are_not_retried() -> None:
+    def attempt() -> None:
+        raise _error("57014")
+
+    with pytest.raises(OperationalError):
+        retry_on_lock_timeout(attempt, MigrationPolicy(), what="test")
@@ -0,0 +1,23 @@
+import pytest
+
+from gymhero.api.negotiation import JSON, MSGPACK, negotiate
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON),
+        ("*/*", JSON),
+        ("application/json", JSON),
+        ("application/msgpack", MSGPACK),
+        ("Application/X-MsgPack", MSGPACK),
+        ("application/vnd.msgpack, */*;q=0.1", MSGPACK),
+        ("application/msgpack, application/json", MSGPACK),
+        ("application/msgpack;q=0.5, application/json", JSON),
+        ("application/json;q=0.5, application/msgpack;q=0.8", MSGPACK),
+        ("application/msgpack;q=0", JSON),
+        ("application/msgpack;q=oops", JSON),
+    ],
+)
+def test_negotiate(accept: str | None, expected: str) -> None:
+    assert negotiate(accept) == expected
@@ -0,0 +1,84 @@
+from collections.abc import AsyncGenerator, Iterable
+
+import pytest
+
+from gymhero.cache import Cache, CacheError, Outcome, RedisBackend
+from tests.helpers.redis_server import StandInRedis
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[StandInRedis]:
+    async with StandInRedis().running() as running:
+        yield running
+
+
+def _produce(body: bytes, tags: Iterable[str] = ()):
+    async def produce() -> tuple[bytes, Iterable[str]]:
+        return body, tags
+
+    return produce
+
+
+async def test_entries_and_tags_live_on_the_server(server: StandInRedis) -> None:
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}")
+    cache = Cache(backend, ttl=60)
+    assert (await cache.fetch("k", _produce(b"plan", ["training_plan:1"])))[1] == Outcome.MISS
+
+    # Another worker, same server: sees the entry, and invalidates it for both.
+    other = Cache(RedisBackend(f"redis://127.0.0.1:{server.port}"), ttl=60)
+    assert await other.fetch("k", _produce(b"unused")) == (b"plan", Outcome.HIT)
+    await other.invalidate("training_plan:1")
+    assert (await cache.fetch("k", _produce(b"new")))[1] == Outcome.MISS
+    await backend.close()
+    await other.close()
+
+
+async def test_entries_carry_their_ttl(server: StandInRedis) -> None:
+    cache = Cache(RedisBackend(f"redis://127.0.0.1:{server.port}"), ttl=2, stale_ttl=3)
+    await cache.fetch("k", _produce(b"x"))
+    (set_command,) = [c for c in server.commands if c[0] == b"SET" and c[1] == b"gymhero:k"]
+    assert set_command[3:] == [b"PX", b"5000"]
+    await cache.close()
+
+
+async def test_clear_removes_only_the_namespace(server: StandInRedis) -> None:
+    server.data[b"other-app:key"] = (b"keep", None)
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}")
+    cache = Cache(backend, ttl=60)
+    await cache.fetch("k", _produce(b"x", ["user:1"]))
+    await cache.invalidate("user:1")
+    await cache.clear()
+    assert list(server.data) == [b"other-app:key"]
+    await backend.close()
+
+
+async def test_authenticates_and_selects_the_database() -> None:
+    async with StandInRedis(password="s3cret").running() as server:
+        backend = RedisBackend(f"redis://:s3cret@127.0.0.1:{server.port}/2")
+        await backend.set("k", b"v", 10)
+        assert await backend.get("k") == b"v"
+        assert [c[0] for c in server.commands[:2]] == [b"AUTH", b"SELECT"]
+        await backend.close()
+
+
+async def test_reconnects_after_the_connection_drops(server: StandInRedis) -> None:
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}")
+    await backend.set("k", b"v", 10)
+    server.drop_connections()
+    with pytest.raises(OSError):
+        await backend.get("k")
+    assert await backend.get("k") == b"v"
+    await backend.close()
+
+
+async def test_error_replies_raise_cache_error() -> None:
+    async with StandInRedis(password="s3cret").running() as server:
+        backend = RedisBackend(f"redis://127.0.0.1:{server.port}")
+        with pytest.raises(CacheError, match="NOAUTH"):
+            await backend.get("k")
+        await backend.close()
+
+
+def test_rejects_other_schemes() -> None:
+    with pytest.raises(ValueError, match="redis://"):
+        RedisBackend("http://localhost:6379")
@@ -0,0 +1,55 @@
+import pytest
+from starlette.requests import Request
+
+from gymhero.config import settings
+from gymhero.database.db import request_timeout
+
+
+class _Route:
+    path = "/api/v1/exercises/all"
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+            ],
+            "route": _Route(),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def _budgets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_ROUTES", "")
+
+
+def test_request_timeout_defaults_to_setting() -> None:
+    assert request_timeout(_request()) == 30.0
+
+
+def test_request_timeout_uses_route_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        settings, "REQUEST_TIMEOUT_ROUTES", "/api/v1/exercises/all=5, /health=1"
+    )
+    assert request_timeout(_request()) == 5.0
+
+
+def test_request_timeout_header_wins_over_route(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_ROUTES", "/api/v1/exercises/all=5")
+    assert request_timeout(_request({"X-Request-Timeout": "0.5"})) == 0.5
+
+
+def test_request_timeout_header_is_capped() -> None:
+    assert request_timeout(_request({"X-Request-Timeout": "600"})) == 60.0
+
+
+@pytest.mark.parametrize("value", ["soon", "0", "-3", "nan"])
+def test_request_timeout_ignores_invalid_header(value: str) -> None:
+    assert request_timeout(_request({"X-Request-Timeout": value})) == 30.0
@@ -1,9 +1,16 @@
 import argparse
+from pathlib import Path
 
 import pytest
 
-from scripts.core.resources import load_exercises, unique_values
+from scripts.core.resources import (
+    EXERCISES_CSV,
+    iter_exercises,
+    load_exercises,
+    unique_values,
+)
 from scripts.core.seed import build_argparser
+from scripts.core.sync import source_hash
 
 
 def test_load_exercises_returns_non_empty_rows() -> None:
@@ -37,3 +44,36 @@ def test_build_argparser_accepts_valid_env_and_rejects_invalid() -> None:
 
     with pytest.raises(SystemExit):
         parser.parse_args(["--env=invalid"])
+
+
+def test_iter_exercises_streams_normalised_rows(tmp_path) -> None:
+    csv_path = tmp_path / "exercises.csv"
+    csv_path.write_text(
+        "Title,Desc,Type,BodyPart,Level\n"
+        "Squat,,Strength,Legs,Beginner\n"
+        "Squat,dup,Strength,Legs,Beginner\n"
+    )
+    rows = iter_exercises(csv_path)
+    assert not isinstance(rows, list)
+    # Blanks become None; duplicates are left for the bulk loader to merge.
+    assert [(r["Title"], r["Desc"]) for r in rows] == [
+        ("Squat", None),
+        ("Squat", "dup"),
+    ]
+
+
+def test_build_argparser_defaults_to_bundled_csv() -> None:
+    args = build_argparser().parse_args([])
+    assert args.csv == EXERCISES_CSV
+    assert args.chunk_size > 0
+
+
+def test_source_hash_tracks_content_and_limit(tmp_path: Path) -> None:
+    path = tmp_path / "exercises.csv"
+    path.write_text("Title\nSquat\n")
+    digest = source_hash(path)
+
+    assert source_hash(path) == digest
+    assert source_hash(path, limit=1) != digest
+    path.write_text("Title\nDeadlift\n")
+    assert source_hash(path) != digest
@@ -0,0 +1,43 @@
+import gc
+
+import pytest
+
+from gymhero import server
+
+
+def test_worker_count_defaults_to_the_usable_cpus(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(server.os, "process_cpu_count", lambda: 6)
+    assert server.worker_count({}) == 6
+
+
+def test_worker_count_honours_web_concurrency() -> None:
+    assert server.worker_count({"WEB_CONCURRENCY": "3"}) == 3
+    assert server.worker_count({"WEB_CONCURRENCY": "0"}) == 1
+
+
+def test_options_preload_the_app() -> None:
+    options = server.options({"WEB_CONCURRENCY": "2"})
+    assert options["preload_app"] is True
+    assert options["workers"] == 2
+    assert options["worker_class"] == server.WORKER_CLASS
+
+
+def test_server_applies_the_options() -> None:
+    app = server.Server(server.options({"WEB_CONCURRENCY": "2"}))
+    assert app.cfg.preload_app
+    assert app.cfg.workers == 2
+    assert app.cfg.pre_fork is server.pre_fork
+
+
+def test_fork_hooks_freeze_then_reenable_the_collector() -> None:
+    gc.disable()
+    try:
+        server.pre_fork(None, None)  # type: ignore[arg-type]
+        assert gc.get_freeze_count() > 0
+        server.post_fork(None, None)  # type: ignore[arg-type]
+        assert gc.isenabled()
+    finally:
+        gc.unfreeze()
+        gc.enable()
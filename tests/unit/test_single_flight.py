@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from gymhero.api.singleflight import Outcome, SingleFlight, request_key
+
+
+class _Producer:
+    def __init__(self, body: bytes = b"[]") -> None:
+        self.body = body
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        await self.release.wait()
+        return self.body
+
+
+async def test_concurrent_identical_runs_share_one_execution() -> None:
+    flight = SingleFlight()
+    produce = _Producer()
+    tasks = [asyncio.create_task(flight.run("k", produce)) for _ in range(5)]
+    await asyncio.sleep(0)
+    produce.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert produce.calls == 1
+    assert [outcome for _, outcome in results].count(Outcome.LEADER) == 1
+    assert {body for body, _ in results} == {b"[]"}
+    assert (flight.executed, flight.coalesced) == (1, 4)
+
+
+async def test_different_keys_run_separately() -> None:
+    flight = SingleFlight()
+    produce = _Producer()
+    produce.release.set()
+    await asyncio.gather(flight.run("a", produce), flight.run("b", produce))
+    assert produce.calls == 2
+
+
+async def test_errors_are_shared_and_not_remembered() -> None:
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fail() -> bytes:
+        started.set()
+        await asyncio.sleep(0)
+        raise LookupError("boom")
+
+    leader = asyncio.create_task(flight.run("k", fail))
+    await started.wait()
+    follower = asyncio.create_task(flight.run("k", fail))
+    for task in (leader, follower):
+        with pytest.raises(LookupError):
+            await task
+    produce = _Producer(b"ok")
+    produce.release.set()
+    assert await flight.run("k", produce) == (b"ok", Outcome.LEADER)
+
+
+async def test_cancelled_leader_hands_over_to_a_waiter() -> None:
+    flight = SingleFlight()
+    stuck = _Producer(b"never")
+    leader = asyncio.create_task(flight.run("k", stuck))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.run("k", stuck))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    stuck.release.set()
+    assert await follower == (b"never", Outcome.LEADER)
+    assert stuck.calls == 2
+
+
+async def test_window_serves_recent_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("gymhero.api.singleflight.time.monotonic", lambda: now[0])
+    flight = SingleFlight(window=0.5)
+    produce = _Producer()
+    produce.release.set()
+
+    assert (await flight.run("k", produce))[1] == Outcome.LEADER
+    now[0] += 0.4
+    assert (await flight.run("k", produce))[1] == Outcome.CACHED
+    now[0] += 0.2
+    assert (await flight.run("k", produce))[1] == Outcome.LEADER
+    assert (produce.calls, flight.cached) == (2, 1)
+
+
+def _request(path: str, query: str) -> Request:
+    return Request(
+        {"type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+         "headers": [], "server": ("test", 80), "scheme": "http", "root_path": ""}
+    )
+
+
+def test_request_key_normalizes_the_query_and_carries_the_scope() -> None:
+    first = request_key(_request("/api/v1/exercises/all/", "limit=5&level_id=2"), "public")
+    second = request_key(_request("/api/v1/exercises/all", "level_id=2&limit=5"), "public")
+    assert first == second
+    assert request_key(_request("/api/v1/exercises/all", "level_id=2&limit=5"), "user:1") != first
+
+
+async def test_invalidation_drops_dependent_results_only() -> None:
+    flight = SingleFlight(window=60)
+    produce = _Producer()
+    produce.release.set()
+    await flight.run("exercises", produce, frozenset({"exercises"}))
+    await flight.run("levels", produce, frozenset({"levels"}))
+
+    flight.invalidate("exercises")
+    assert (await flight.run("exercises", produce))[1] == Outcome.LEADER
+    assert (await flight.run("levels", produce))[1] == Outcome.CACHED
+
+    flight.clear()
+    assert (await flight.run("levels", produce))[1] == Outcome.LEADER
+
+
+async def test_result_computed_across_an_invalidation_is_not_kept() -> None:
+    flight = SingleFlight(window=60)
+    produce = _Producer(b"stale")
+    leader = asyncio.create_task(flight.run("k", produce, frozenset({"levels"})))
+    await asyncio.sleep(0)
+    flight.invalidate("levels")
+    produce.release.set()
+    assert await leader == (b"stale", Outcome.LEADER)
+    assert (await flight.run("k", produce))[1] == Outcome.LEADER
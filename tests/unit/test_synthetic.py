@@ -0,0 +1,76 @@
+import csv
+import io
+
+import pytest
+
+from scripts.core import synthetic
+from scripts.core.synthetic import (
+    Context,
+    generate_block,
+    plan_blocks,
+    user_rng,
+    user_shape,
+)
+
+FIRST_IDS = {
+    "users": 2,
+    "exercises": 100,
+    "training_units": 1,
+    "training_unit_exercise": 1,
+    "training_plans": 1,
+}
+
+
+@pytest.fixture(autouse=True)
+def _worker_context() -> None:
+    synthetic._init_worker(
+        Context(
+            seed=7,
+            password_hash="hash",
+            catalog_names=tuple(f"Exercise {i}" for i in range(50)),
+            catalog_exercise_ids=tuple(range(1, 51)),
+            body_part_ids=(1, 2),
+            exercise_type_ids=(1,),
+            level_ids=(1, 2, 3),
+        )
+    )
+
+
+def _ids(tables: dict[str, str], table: str) -> list[int]:
+    return [int(row[0]) for row in csv.reader(io.StringIO(tables[table]))]
+
+
+def test_user_shape_is_deterministic_per_seed_and_user() -> None:
+    assert user_shape(user_rng(7, 3)) == user_shape(user_rng(7, 3))
+    shapes = {user_shape(user_rng(7, i)) for i in range(20)}
+    assert len(shapes) > 1
+
+
+def test_user_shape_is_skewed_towards_few_power_users() -> None:
+    exercises = sorted(user_shape(user_rng(0, i)).exercises for i in range(2000))
+    median, top = exercises[len(exercises) // 2], exercises[-20]
+    assert top > 10 * median
+
+
+def test_plan_blocks_lays_out_contiguous_ids() -> None:
+    shapes = [user_shape(user_rng(7, i)) for i in range(10)]
+    first, second = plan_blocks(shapes, FIRST_IDS, block_size=4)[:2]
+
+    assert (first.first_user, first.users, first.user_id) == (0, 4, 2)
+    assert second.user_id == 6
+    assert second.exercise_id == 100 + sum(s.exercises for s in shapes[:4])
+    assert second.link_id == 1 + sum(s.links for s in shapes[:4])
+
+
+def test_generate_block_is_reproducible_and_matches_planned_ids() -> None:
+    shapes = [user_shape(user_rng(7, i)) for i in range(6)]
+    first, second = plan_blocks(shapes, FIRST_IDS, block_size=3)
+
+    tables, rows = generate_block(first)
+
+    assert generate_block(first) == (tables, rows)
+    assert _ids(tables, "users") == [2, 3, 4]
+    # Each block ends exactly where the planner started the next one.
+    assert _ids(tables, "exercises")[-1] + 1 == second.exercise_id
+    assert _ids(tables, "training_unit_exercise")[-1] + 1 == second.link_id
+    assert rows == sum(len(t.splitlines()) for t in tables.values())
@@ -0,0 +1,18 @@
+from gymhero.crud.base import commit_or_flush
+from gymhero.database.session import UNIT_OF_WORK
+
+
+async def test_commit_or_flush_commits_by_default(mocker) -> None:
+    db = mocker.AsyncMock()
+    db.info = {}
+    await commit_or_flush(db)
+    db.commit.assert_awaited_once()
+    db.flush.assert_not_awaited()
+
+
+async def test_commit_or_flush_only_flushes_inside_unit_of_work(mocker) -> None:
+    db = mocker.AsyncMock()
+    db.info = {UNIT_OF_WORK: True}
+    await commit_or_flush(db)
+    db.flush.assert_awaited_once()
+    db.commit.assert_not_awaited()